@@ -0,0 +1,144 @@
+// Benchmark de la connexion (POST /auth/verify) sous charge concurrente :
+// connexions réussies par seconde, latences, retard de la boucle d'événements et
+// latence d'une requête légère servie pendant les connexions (le hachage scrypt
+// ne doit pas la bloquer), puis attaque par mots de passe erronés sur un compte
+// (rejetée par la limitation avant tout hachage).
+//
+// La base est remplacée par une table d'utilisateurs en mémoire : seul le chemin
+// de connexion du serveur (contrôleur, hachage, jeton) est mesuré.
+//
+// Usage : node benchmarks/bench_login.js [--accounts 100] [--concurrency 16] [--duration 10]
+const http = require('http');
+const path = require('path');
+const os = require('os');
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+process.env.UV_THREADPOOL_SIZE = process.env.UV_THREADPOOL_SIZE || String(Math.max(4, os.cpus().length));
+
+const args = Object.fromEntries(
+  process.argv.slice(2).reduce((pairs, arg, index, all) => (
+    arg.startsWith('--') ? [...pairs, [arg.slice(2), all[index + 1]]] : pairs
+  ), []),
+);
+const ACCOUNTS = Number(args.accounts) || 100;
+const CONCURRENCY = Number(args.concurrency) || 16;
+const DURATION_MS = (Number(args.duration) || 10) * 1000;
+
+// Table des utilisateurs en mémoire, à la place du pool MySQL
+const users = new Map();
+const fakeDb = {
+  execute: async (sql, params) => {
+    if (sql.startsWith('SELECT')) {
+      const user = users.get(params[0]);
+      return [user ? [{ ...user }] : []];
+    }
+    if (sql.startsWith('UPDATE users SET mot_de_passe')) {
+      const [hash, id] = params;
+      users.forEach((user) => { if (user.id === id) user.mot_de_passe = hash; });
+      return [{ affectedRows: 1 }];
+    }
+    throw new Error(`Requête non prise en charge : ${sql}`);
+  },
+};
+require.cache[require.resolve(path.join(__dirname, '..', 'src', 'db'))] = { exports: fakeDb };
+
+const express = require('express');
+const passwords = require('../src/services/passwords');
+const { loginUser } = require('../src/controllers/authController');
+
+const percentile = (sorted, ratio) => (sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * ratio))] : 0);
+
+const summary = (label, timings, elapsedMs) => {
+  timings.sort((a, b) => a - b);
+  console.log(
+    `${label.padEnd(28)} ${String(timings.length).padStart(6)} req  ${(timings.length / (elapsedMs / 1000)).toFixed(1).padStart(8)} req/s`
+    + `  p50 ${percentile(timings, 0.5).toFixed(1).padStart(7)} ms  p95 ${percentile(timings, 0.95).toFixed(1).padStart(7)} ms`
+    + `  p99 ${percentile(timings, 0.99).toFixed(1).padStart(7)} ms`,
+  );
+};
+
+const request = (agent, port, method, route, body) => new Promise((resolve, reject) => {
+  const payload = body ? JSON.stringify(body) : null;
+  const started = process.hrtime.bigint();
+  const req = http.request({
+    agent, port, method, path: route, host: '127.0.0.1',
+    headers: payload ? { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(payload) } : {},
+  }, (res) => {
+    res.resume();
+    res.on('end', () => resolve({ status: res.statusCode, ms: Number(process.hrtime.bigint() - started) / 1e6 }));
+  });
+  req.on('error', reject);
+  if (payload) req.write(payload);
+  req.end();
+});
+
+const run = async (port, agent, makeBody, concurrency, durationMs) => {
+  const timings = [];
+  const statuses = {};
+  const deadline = Date.now() + durationMs;
+  let next = 0;
+  const worker = async () => {
+    while (Date.now() < deadline) {
+      const { status, ms } = await request(agent, port, 'POST', '/api/auth/verify', makeBody(next++));
+      statuses[status] = (statuses[status] || 0) + 1;
+      timings.push(ms);
+    }
+  };
+  const started = Date.now();
+  await Promise.all(Array.from({ length: concurrency }, worker));
+  return { timings, statuses, elapsed: Date.now() - started };
+};
+
+const main = async () => {
+  let started = Date.now();
+  const hashes = await Promise.all(Array.from({ length: ACCOUNTS }, (_, i) => passwords.hashPassword(`secret-${i}`)));
+  hashes.forEach((hash, i) => {
+    users.set(`user${i}@example.com`, { id: i + 1, nom: `Utilisateur ${i}`, email: `user${i}@example.com`, role: 'Employé', mot_de_passe: hash });
+  });
+  console.log(`${ACCOUNTS} comptes hachés en ${((Date.now() - started) / 1000).toFixed(1)} s `
+    + `(${os.cpus().length} cœur(s), UV_THREADPOOL_SIZE=${process.env.UV_THREADPOOL_SIZE})\n`);
+
+  const app = express();
+  app.use(express.json());
+  app.post('/api/auth/verify', loginUser);
+  app.get('/api/health', (req, res) => res.json({ ok: true }));
+  const server = app.listen(0);
+  const { port } = server.address();
+  const agent = new http.Agent({ keepAlive: true, maxSockets: CONCURRENCY + 1 });
+
+  // Requête légère envoyée toutes les 20 ms pendant les connexions
+  const probe = [];
+  let probing = true;
+  const probeLoop = (async () => {
+    while (probing) {
+      probe.push((await request(agent, port, 'GET', '/api/health')).ms);
+      await new Promise((resolve) => setTimeout(resolve, 20));
+    }
+  })();
+
+  const loopDelay = monitorEventLoopDelay({ resolution: 10 });
+  loopDelay.enable();
+  const logins = await run(port, agent, (i) => ({ email: `user${i % ACCOUNTS}@example.com`, mot_de_passe: `secret-${i % ACCOUNTS}` }), CONCURRENCY, DURATION_MS);
+  loopDelay.disable();
+  probing = false;
+  await probeLoop;
+
+  console.log(`Connexions valides (${CONCURRENCY} clients simultanés, ${DURATION_MS / 1000} s) : statuts ${JSON.stringify(logins.statuses)}`);
+  summary('connexion', logins.timings, logins.elapsed);
+  summary('requête légère concurrente', probe, logins.elapsed);
+  console.log(`retard de la boucle d'événements : p99 ${(loopDelay.percentile(99) / 1e6).toFixed(1)} ms, max ${(loopDelay.max / 1e6).toFixed(1)} ms\n`);
+
+  // Attaque par force brute sur un seul compte
+  started = Date.now();
+  const attack = await run(port, agent, (i) => ({ email: 'user0@example.com', mot_de_passe: `essai-${i}` }), CONCURRENCY, 2000);
+  console.log(`Mots de passe erronés sur un compte (2 s) : statuts ${JSON.stringify(attack.statuses)}`);
+  summary('tentative rejetée', attack.timings, attack.elapsed);
+
+  agent.destroy();
+  server.close();
+};
+
+main().catch((err) => {
+  console.error(err);
+  process.exitCode = 1;
+});
@@ -0,0 +1,49 @@
+// Demande au serveur en cours d'exécution de recalculer ses statistiques
+// matérialisées depuis la base : npm run stats:rebuild
+// Réservé aux administrateurs : jeton de session dans API_TOKEN, ou connexion
+// avec ADMIN_EMAIL et ADMIN_PASSWORD.
+const http = require('http');
+
+const apiUrl = process.env.API_URL || 'http://localhost:3000/api';
+
+// Envoie une requête JSON : { statusCode, body }
+const post = (path, payload, headers = {}) => new Promise((resolve, reject) => {
+  const body = payload ? JSON.stringify(payload) : '';
+  const req = http.request(`${apiUrl}${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(body), ...headers },
+  }, (res) => {
+    let text = '';
+    res.on('data', (chunk) => { text += chunk; });
+    res.on('end', () => resolve({ statusCode: res.statusCode, body: text }));
+  });
+  req.on('error', reject);
+  req.end(body);
+});
+
+const adminToken = async () => {
+  if (process.env.API_TOKEN) {
+    return process.env.API_TOKEN;
+  }
+  const { ADMIN_EMAIL: email, ADMIN_PASSWORD: password } = process.env;
+  if (!email || !password) {
+    throw new Error('Définir API_TOKEN, ou ADMIN_EMAIL et ADMIN_PASSWORD');
+  }
+  const { statusCode, body } = await post('/auth/verify', { email, mot_de_passe: password });
+  if (statusCode !== 200) {
+    throw new Error(`Connexion refusée (${statusCode}): ${body}`);
+  }
+  return JSON.parse(body).token;
+};
+
+const main = async () => {
+  const token = await adminToken();
+  const { statusCode, body } = await post('/statistics/rebuild', null, { Authorization: `Bearer ${token}` });
+  console.log(`Réponse ${statusCode}: ${body}`);
+  process.exitCode = statusCode === 200 ? 0 : 1;
+};
+
+main().catch((err) => {
+  console.error('Impossible de recalculer les statistiques :', err.message);
+  process.exitCode = 1;
+});
@@ -0,0 +1,245 @@
+// Simulation de l'assignation automatique : rejoue des tickets résolus, dans
+// l'ordre de leur création, avec chaque politique de l'ordonnanceur
+// (src/services/assignmentScheduler) et avec l'assignation historique, puis
+// compare le débit et les temps d'attente.
+//
+// Modèle : chaque technicien traite un ticket à la fois, le plus prioritaire puis
+// le plus ancien de ses tickets assignés. La durée historique d'un ticket
+// (date_creation -> date_mise_a_jour) est rapportée au temps moyen de son
+// technicien d'origine, puis multipliée par celui du technicien qui le reçoit
+// dans la simulation. L'attente va de la création au début du traitement.
+//
+// Usage :
+//   npm run assignment:simulate                        (tickets résolus de la base)
+//   node scripts/simulateAssignment.js --synthetic 20000 [--technicians 12] [--seed 1]
+//   options communes : [--max-open 10] [--policies equilibre,charge,tourniquet,historique]
+const { AssignmentScheduler, PRIORITY_LEVELS, POLICIES, priorityWeight } = require('../src/services/assignmentScheduler');
+const { IndexedHeap } = require('../src/utils/heap');
+
+const args = Object.fromEntries(
+  process.argv.slice(2).reduce((pairs, arg, index, all) => (
+    arg.startsWith('--') ? [...pairs, [arg.slice(2), all[index + 1]]] : pairs
+  ), []),
+);
+const MAX_OPEN_TICKETS = Number(args['max-open']) || 10;
+const DEFAULT_RESOLUTION_HOURS = 24;
+const SEED = Number(args.seed) || 1;
+const POLICY_NAMES = (args.policies || [...Object.keys(POLICIES), 'historique'].join(',')).split(',');
+
+const HOUR_MS = 60 * 60 * 1000;
+const DAY_MS = 24 * HOUR_MS;
+
+// Générateur pseudo-aléatoire reproductible (mulberry32)
+const random = (() => {
+  let state = SEED >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+})();
+const exponential = (mean) => -Math.log(1 - random()) * mean;
+
+// Tickets synthétiques : arrivées poissonniennes (charge d'environ 85 %),
+// techniciens de vitesses différentes, assignation historique au hasard
+const syntheticDataset = (count, technicianCount) => {
+  const technicians = Array.from({ length: technicianCount }, (_, index) => ({
+    id: index + 1,
+    averageHours: 4 * (0.6 + random() * 1.2),
+  }));
+  const meanHours = technicians.reduce((sum, technician) => sum + technician.averageHours, 0) / technicianCount;
+  const interArrivalHours = meanHours / technicianCount / 0.85;
+  const priorityWeights = [40, 30, 20, 10];
+
+  let createdAt = Date.UTC(2024, 0, 1);
+  const tickets = Array.from({ length: count }, (_, index) => {
+    createdAt += exponential(interArrivalHours) * HOUR_MS;
+    let draw = random() * 100;
+    const level = priorityWeights.findIndex((weight) => (draw -= weight) < 0);
+    const technician = technicians[Math.floor(random() * technicianCount)];
+    return {
+      id: index + 1,
+      priorite: PRIORITY_LEVELS[level === -1 ? 0 : level],
+      createdAt,
+      hours: exponential(technician.averageHours),
+      technicianId: technician.id,
+    };
+  });
+  return { tickets, technicianIds: technicians.map((technician) => technician.id) };
+};
+
+// Tickets résolus de la base, dans l'ordre de création
+const databaseDataset = async () => {
+  const db = require('../src/db');
+  try {
+    const [technicians] = await db.execute("SELECT id FROM users WHERE role = 'Technicien'");
+    const [rows] = await db.execute(`
+      SELECT id, priorite, date_creation, date_mise_a_jour, id_technicien
+      FROM tickets
+      WHERE statut IN ('résolu', 'fermé') AND id_technicien IS NOT NULL
+      ORDER BY date_creation, id
+    `);
+    const tickets = rows
+      .map((row) => ({
+        id: row.id,
+        priorite: row.priorite,
+        createdAt: new Date(row.date_creation).getTime(),
+        hours: (new Date(row.date_mise_a_jour) - new Date(row.date_creation)) / HOUR_MS,
+        technicianId: row.id_technicien,
+      }))
+      .filter((ticket) => ticket.hours >= 0);
+    const technicianIds = [...new Set([...technicians.map((row) => row.id), ...tickets.map((ticket) => ticket.technicianId)])];
+    return { tickets, technicianIds };
+  } finally {
+    await db.end();
+  }
+};
+
+// Historique de résolution de chaque technicien et charge de travail de chaque ticket
+const prepare = ({ tickets, technicianIds }) => {
+  const history = new Map(technicianIds.map((id) => [id, { totalHours: 0, resolved: 0 }]));
+  tickets.forEach((ticket) => {
+    const entry = history.get(ticket.technicianId);
+    entry.totalHours += ticket.hours;
+    entry.resolved += 1;
+  });
+  const totalHours = tickets.reduce((sum, ticket) => sum + ticket.hours, 0);
+  const globalAverage = tickets.length > 0 ? totalHours / tickets.length : DEFAULT_RESOLUTION_HOURS;
+  const averages = new Map([...history].map(([id, entry]) => [
+    id, entry.resolved > 0 ? entry.totalHours / entry.resolved : globalAverage,
+  ]));
+  return {
+    technicianIds,
+    history,
+    averages,
+    // Travail d'un ticket, en multiples du temps moyen de son technicien d'origine
+    tickets: tickets.map((ticket) => ({ ...ticket, effort: averages.get(ticket.technicianId) > 0 ? ticket.hours / averages.get(ticket.technicianId) : 1 })),
+  };
+};
+
+const simulate = (dataset, policy) => {
+  const scheduler = policy === 'historique' ? null : new AssignmentScheduler({
+    policy, maxOpenTickets: MAX_OPEN_TICKETS, defaultResolutionHours: DEFAULT_RESOLUTION_HOURS,
+  });
+  const byUrgency = (a, b) => priorityWeight(b.priorite) - priorityWeight(a.priorite) || a.createdAt - b.createdAt || a.id - b.id;
+  const workers = new Map(dataset.technicianIds.map((id) => [id, { id, queue: new IndexedHeap(byUrgency), busy: false }]));
+  dataset.technicianIds.forEach((id) => scheduler && scheduler.addTechnician(id, dataset.history.get(id)));
+
+  const completions = new IndexedHeap((a, b) => a.at - b.at || a.ticket.id - b.ticket.id);
+  const waiting = new Map(); // tickets en file d'attente de l'ordonnanceur
+  const results = [];
+  let maxWaiting = 0;
+  const decisionTimings = [];
+
+  const start = (worker, now) => {
+    if (worker.busy || worker.queue.size === 0) {
+      return;
+    }
+    const ticket = worker.queue.pop();
+    worker.busy = true;
+    ticket.startedAt = now;
+    completions.push(ticket.id, { at: now + ticket.effort * dataset.averages.get(worker.id) * HOUR_MS, ticket, worker });
+  };
+
+  const dispatch = (ticket, technicianId, now) => {
+    const worker = workers.get(technicianId);
+    worker.queue.push(ticket.id, ticket);
+    start(worker, now);
+  };
+
+  const complete = ({ at, ticket, worker }) => {
+    worker.busy = false;
+    results.push({ ticket, wait: ticket.startedAt - ticket.createdAt, total: at - ticket.createdAt, at });
+    if (scheduler) {
+      scheduler.release(ticket.id);
+      scheduler.recordResolution(worker.id, (at - ticket.createdAt) / HOUR_MS);
+      scheduler.drain().forEach(({ ticketId, technicianId }) => {
+        dispatch(waiting.get(ticketId), technicianId, at);
+        waiting.delete(ticketId);
+      });
+    }
+    start(worker, at);
+  };
+
+  dataset.tickets.forEach((source) => {
+    const ticket = { ...source };
+    while (completions.size > 0 && completions.peek().at <= ticket.createdAt) {
+      complete(completions.pop());
+    }
+    let technicianId = ticket.technicianId;
+    if (scheduler) {
+      const started = process.hrtime.bigint();
+      technicianId = scheduler.assign({ id: ticket.id, statut: 'ouvert', priorite: ticket.priorite, date_creation: ticket.createdAt });
+      decisionTimings.push(Number(process.hrtime.bigint() - started) / 1000);
+    }
+    if (technicianId === null) {
+      waiting.set(ticket.id, ticket);
+      maxWaiting = Math.max(maxWaiting, waiting.size);
+    } else {
+      dispatch(ticket, technicianId, ticket.createdAt);
+    }
+  });
+  while (completions.size > 0) {
+    complete(completions.pop());
+  }
+
+  return { results, maxWaiting, decisionTimings };
+};
+
+const mean = (values) => (values.length > 0 ? values.reduce((sum, value) => sum + value, 0) / values.length : 0);
+const percentile = (values, ratio) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * ratio))] : 0;
+};
+
+const summarize = (policy, { results, maxWaiting, decisionTimings }, firstArrival) => {
+  const waits = results.map((result) => result.wait / HOUR_MS);
+  const critical = results.filter((result) => priorityWeight(result.ticket.priorite) === PRIORITY_LEVELS.length);
+  const lastCompletion = Math.max(...results.map((result) => result.at));
+  return {
+    policy,
+    resolved: results.length,
+    perDay: results.length / Math.max((lastCompletion - firstArrival) / DAY_MS, 1 / 24),
+    meanWait: mean(waits),
+    p90Wait: percentile(waits, 0.9),
+    criticalWait: mean(critical.map((result) => result.wait / HOUR_MS)),
+    meanTotal: mean(results.map((result) => result.total / HOUR_MS)),
+    maxWaiting,
+    decisionUs: mean(decisionTimings),
+  };
+};
+
+const main = async () => {
+  const source = args.synthetic
+    ? syntheticDataset(Number(args.synthetic), Number(args.technicians) || 12)
+    : await databaseDataset();
+  if (source.tickets.length === 0 || source.technicianIds.length === 0) {
+    console.error('Aucun ticket résolu ou aucun technicien à rejouer.');
+    process.exitCode = 1;
+    return;
+  }
+  const dataset = prepare(source);
+  console.log(`${dataset.tickets.length} tickets rejoués, ${dataset.technicianIds.length} techniciens, `
+    + `au plus ${MAX_OPEN_TICKETS} tickets ouverts par technicien\n`);
+
+  console.log(`${'politique'.padEnd(12)} ${'résolus'.padStart(8)} ${'débit/j'.padStart(8)} ${'attente moy h'.padStart(14)}`
+    + ` ${'attente p90 h'.padStart(14)} ${'critiques h'.padStart(12)} ${'résolution h'.padStart(13)}`
+    + ` ${'en file max'.padStart(12)} ${'décision µs'.padStart(12)}`);
+  POLICY_NAMES.forEach((policy) => {
+    if (policy !== 'historique' && !POLICIES[policy]) {
+      throw new Error(`Politique inconnue : ${policy}`);
+    }
+    const row = summarize(policy, simulate(dataset, policy), dataset.tickets[0].createdAt);
+    console.log(`${row.policy.padEnd(12)} ${String(row.resolved).padStart(8)} ${row.perDay.toFixed(1).padStart(8)}`
+      + ` ${row.meanWait.toFixed(2).padStart(14)} ${row.p90Wait.toFixed(2).padStart(14)} ${row.criticalWait.toFixed(2).padStart(12)}`
+      + ` ${row.meanTotal.toFixed(2).padStart(13)} ${String(row.maxWaiting).padStart(12)}`
+      + ` ${(policy === 'historique' ? '-' : row.decisionUs.toFixed(2)).padStart(12)}`);
+  });
+};
+
+main().catch((err) => {
+  console.error('Erreur lors de la simulation :', err);
+  process.exitCode = 1;
+});
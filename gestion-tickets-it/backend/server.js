@@ -1,9 +1,19 @@
+const os = require('os');
+
+// Le hachage des mots de passe (scrypt) s'exécute dans le pool de threads de libuv :
+// un thread par cœur pour traiter autant de connexions en parallèle. À définir
+// avant la première opération asynchrone qui crée le pool.
+process.env.UV_THREADPOOL_SIZE = process.env.UV_THREADPOOL_SIZE || String(Math.max(4, os.cpus().length));
+
 const express = require('express');
 const bodyParser = require('body-parser');
 const userRoute = require('./src/routes/userRoute');
 const ticketRoute = require('./src/routes/ticketRoute');
 const authRoute = require('./src/routes/authRoute');
 const statsRoute = require('./src/routes/statsRoute')
+const { compression } = require('./src/middleware/compression');
+const { authenticate } = require('./src/middleware/auth');
+const autoAssignment = require('./src/services/autoAssignment');
 
 // Créer l'application Express
 const app = express();
@@ -13,6 +23,12 @@ app.use(bodyParser.json());
 
 app.use(express.json());
 
+// Compression gzip/deflate des réponses (négociée avec le client)
+app.use(compression());
+
+// Identification de l'appelant par son jeton de session (req.user)
+app.use('/api', authenticate);
+
 
 // Ajouter les routes des utilisateurs
 app.use('/api', userRoute);
@@ -31,4 +47,6 @@ app.use('/api', statsRoute);
 const PORT = 3000;
 app.listen(PORT, () => {
   console.log(`Serveur démarré sur http://localhost:${PORT}`);
+  // Ordonnanceur d'assignation prêt avant les premières créations de tickets
+  autoAssignment.rebuildInBackground();
 });
\ No newline at end of file
@@ -1,4 +1,8 @@
 const db = require('./../db');
+const passwords = require('./../services/passwords');
+const loginLimiter = require('./../services/loginLimiter');
+const tokens = require('./../services/token');
+const resumeCodes = require('./../services/resumeCodes');
 
 const loginUser = async (req, res) => {
   const { email, mot_de_passe } = req.body;
@@ -7,21 +11,79 @@ const loginUser = async (req, res) => {
     return res.status(400).json({ message: 'Les champs email et mot de passe sont obligatoires' });
   }
 
+  // Trop de tentatives sur ce compte : refusé avant tout calcul de hachage
+  const retryAfter = loginLimiter.begin(email);
+  if (retryAfter > 0) {
+    res.set('Retry-After', String(retryAfter));
+    return res.status(429).json({ message: 'Trop de tentatives de connexion, réessayez plus tard' });
+  }
+
   try {
     const [rows] = await db.execute(
-      'SELECT * FROM users WHERE email = ? AND mot_de_passe = ?',
-      [email, mot_de_passe]
+      'SELECT id, nom, email, role, mot_de_passe FROM users WHERE email = ?',
+      [email]
     );
+    const user = rows[0];
 
-    if (rows.length === 0) {
+    // Vérification dans le pool de threads (scrypt), y compris pour un compte inexistant
+    const { valid, needsRehash } = await passwords.verifyPassword(mot_de_passe, user ? user.mot_de_passe : null);
+    if (!user || !valid) {
       return res.status(401).json({ message: 'Identifiants invalides' });
     }
+    loginLimiter.succeed(email);
+
+    // Ancien mot de passe en clair (ou paramètres de hachage obsolètes) : haché sans retarder la réponse
+    if (needsRehash) {
+      passwords.hashPassword(mot_de_passe)
+        .then((hash) => db.execute('UPDATE users SET mot_de_passe = ? WHERE id = ? AND mot_de_passe = ?', [hash, user.id, user.mot_de_passe]))
+        .catch((err) => console.error('Erreur lors du hachage du mot de passe :', err));
+    }
 
-    res.status(200).json({ email: rows[0].email, mot_de_passe: rows[0].mot_de_passe, nom: rows[0].nom, role: rows[0].role });
+    const { token, expiresAt } = tokens.sign({ sub: user.id, nom: user.nom, email: user.email, role: user.role });
+    res.status(200).json({ id: user.id, email: user.email, nom: user.nom, role: user.role, token, expires_at: expiresAt });
   } catch (err) {
     console.error('Erreur lors de la connexion :', err);
     res.status(500).json({ message: 'Erreur serveur lors de la connexion', error: err });
   }
 };
 
-module.exports = { loginUser };
+// Renvoie l'utilisateur porté par le jeton, sans accès à la base
+const getSessionUser = (req, res) => {
+  const { id, nom, email, role, exp } = req.user;
+  res.status(200).json({ id, nom, email, role, expires_at: new Date(exp * 1000).toISOString() });
+};
+
+// Émet un code de reprise pour le jeton de l'appelant (à placer dans l'URL du frontend)
+const createResumeCode = (req, res) => {
+  const [, token] = req.get('Authorization').split(' ');
+  const { previous } = req.body || {};
+  const { code, expiresAt } = resumeCodes.issue(token, previous);
+  res.status(200).json({ code, expires_at: expiresAt });
+};
+
+// Échange un code de reprise contre le jeton de session et l'utilisateur qu'il porte
+const resumeSession = (req, res) => {
+  const { code } = req.body || {};
+  const token = resumeCodes.consume(code);
+  const claims = token ? tokens.verify(token) : null;
+  if (!claims) {
+    return res.status(401).json({ message: 'Code de reprise de session invalide ou expiré' });
+  }
+  res.status(200).json({
+    id: claims.sub,
+    email: claims.email,
+    nom: claims.nom,
+    role: claims.role,
+    token,
+    expires_at: new Date(claims.exp * 1000).toISOString(),
+  });
+};
+
+// Déconnexion : le code de reprise de la page ne permet plus de restaurer la session
+const logoutUser = (req, res) => {
+  const { code } = req.body || {};
+  resumeCodes.revoke(code);
+  res.status(200).json({ message: 'Déconnecté' });
+};
+
+module.exports = { loginUser, getSessionUser, createResumeCode, resumeSession, logoutUser };
@@ -1,36 +1,29 @@
 const db = require('./../db');
+const statsEngine = require('./../services/statsEngine');
+const autoAssignment = require('./../services/autoAssignment');
+const { getCounters } = require('./../middleware/conditional');
 
-// Nombre de tickets ouverts / résolus
+// Nombre de tickets par statut / priorité et temps moyen de résolution,
+// servis depuis les statistiques matérialisées
 const getTicketStats = async (req, res) => {
     try {
-      // Statistiques par statut
-      const [statusRows] = await db.execute(`
-        SELECT 
-          SUM(CASE WHEN statut = 'ouvert' THEN 1 ELSE 0 END) AS total_ouverts,
-          SUM(CASE WHEN statut = 'résolu' THEN 1 ELSE 0 END) AS total_resolus,
-          SUM(CASE WHEN statut = 'en cours' THEN 1 ELSE 0 END) AS total_en_cours,
-          SUM(CASE WHEN statut = 'fermé' THEN 1 ELSE 0 END) AS total_fermes
-        FROM tickets
-      `);
-  
-      // Temps moyen par technicien
-      const [timeRows] = await db.execute(`
-        SELECT 
-          id_technicien,
-          ROUND(AVG(TIMESTAMPDIFF(HOUR, date_creation, date_mise_a_jour)), 2) AS temps_moyen_heures
-        FROM tickets
-        WHERE statut = 'résolu' AND id_technicien IS NOT NULL
-        GROUP BY id_technicien
-      `);
-  
-      res.status(200).json({
-        stats_par_statut: statusRows[0],
-        temps_moyen_par_technicien: timeRows
-      });
+      const stats = await statsEngine.getSnapshot();
+      res.status(200).json(stats);
     } catch (err) {
       res.status(500).json({ message: 'Erreur lors de la récupération des statistiques de tickets', error: err });
     }
   };
+
+// Recalcule les statistiques matérialisées depuis la base
+const rebuildTicketStats = async (req, res) => {
+  try {
+    await statsEngine.rebuild();
+    const stats = await statsEngine.getSnapshot();
+    res.status(200).json({ message: 'Statistiques recalculées', ...stats });
+  } catch (err) {
+    res.status(500).json({ message: 'Erreur lors du recalcul des statistiques', error: err });
+  }
+};
   
 
 // Liste des tickets critiques
@@ -45,7 +38,35 @@ const getCriticalTickets = async (req, res) => {
   }
 };
 
+// État de l'assignation automatique : charge et temps moyen de chaque technicien, tickets en attente
+const getAssignmentStats = async (req, res) => {
+  try {
+    res.status(200).json(await autoAssignment.getSnapshot());
+  } catch (err) {
+    res.status(500).json({ message: "Erreur lors de la récupération de l'état de l'assignation automatique", error: err });
+  }
+};
+
+// Compteurs des requêtes conditionnelles servies en 304
+const getHttpCacheStats = (req, res) => {
+  res.status(200).json(getCounters());
+};
+
+// État du serveur et de sa connexion à la base (préchauffage et sondes de disponibilité)
+const getHealth = async (req, res) => {
+  try {
+    await db.execute('SELECT 1');
+    res.status(200).json({ status: 'ok' });
+  } catch (err) {
+    res.status(503).json({ status: 'indisponible', message: 'Base de données injoignable', error: err });
+  }
+};
+
 module.exports = {
+  getHealth,
   getTicketStats,
+  rebuildTicketStats,
+  getHttpCacheStats,
+  getAssignmentStats,
   getCriticalTickets
 };
@@ -1,18 +1,215 @@
 const db = require('./../db');
+const { encodeCursor, decodeCursor, parseLimit, keysetClause } = require('./../utils/pagination');
+const { parseFields, selectList } = require('./../utils/projection');
+const { streamNdjson } = require('./../utils/ndjson');
+const statsEngine = require('./../services/statsEngine');
+const resourceVersions = require('./../services/resourceVersions');
+const changeFeed = require('./../services/changeFeed');
+const ticketEvents = require('./../services/ticketEvents');
+const autoAssignment = require('./../services/autoAssignment');
+const { isOpen } = require('./../services/assignmentScheduler');
+const { canReadTicket, ROLES } = require('./../middleware/auth');
 
-// Récupérer tous les tickets
+// Filtres acceptés en paramètres de requête -> colonne SQL
+const TICKET_FILTERS = {
+  statut: 'statut',
+  priorite: 'priorite',
+  'priorité': 'priorite',
+  id_employe: 'id_employe',
+  id_technicien: 'id_technicien',
+};
+
+// Colonnes pouvant être demandées via ?fields=
+const TICKET_FIELDS = ['id', 'titre', 'description', 'statut', 'priorite', 'date_creation', 'date_mise_a_jour', 'id_employe', 'id_technicien'];
+
+// Champs autorisés pour le tri de la liste
+const TICKET_SORT_FIELDS = ['date_creation', 'date_mise_a_jour', 'id'];
+
+// Construit la clause WHERE à partir des filtres de la requête.
+// mine=true limite aux tickets créés par l'appelant (id lu dans son jeton) ;
+// un employé ne voit jamais que les siens.
+const buildTicketFilters = (query, user = null) => {
+  const conditions = [];
+  const values = [];
+
+  if (user && (query.mine === 'true' || user.role === ROLES.EMPLOYEE)) {
+    conditions.push('id_employe = ?');
+    values.push(user.id);
+  }
+
+  Object.entries(TICKET_FILTERS).forEach(([param, column]) => {
+    const value = query[param];
+    if (value === undefined || value === '') {
+      return;
+    }
+    if (value === 'null') {
+      conditions.push(`${column} IS NULL`);
+    } else {
+      conditions.push(`${column} = ?`);
+      values.push(value);
+    }
+  });
+
+  return { conditions, values };
+};
+
+// Lire un ticket par son id (null s'il n'existe pas)
+const findTicket = async (id) => {
+  const [rows] = await db.execute('SELECT * FROM tickets WHERE id = ?', [id]);
+  return rows[0] || null;
+};
+
+// Récupérer les tickets (filtrés, et paginés si `limit` ou `cursor` est fourni).
+// Avec format=ndjson, la liste complète filtrée est envoyée en streaming.
 const getAllTickets = async (req, res) => {
+  const { limit, cursor, sort = 'date_creation', order = 'desc', format } = req.query;
+
+  if (!TICKET_SORT_FIELDS.includes(sort)) {
+    return res.status(400).json({ message: `Champ de tri invalide (${TICKET_SORT_FIELDS.join(', ')})` });
+  }
+
+  if (req.query.mine === 'true' && !req.user) {
+    return res.status(401).json({ message: 'Authentification requise pour lister ses propres tickets' });
+  }
+
+  const decodedCursor = cursor ? decodeCursor(cursor, sort) : null;
+  if (cursor && !decodedCursor) {
+    return res.status(400).json({ message: 'Curseur de pagination invalide' });
+  }
+
+  // L'id et le champ de tri sont nécessaires pour construire le curseur
+  const projection = parseFields(req.query.fields, TICKET_FIELDS, ['id', sort]);
+  if (projection.error) {
+    return res.status(400).json({ message: projection.error });
+  }
+
+  // updated_since : uniquement les tickets modifiés depuis cette date (incluse),
+  // pour la synchronisation incrémentale des répliques clientes
+  const updatedSince = req.query.updated_since ? new Date(req.query.updated_since) : null;
+  if (updatedSince && Number.isNaN(updatedSince.getTime())) {
+    return res.status(400).json({ message: 'Date updated_since invalide' });
+  }
+
+  const streamed = format === 'ndjson';
+  const paginated = !streamed && (limit !== undefined || cursor !== undefined);
+  const { conditions, values } = buildTicketFilters(req.query, req.user);
+  if (updatedSince) {
+    conditions.push('date_mise_a_jour >= ?');
+    values.push(updatedSince);
+  }
+  const keyset = keysetClause(sort, order, decodedCursor);
+  if (keyset.condition) {
+    conditions.push(keyset.condition);
+    values.push(...keyset.values);
+  }
+
+  let query = `SELECT ${selectList(projection.columns)} FROM tickets`;
+  if (conditions.length > 0) {
+    query += ` WHERE ${conditions.join(' AND ')}`;
+  }
+  query += ` ${keyset.orderBy}`;
+
+  // Une ligne de plus que la page pour savoir s'il existe une page suivante
+  const pageSize = parseLimit(limit);
+  if (paginated) {
+    query += ` LIMIT ${pageSize + 1}`;
+  }
+
+  if (streamed) {
+    return streamNdjson(res, query, values, 'Erreur lors de la récupération des tickets');
+  }
+
   try {
-    console.log('Tentative de récupération des tickets...');
-    const [rows] = await db.execute('SELECT * FROM tickets');
-    console.log('Tickets récupérés:', rows);
-    res.status(200).json(rows);
+    const [rows] = await db.execute(query, values);
+
+    if (!paginated) {
+      return res.status(200).json(rows);
+    }
+
+    const items = rows.slice(0, pageSize);
+    const nextCursor = rows.length > pageSize ? encodeCursor(items[items.length - 1], sort) : null;
+    res.status(200).json({ items, next_cursor: nextCursor });
   } catch (err) {
     console.error('Erreur lors de la récupération des tickets:', err);
     res.status(500).json({ message: 'Erreur lors de la récupération des tickets', error: err });
   }
 };
 
+// Exporter les tickets au format colonnes ({ champ: [valeurs] }), limité aux champs demandés
+const getTicketColumns = async (req, res) => {
+  const projection = parseFields(req.query.fields || 'id,statut,priorite,date_creation,date_mise_a_jour,id_technicien', TICKET_FIELDS);
+  if (projection.error) {
+    return res.status(400).json({ message: projection.error });
+  }
+  const fields = projection.columns;
+
+  try {
+    const version = statsEngine.getVersion();
+    const [rows] = await db.query({ sql: `SELECT ${fields.join(', ')} FROM tickets ORDER BY id`, rowsAsArray: true });
+
+    const columns = {};
+    fields.forEach((field, index) => {
+      columns[field] = rows.map((row) => row[index]);
+    });
+    res.status(200).json({ version, count: rows.length, columns });
+  } catch (err) {
+    res.status(500).json({ message: "Erreur lors de l'export des tickets", error: err });
+  }
+};
+
+// Nombre de résultats de recherche par défaut et maximal
+const DEFAULT_SEARCH_LIMIT = 20;
+const MAX_SEARCH_LIMIT = 100;
+
+// Longueur minimale d'un mot indexé (innodb_ft_min_token_size)
+const MIN_SEARCH_TERM_LENGTH = 3;
+
+// Convertit la saisie de l'utilisateur en requête booléenne plein texte :
+// chaque mot est obligatoire et peut être un préfixe ("imprim" trouve "imprimante").
+// Les opérateurs booléens saisis sont ignorés.
+const buildSearchExpression = (query) => String(query || '')
+  .replace(/[+\-<>()~*"@]/g, ' ')
+  .split(/\s+/)
+  .filter((term) => term.length >= MIN_SEARCH_TERM_LENGTH)
+  .map((term) => `+${term}*`)
+  .join(' ');
+
+// Rechercher des tickets par mots du titre et de la description, classés par
+// pertinence (index FULLTEXT), avec les mêmes filtres que la liste
+const searchTickets = async (req, res) => {
+  const expression = buildSearchExpression(req.query.q);
+  if (!expression) {
+    return res.status(400).json({ message: `La recherche doit contenir au moins un mot de ${MIN_SEARCH_TERM_LENGTH} caractères` });
+  }
+  if (req.query.mine === 'true' && !req.user) {
+    return res.status(401).json({ message: 'Authentification requise pour lister ses propres tickets' });
+  }
+
+  const projection = parseFields(req.query.fields, TICKET_FIELDS, ['id']);
+  if (projection.error) {
+    return res.status(400).json({ message: projection.error });
+  }
+
+  const parsedLimit = parseInt(req.query.limit, 10);
+  const limit = Number.isNaN(parsedLimit) || parsedLimit <= 0 ? DEFAULT_SEARCH_LIMIT : Math.min(parsedLimit, MAX_SEARCH_LIMIT);
+
+  const { conditions, values } = buildTicketFilters(req.query, req.user);
+  conditions.unshift('MATCH (titre, description) AGAINST (? IN BOOLEAN MODE)');
+  values.unshift(expression);
+
+  const query = `SELECT ${selectList(projection.columns)}, MATCH (titre, description) AGAINST (? IN BOOLEAN MODE) AS pertinence
+    FROM tickets WHERE ${conditions.join(' AND ')}
+    ORDER BY pertinence DESC, date_creation DESC, id DESC LIMIT ${limit}`;
+
+  try {
+    const [rows] = await db.execute(query, [expression, ...values]);
+    res.status(200).json(rows);
+  } catch (err) {
+    console.error('Erreur lors de la recherche de tickets:', err);
+    res.status(500).json({ message: 'Erreur lors de la recherche de tickets', error: err });
+  }
+};
+
 // Récupérer un ticket
 
 
@@ -21,7 +218,7 @@ const getTicket = async (req, res) => {
   
     try {
       const [rows] = await db.execute('SELECT * FROM tickets WHERE id = ?', [id]);
-      if (rows.length === 0) {
+      if (!canReadTicket(req.user, rows[0])) {
         return res.status(404).json({ message: 'Ticket non trouvé' });
       }
       res.status(200).json(rows[0]);
@@ -45,13 +242,41 @@ const createTicket = async (req, res) => {
       return res.status(400).json({ message: 'Les champs titre, description, priorite sont obligatoires' });
     }
   
+    let ticketId = null;
+    let committed = false;
     try {
-      const [result] = await db.execute(
-        'INSERT INTO tickets (titre, description, statut, priorite, date_creation) VALUES (?, ?, ?, ?, ?)',
-        [titre, description, finalStatut, priorite, finalDateCreation]
-      );
-      res.status(201).json({ message: 'Ticket créé', ticketId: result.insertId });
+      // Hors de la transaction : la construction de l'ordonnanceur utilise le pool
+      await autoAssignment.prepareAssignment();
+      const technicianId = await withTransaction(async (connection) => {
+        const [inserted] = await connection.execute(
+          'INSERT INTO tickets (titre, description, statut, priorite, date_creation, id_employe) VALUES (?, ?, ?, ?, ?, ?)',
+          [titre, description, finalStatut, priorite, finalDateCreation, req.user.id]
+        );
+        ticketId = inserted.insertId;
+        await ticketEvents.record(connection, ticketEvents.creationEvents({ id: ticketId, statut: finalStatut }), req.user.id);
+
+        // Technicien choisi par l'ordonnanceur (assignation sans auteur : faite par le système)
+        const assigned = autoAssignment.assignTicket({ id: ticketId, statut: finalStatut, priorite, date_creation: finalDateCreation });
+        if (assigned !== null) {
+          await connection.execute('UPDATE tickets SET id_technicien = ? WHERE id = ?', [assigned, ticketId]);
+          await ticketEvents.record(connection, [{ ticketId, type: ticketEvents.EVENT_TYPES.ASSIGNMENT, nouvelleValeur: String(assigned) }]);
+        }
+        return assigned;
+      });
+      committed = true;
+      resourceVersions.bump('tickets', [ticketId]);
+      resourceVersions.bump('ticket-events', [ticketId]);
+      const created = await findTicket(ticketId);
+      statsEngine.recordInsert(created);
+      autoAssignment.recordChange(null, created);
+      changeFeed.publish('created', ticketId, created);
+      res.status(201).json({ message: 'Ticket créé', ticketId, id_technicien: technicianId });
+      scheduleAutoAssignments();
     } catch (err) {
+      // Le choix du technicien n'est annulé que si la création n'a pas été validée
+      if (ticketId !== null && !committed) {
+        autoAssignment.cancel(ticketId);
+      }
       res.status(500).json({ message: 'Erreur lors de la création du ticket', error: err });
     }
   };
@@ -59,67 +284,386 @@ const createTicket = async (req, res) => {
 
   
 
+// Colonnes modifiables d'un ticket
+const TICKET_UPDATABLE_FIELDS = ['titre', 'description', 'statut', 'priorite', 'date_creation', 'id_technicien'];
+
+// Construit la clause SET d'une modification (null si aucun champ à modifier).
+// id_technicien peut valoir null pour désassigner un ticket.
+const buildTicketUpdate = (body) => {
+  const assignments = [];
+  const values = [];
+
+  TICKET_UPDATABLE_FIELDS.forEach((field) => {
+    const value = body[field];
+    if (field === 'id_technicien' ? value === undefined : !value) {
+      return;
+    }
+    assignments.push(`${field} = ?`);
+    values.push(value);
+  });
+
+  if (assignments.length === 0) {
+    return null;
+  }
+  return { setClause: assignments.join(', '), values };
+};
+
 // Modifier un ticket
 const updateTicket = async (req, res) => {
   const { id } = req.params;
-  const { titre, description, statut, priorite, date_creation } = req.body;
+  const update = buildTicketUpdate(req.body);
 
-  if (!titre && !description && !statut && !priorite && !date_creation) {
-    return res.status(400).json({ message: 'Il faut au moins un champ à modifier (titre, description, statut, priorite, date_creation)' });
+  if (!update) {
+    return res.status(400).json({ message: `Il faut au moins un champ à modifier (${TICKET_UPDATABLE_FIELDS.join(', ')})` });
   }
 
-  let updateQuery = 'UPDATE tickets SET ';
-  const values = [];
-  if (titre) {
-    updateQuery += 'titre = ?, ';
-    values.push(titre);
+  try {
+    // Le ticket est verrouillé pendant la modification : les événements du
+    // journal sont calculés sur l'état réellement remplacé
+    const changed = await withTransaction(async (connection) => {
+      const [before] = await selectTicketsForUpdate(connection, [id]);
+      if (!before) {
+        return null;
+      }
+      await connection.execute(`UPDATE tickets SET ${update.setClause} WHERE id = ?`, [...update.values, id]);
+      const [after] = await selectTicketsForUpdate(connection, [id]);
+      const events = ticketEvents.diffTicket(before, after);
+      await ticketEvents.record(connection, events, req.user.id);
+      return { previous: before, current: after, events };
+    });
+    if (!changed) {
+      return res.status(404).json({ message: 'Ticket non trouvé' });
+    }
+    const { previous, current, events } = changed;
+    resourceVersions.bump('tickets', [id]);
+    if (events.length > 0) {
+      resourceVersions.bump('ticket-events', [id]);
+    }
+    statsEngine.recordUpdate(previous, current);
+    autoAssignment.recordChange(previous, current);
+    changeFeed.publish('updated', id, current);
+    res.status(200).json({ message: 'Ticket modifié avec succès' });
+    scheduleAutoAssignments();
+  } catch (err) {
+    res.status(500).json({ message: 'Erreur lors de la modification du ticket', error: err });
   }
-  if (description) {
-    updateQuery += 'description = ?, ';
-    values.push(description);
+};
+
+// Supprimer un ticket
+const deleteTicket = async (req, res) => {
+  const { id } = req.params;
+
+  try {
+    // Le ticket est verrouillé jusqu'à sa suppression : les statistiques retirent
+    // l'état réellement supprimé, une seule fois en cas de suppressions concurrentes
+    const previous = await withTransaction(async (connection) => {
+      const [before] = await selectTicketsForUpdate(connection, [id]);
+      if (!before) {
+        return null;
+      }
+      await ticketEvents.record(connection, ticketEvents.deletionEvents([before]), req.user.id);
+      const [result] = await connection.execute('DELETE FROM tickets WHERE id = ?', [id]);
+      return result.affectedRows > 0 ? before : null;
+    });
+    if (!previous) {
+      return res.status(404).json({ message: 'Ticket non trouvé' });
+    }
+    resourceVersions.bump('tickets', [id]);
+    resourceVersions.bump('ticket-events', [id]);
+    statsEngine.recordDelete(previous);
+    autoAssignment.recordChange(previous, null);
+    changeFeed.publish('deleted', id);
+    res.status(200).json({ message: 'Ticket supprimé avec succès' });
+    scheduleAutoAssignments();
+  } catch (err) {
+    res.status(500).json({ message: 'Erreur lors de la suppression du ticket', error: err });
+  }
+};
+
+// Nombre maximal de tickets traités par une opération groupée
+const MAX_BULK_IDS = 1000;
+
+// Valide la liste d'ids d'une opération groupée (null si invalide)
+const parseBulkIds = (ids) => {
+  if (!Array.isArray(ids) || ids.length === 0 || ids.length > MAX_BULK_IDS) {
+    return null;
   }
-  if (statut) {
-    updateQuery += 'statut = ?, ';
-    values.push(statut);
+  const parsed = [...new Set(ids.map((id) => parseInt(id, 10)))];
+  return parsed.some((id) => Number.isNaN(id)) ? null : parsed;
+};
+
+const selectTicketsForUpdate = async (connection, ids) => {
+  const placeholders = ids.map(() => '?').join(', ');
+  const [rows] = await connection.execute(`SELECT * FROM tickets WHERE id IN (${placeholders}) FOR UPDATE`, ids);
+  return rows;
+};
+
+// Exécute une opération groupée dans une seule transaction
+const withTransaction = async (work) => {
+  const connection = await db.getConnection();
+  try {
+    await connection.beginTransaction();
+    const result = await work(connection);
+    await connection.commit();
+    return result;
+  } catch (err) {
+    await connection.rollback();
+    throw err;
+  } finally {
+    connection.release();
   }
-  if (priorite) {
-    updateQuery += 'priorite = ?, ';
-    values.push(priorite);
+};
+
+// Applique les assignations des tickets en attente décidées par l'ordonnanceur,
+// une transaction par ticket. Un ticket assigné, clos ou supprimé entre-temps est
+// laissé tel quel et l'ordonnanceur est recalé sur son état réel.
+const applyAutoAssignments = async (assignments) => {
+  for (const { ticketId, technicianId } of assignments) {
+    let committed = false;
+    try {
+      const changed = await withTransaction(async (connection) => {
+        const [before] = await selectTicketsForUpdate(connection, [ticketId]);
+        if (!before || before.id_technicien !== null || !isOpen(before)) {
+          return { previous: before || null, current: null, skipped: true };
+        }
+        await connection.execute('UPDATE tickets SET id_technicien = ? WHERE id = ?', [technicianId, ticketId]);
+        const [after] = await selectTicketsForUpdate(connection, [ticketId]);
+        await ticketEvents.record(connection, ticketEvents.diffTicket(before, after));
+        return { previous: before, current: after, skipped: false };
+      });
+      committed = true;
+
+      if (changed.skipped) {
+        autoAssignment.recordChange({ id: ticketId }, changed.previous);
+        continue;
+      }
+      resourceVersions.bump('tickets', [ticketId]);
+      resourceVersions.bump('ticket-events', [ticketId]);
+      statsEngine.recordUpdate(changed.previous, changed.current);
+      autoAssignment.recordChange(changed.previous, changed.current);
+      changeFeed.publish('updated', ticketId, changed.current);
+    } catch (err) {
+      if (!committed) {
+        autoAssignment.cancel(ticketId);
+      }
+      console.error(`Erreur lors de l'assignation automatique du ticket ${ticketId}:`, err);
+    }
   }
-  if (date_creation) {
-    updateQuery += 'date_creation = ?, ';
-    values.push(date_creation);
+};
+
+// Assigne en arrière-plan, après la réponse, les tickets en attente qu'une écriture a débloqués
+const scheduleAutoAssignments = () => {
+  const assignments = autoAssignment.takeAssignments();
+  if (assignments.length > 0) {
+    applyAutoAssignments(assignments);
   }
+};
+
+// Modifier plusieurs tickets (changement de statut, assignation...) en une transaction
+const bulkUpdateTickets = async (req, res) => {
+  const ids = parseBulkIds(req.body.ids);
+  const update = buildTicketUpdate(req.body.data || {});
 
-  // Retirer la virgule finale
-  updateQuery = updateQuery.slice(0, -2);
-  updateQuery += ' WHERE id = ?';
-  values.push(id);
+  if (!ids) {
+    return res.status(400).json({ message: `Le champ ids doit être une liste de 1 à ${MAX_BULK_IDS} identifiants` });
+  }
+  if (!update) {
+    return res.status(400).json({ message: `Il faut au moins un champ à modifier (${TICKET_UPDATABLE_FIELDS.join(', ')})` });
+  }
 
   try {
-    const [result] = await db.execute(updateQuery, values);
-    if (result.affectedRows === 0) {
+    const { previous, updated, events } = await withTransaction(async (connection) => {
+      const before = await selectTicketsForUpdate(connection, ids);
+      const placeholders = ids.map(() => '?').join(', ');
+      await connection.execute(`UPDATE tickets SET ${update.setClause} WHERE id IN (${placeholders})`, [...update.values, ...ids]);
+      const after = await selectTicketsForUpdate(connection, ids);
+      const beforeById = new Map(before.map((row) => [row.id, row]));
+      const events = after.flatMap((row) => ticketEvents.diffTicket(beforeById.get(row.id), row));
+      await ticketEvents.record(connection, events, req.user.id);
+      return { previous: before, updated: after, events };
+    });
+
+    resourceVersions.bump('tickets', previous.map((row) => row.id));
+    resourceVersions.bump('ticket-events', [...new Set(events.map((event) => event.ticketId))]);
+    const updatedById = new Map(updated.map((row) => [row.id, row]));
+    previous.forEach((row) => {
+      statsEngine.recordUpdate(row, updatedById.get(row.id));
+      autoAssignment.recordChange(row, updatedById.get(row.id));
+    });
+    updated.forEach((row) => changeFeed.publish('updated', row.id, row));
+
+    const found = new Set(previous.map((row) => row.id));
+    res.status(200).json({
+      message: `${previous.length} ticket(s) modifié(s)`,
+      updated: previous.length,
+      not_found: ids.filter((id) => !found.has(id)),
+    });
+    scheduleAutoAssignments();
+  } catch (err) {
+    res.status(500).json({ message: 'Erreur lors de la modification groupée des tickets', error: err });
+  }
+};
+
+// Supprimer plusieurs tickets en une transaction
+const bulkDeleteTickets = async (req, res) => {
+  const ids = parseBulkIds(req.body.ids);
+
+  if (!ids) {
+    return res.status(400).json({ message: `Le champ ids doit être une liste de 1 à ${MAX_BULK_IDS} identifiants` });
+  }
+
+  try {
+    const previous = await withTransaction(async (connection) => {
+      const before = await selectTicketsForUpdate(connection, ids);
+      await ticketEvents.record(connection, ticketEvents.deletionEvents(before), req.user.id);
+      const placeholders = ids.map(() => '?').join(', ');
+      await connection.execute(`DELETE FROM tickets WHERE id IN (${placeholders})`, ids);
+      return before;
+    });
+
+    resourceVersions.bump('tickets', previous.map((row) => row.id));
+    resourceVersions.bump('ticket-events', previous.map((row) => row.id));
+    previous.forEach((row) => {
+      statsEngine.recordDelete(row);
+      autoAssignment.recordChange(row, null);
+      changeFeed.publish('deleted', row.id);
+    });
+
+    const found = new Set(previous.map((row) => row.id));
+    res.status(200).json({
+      message: `${previous.length} ticket(s) supprimé(s)`,
+      deleted: previous.length,
+      not_found: ids.filter((id) => !found.has(id)),
+    });
+    scheduleAutoAssignments();
+  } catch (err) {
+    res.status(500).json({ message: 'Erreur lors de la suppression groupée des tickets', error: err });
+  }
+};
+
+// Colonnes renvoyées pour un événement du journal, avec le nom de son auteur.
+// La sous-requête garde ticket_events seule dans le FROM : les colonnes du
+// curseur (date_evenement, id) n'y sont pas ambiguës.
+const TICKET_EVENT_COLUMNS = `id, ticket_id, type, ancienne_valeur, nouvelle_valeur, commentaire, id_auteur,
+  (SELECT nom FROM users WHERE users.id = ticket_events.id_auteur) AS auteur, date_evenement`;
+
+// Longueur maximale d'un commentaire
+const MAX_COMMENT_LENGTH = 5000;
+
+// Historique d'un ticket, du plus ancien au plus récent événement, paginé par
+// curseur sur (date_evenement, id) : lu par l'index (ticket_id, date_evenement)
+const getTicketEvents = async (req, res) => {
+  const { id } = req.params;
+  const { limit, cursor } = req.query;
+
+  const decodedCursor = cursor ? decodeCursor(cursor, 'date_evenement') : null;
+  if (cursor && !decodedCursor) {
+    return res.status(400).json({ message: 'Curseur de pagination invalide' });
+  }
+
+  try {
+    // Le ticket n'est relu que pour la première page, sauf pour un employé (limité à ses tickets)
+    const checked = !decodedCursor || req.user.role === ROLES.EMPLOYEE;
+    if (checked && !canReadTicket(req.user, await findTicket(id))) {
       return res.status(404).json({ message: 'Ticket non trouvé' });
     }
-    res.status(200).json({ message: 'Ticket modifié avec succès' });
+
+    const keyset = keysetClause('date_evenement', 'asc', decodedCursor);
+    const conditions = ['ticket_id = ?', ...(keyset.condition ? [keyset.condition] : [])];
+    const pageSize = parseLimit(limit);
+    const [rows] = await db.execute(
+      `SELECT ${TICKET_EVENT_COLUMNS} FROM ticket_events WHERE ${conditions.join(' AND ')} ${keyset.orderBy} LIMIT ${pageSize + 1}`,
+      [id, ...keyset.values]
+    );
+
+    const items = rows.slice(0, pageSize);
+    const nextCursor = rows.length > pageSize ? encodeCursor(items[items.length - 1], 'date_evenement') : null;
+    res.status(200).json({ items, next_cursor: nextCursor });
   } catch (err) {
-    res.status(500).json({ message: 'Erreur lors de la modification du ticket', error: err });
+    res.status(500).json({ message: "Erreur lors de la récupération de l'historique du ticket", error: err });
   }
 };
 
-// Supprimer un ticket
-const deleteTicket = async (req, res) => {
+// Ajouter un commentaire à un ticket (événement du journal)
+const addTicketComment = async (req, res) => {
   const { id } = req.params;
+  const commentaire = typeof req.body.commentaire === 'string' ? req.body.commentaire.trim() : '';
+
+  if (!commentaire || commentaire.length > MAX_COMMENT_LENGTH) {
+    return res.status(400).json({ message: `Le commentaire est obligatoire (${MAX_COMMENT_LENGTH} caractères au plus)` });
+  }
 
   try {
-    const [result] = await db.execute('DELETE FROM tickets WHERE id = ?', [id]);
-    if (result.affectedRows === 0) {
+    // Un employé ne commente que ses propres tickets
+    if (!canReadTicket(req.user, await findTicket(id))) {
       return res.status(404).json({ message: 'Ticket non trouvé' });
     }
-    res.status(200).json({ message: 'Ticket supprimé avec succès' });
+    await ticketEvents.record(db, [{ ticketId: id, type: ticketEvents.EVENT_TYPES.COMMENT, commentaire }], req.user.id);
+    resourceVersions.bump('ticket-events', [id]);
+    res.status(201).json({ message: 'Commentaire ajouté' });
   } catch (err) {
-    res.status(500).json({ message: 'Erreur lors de la suppression du ticket', error: err });
+    res.status(500).json({ message: "Erreur lors de l'ajout du commentaire", error: err });
+  }
+};
+
+// Intervalle des commentaires envoyés pour garder la connexion SSE ouverte
+const HEARTBEAT_MS = 15000;
+
+// Lit un identifiant d'événement "<boot>-<seq>" (null s'il est invalide)
+const parseEventId = (value) => {
+  const match = /^([0-9a-f]+)-(\d+)$/.exec(String(value || ''));
+  return match ? { boot: match[1], seq: Number(match[2]) } : null;
+};
+
+// Flux des modifications de tickets en Server-Sent Events.
+// Le client reprend après une déconnexion avec Last-Event-ID (ou ?since=) ;
+// un événement `reset` lui indique de recharger ses données quand des
+// modifications manquées ne sont plus disponibles (ou après un redémarrage).
+const streamTicketChanges = (req, res) => {
+  const writeEvent = (type, seq, data) => {
+    res.write(`id: ${resourceVersions.BOOT_ID}-${seq}\nevent: ${type}\ndata: ${JSON.stringify(data)}\n\n`);
+  };
+
+  res.status(200);
+  res.set({
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive',
+  });
+  res.flushHeaders();
+
+  const resumeFrom = req.headers['last-event-id'] || req.query.since;
+  const lastEvent = parseEventId(resumeFrom);
+  const missed = lastEvent && lastEvent.boot === resourceVersions.BOOT_ID ? changeFeed.eventsSince(lastEvent.seq) : null;
+
+  if (!resumeFrom) {
+    writeEvent('ready', changeFeed.currentSeq(), { seq: changeFeed.currentSeq() });
+  } else if (missed === null) {
+    writeEvent('reset', changeFeed.currentSeq(), { seq: changeFeed.currentSeq() });
+  } else {
+    missed.forEach((event) => writeEvent(event.type, event.seq, event));
   }
+
+  const unsubscribe = changeFeed.subscribe((event) => writeEvent(event.type, event.seq, event));
+  const heartbeat = setInterval(() => res.write(': ping\n\n'), HEARTBEAT_MS);
+
+  req.on('close', () => {
+    clearInterval(heartbeat);
+    unsubscribe();
+  });
 };
 
-module.exports = { getAllTickets, getTicket, createTicket, updateTicket, deleteTicket };
+module.exports = {
+  getAllTickets,
+  searchTickets,
+  streamTicketChanges,
+  getTicketColumns,
+  getTicket,
+  createTicket,
+  updateTicket,
+  deleteTicket,
+  bulkUpdateTickets,
+  bulkDeleteTickets,
+  getTicketEvents,
+  addTicketComment,
+};
@@ -1,11 +1,36 @@
 const db = require('./../db');
-
-// Récupérer tous les utilisateurs
+const { parseFields, selectList } = require('./../utils/projection');
+const { streamNdjson } = require('./../utils/ndjson');
+const resourceVersions = require('./../services/resourceVersions');
+const changeFeed = require('./../services/changeFeed');
+const passwords = require('./../services/passwords');
+const autoAssignment = require('./../services/autoAssignment');
+const { ROLES } = require('./../middleware/auth');
+
+// Colonnes pouvant être demandées via ?fields= (jamais le mot de passe)
+const USER_FIELDS = ['id', 'nom', 'email', 'role', 'date_inscription'];
+
+// Récupérer tous les utilisateurs (éventuellement filtrés par rôle)
 const getAllUsers = async (req, res) => {
+    const { role } = req.query;
+
+    const projection = parseFields(req.query.fields, USER_FIELDS, ['id']);
+    if (projection.error) {
+      return res.status(400).json({ message: projection.error });
+    }
+
+    const query = `SELECT ${selectList(projection.columns || USER_FIELDS)} FROM users`;
+
+    // Avec format=ndjson, la liste est envoyée en streaming
+    if (req.query.format === 'ndjson') {
+      return streamNdjson(res, role ? `${query} WHERE role = ?` : query, role ? [role] : [],
+        'Erreur lors de la récupération des utilisateurs');
+    }
+
     try {
-      console.log('Tentative de récupération des utilisateurs...');
-      const [rows] = await db.execute('SELECT * FROM users');
-      console.log('Utilisateurs récupérés:', rows);
+      const [rows] = role
+        ? await db.execute(`${query} WHERE role = ?`, [role])
+        : await db.execute(query);
       res.status(200).json(rows);
     } catch (err) {
       console.error('Erreur lors de la récupération des utilisateurs:', err);
@@ -19,7 +44,12 @@ const getAllUsers = async (req, res) => {
       const userId = req.params.id; // Récupère l'ID depuis les paramètres de l'URL
   
       console.log(`Tentative de récupération de l'utilisateur avec l'ID: ${userId}`);
-      const [rows] = await db.execute('SELECT * FROM users WHERE id = ?', [userId]);
+      // Un employé ne lit que sa propre fiche et celles des techniciens
+      const employeeScope = req.user.role === ROLES.EMPLOYEE && Number(userId) !== req.user.id;
+      const [rows] = await db.execute(
+        `SELECT ${selectList(USER_FIELDS)} FROM users WHERE id = ?${employeeScope ? " AND role = 'Technicien'" : ''}`,
+        [userId]
+      );
   
       if (rows.length === 0) {
         return res.status(404).json({ message: "Utilisateur non trouvé" });
@@ -40,7 +70,7 @@ const getAllUsers = async (req, res) => {
   const getAllTechnicians = async (req, res) => {
     try {
         console.log('Tentative de récupération des techniciens...');
-        const [rows] = await db.execute('SELECT * FROM users WHERE role = "Technicien"');
+        const [rows] = await db.execute(`SELECT ${selectList(USER_FIELDS)} FROM users WHERE role = "Technicien"`);
         console.log('Techniciens récupérés:', rows);
         res.status(200).json(rows);
     } catch (err) {
@@ -52,7 +82,7 @@ const getAllUsers = async (req, res) => {
 const getAllEmployees = async (req, res) => {
     try {
         console.log('Tentative de récupération des employés...');
-        const [rows] = await db.execute('SELECT * FROM users WHERE role = "Employé"');
+        const [rows] = await db.execute(`SELECT ${selectList(USER_FIELDS)} FROM users WHERE role = "Employé"`);
         console.log('Employés récupérés:', rows);
         res.status(200).json(rows);
     } catch (err) {
@@ -64,7 +94,7 @@ const getAllEmployees = async (req, res) => {
 const getAllAdmins = async (req, res) => {
     try {
         console.log('Tentative de récupération des admins...');
-        const [rows] = await db.execute('SELECT * FROM users WHERE role = "Admin"');
+        const [rows] = await db.execute(`SELECT ${selectList(USER_FIELDS)} FROM users WHERE role = "Admin"`);
         console.log('Admins récupérés:', rows);
         res.status(200).json(rows);
     } catch (err) {
@@ -88,10 +118,15 @@ const createUser = async (req, res) => {
   }
 
   try {
+    const hash = await passwords.hashPassword(mot_de_passe);
     const [result] = await db.execute(
       'INSERT INTO users (nom, email, mot_de_passe, role) VALUES (?, ?, ?, ?)', 
-      [nom, email, mot_de_passe, role]
+      [nom, email, hash, role]
     );
+    resourceVersions.bump('users', [result.insertId]);
+    if (role === 'Technicien') {
+      autoAssignment.invalidate();
+    }
     res.status(201).json({ message: 'Utilisateur créé', userId: result.insertId });
   } catch (err) {
     res.status(500).json({ message: 'Erreur lors de la création de l\'utilisateur', error: err });
@@ -119,7 +154,7 @@ const updateUser = async (req, res) => {
   }
   if (mot_de_passe) {
     updateQuery += 'mot_de_passe = ?, ';
-    values.push(mot_de_passe);
+    values.push(await passwords.hashPassword(mot_de_passe));
   }
   if (role) {
     updateQuery += 'role = ?, ';
@@ -136,6 +171,10 @@ const updateUser = async (req, res) => {
     if (result.affectedRows === 0) {
       return res.status(404).json({ message: 'Utilisateur non trouvé' });
     }
+    resourceVersions.bump('users', [id]);
+    if (role) {
+      autoAssignment.invalidate();
+    }
     res.status(200).json({ message: 'Utilisateur modifié avec succès' });
   } catch (err) {
     res.status(500).json({ message: 'Erreur lors de la modification de l\'utilisateur', error: err });
@@ -147,10 +186,21 @@ const deleteUser = async (req, res) => {
   const { id } = req.params;
 
   try {
+    // Les tickets liés sont désassignés par la base (ON DELETE SET NULL) : ils changent aussi
+    const [linked] = await db.execute('SELECT id FROM tickets WHERE id_employe = ? OR id_technicien = ?', [id, id]);
     const [result] = await db.execute('DELETE FROM users WHERE id = ?', [id]);
     if (result.affectedRows === 0) {
       return res.status(404).json({ message: 'Utilisateur non trouvé' });
     }
+    resourceVersions.bump('users', [id]);
+    resourceVersions.bump('tickets', linked.map((row) => row.id));
+    // Les tickets d'un technicien supprimé retournent en file d'attente
+    autoAssignment.invalidate();
+    if (linked.length > 0) {
+      const ids = linked.map((row) => row.id);
+      const [tickets] = await db.execute(`SELECT * FROM tickets WHERE id IN (${ids.map(() => '?').join(', ')})`, ids);
+      tickets.forEach((ticket) => changeFeed.publish('updated', ticket.id, ticket));
+    }
     res.status(200).json({ message: 'Utilisateur supprimé avec succès' });
   } catch (err) {
     res.status(500).json({ message: 'Erreur lors de la suppression de l\'utilisateur', error: err });
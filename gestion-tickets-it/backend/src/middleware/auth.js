@@ -0,0 +1,76 @@
+const crypto = require('crypto');
+const tokens = require('../services/token');
+
+// Identification de l'appelant par son jeton de session (Authorization: Bearer ...).
+// Le jeton signé porte l'id et le rôle : aucune lecture de la table users n'est
+// nécessaire pour autoriser une requête. Lectures et écritures exigent un rôle ;
+// un employé ne lit que ses propres tickets.
+//
+// Le frontend lit aussi l'ensemble des tickets pour des structures partagées par
+// toutes ses sessions (réplique en mémoire, index des doublons, flux des
+// modifications) : ces lectures ne doivent pas dépendre de l'utilisateur qui les
+// déclenche. Il s'identifie alors avec sa propre clé (Authorization: Service
+// <API_SERVICE_KEY>), qui donne le rôle Service : lecture seule de tous les
+// tickets, sans accès aux écritures ni aux comptes.
+
+const ROLES = {
+  ADMIN: 'Admin',
+  TECHNICIAN: 'Technicien',
+  EMPLOYEE: 'Employé',
+  SERVICE: 'Service',
+};
+
+// Rôles des comptes utilisateurs (le rôle Service n'en fait pas partie)
+const USER_ROLES = [ROLES.ADMIN, ROLES.TECHNICIAN, ROLES.EMPLOYEE];
+
+const SERVICE_KEY = process.env.API_SERVICE_KEY || '';
+if (!SERVICE_KEY) {
+  console.warn('API_SERVICE_KEY non défini : les lectures partagées du frontend sont refusées');
+}
+
+const digest = (value) => crypto.createHash('sha256').update(String(value)).digest();
+
+// Comparaison en temps constant avec la clé de service (désactivée sans clé)
+const isServiceKey = (key) => Boolean(SERVICE_KEY) && crypto.timingSafeEqual(digest(key), digest(SERVICE_KEY));
+
+// Renseigne req.user ({ id, nom, email, role, exp }) si un jeton est fourni ; rejette un jeton invalide
+const authenticate = (req, res, next) => {
+  const header = req.get('Authorization');
+  if (!header) {
+    req.user = null;
+    return next();
+  }
+
+  const [scheme, token] = header.split(' ');
+  if (scheme === 'Service') {
+    if (!isServiceKey(token)) {
+      return res.status(401).json({ message: 'Clé de service invalide' });
+    }
+    req.user = { id: null, nom: 'Service', email: null, role: ROLES.SERVICE, exp: null };
+    return next();
+  }
+
+  const claims = scheme === 'Bearer' ? tokens.verify(token) : null;
+  if (!claims) {
+    return res.status(401).json({ message: 'Jeton de session invalide ou expiré' });
+  }
+  req.user = { id: claims.sub, nom: claims.nom, email: claims.email, role: claims.role, exp: claims.exp };
+  next();
+};
+
+// Exige un appelant authentifié et, si des rôles sont donnés, l'un d'eux
+const requireRole = (...roles) => (req, res, next) => {
+  if (!req.user) {
+    return res.status(401).json({ message: 'Authentification requise' });
+  }
+  if (roles.length > 0 && !roles.includes(req.user.role)) {
+    return res.status(403).json({ message: 'Accès refusé pour ce rôle' });
+  }
+  next();
+};
+
+// Un employé n'accède qu'aux tickets qu'il a créés
+const canReadTicket = (user, ticket) => Boolean(user && ticket)
+  && (user.role !== ROLES.EMPLOYEE || ticket.id_employe === user.id);
+
+module.exports = { authenticate, requireRole, canReadTicket, ROLES, USER_ROLES };
@@ -0,0 +1,122 @@
+const zlib = require('zlib');
+
+// Compression gzip/deflate des réponses, négociée via l'en-tête Accept-Encoding.
+// Les réponses JSON et NDJSON sont compressées au fil de l'eau : une liste
+// envoyée en streaming est compressée morceau par morceau sans être bufferisée.
+
+const COMPRESSIBLE_TYPES = /^(application\/(json|x-ndjson)|text\/(plain|html|csv))/;
+const SUPPORTED_ENCODINGS = ['gzip', 'deflate'];
+
+// Choisit l'encodage accepté par le client avec le meilleur poids q
+const negotiateEncoding = (header) => {
+  if (!header) {
+    return null;
+  }
+
+  let best = null;
+  let bestQuality = 0;
+  String(header).split(',').forEach((part) => {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const qParam = params.find((param) => param.trim().startsWith('q='));
+    const quality = qParam ? parseFloat(qParam.trim().slice(2)) : 1;
+    const candidates = name === '*' ? SUPPORTED_ENCODINGS : [name];
+    candidates.forEach((encoding) => {
+      if (SUPPORTED_ENCODINGS.includes(encoding) && quality > bestQuality) {
+        best = encoding;
+        bestQuality = quality;
+      }
+    });
+  });
+  return best;
+};
+
+const toBuffer = (chunk, encoding) => (Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, encoding));
+
+const compression = ({ threshold = 1024 } = {}) => (req, res, next) => {
+  res.vary('Accept-Encoding');
+
+  const encoding = negotiateEncoding(req.headers['accept-encoding']);
+  if (!encoding || req.method === 'HEAD') {
+    return next();
+  }
+
+  const originalWrite = res.write;
+  const originalEnd = res.end;
+  let decided = false;
+  let stream = null;
+
+  // Décide au premier write/end, avant l'envoi des en-têtes, s'il faut compresser
+  const decide = (length) => {
+    decided = true;
+    if (res.headersSent || res.statusCode === 204 || res.statusCode === 304 || res.getHeader('Content-Encoding')) {
+      return;
+    }
+    if (!COMPRESSIBLE_TYPES.test(String(res.getHeader('Content-Type') || ''))) {
+      return;
+    }
+    const declaredLength = res.getHeader('Content-Length');
+    const size = declaredLength !== undefined ? Number(declaredLength) : length;
+    if (size !== null && size < threshold) {
+      return;
+    }
+
+    res.setHeader('Content-Encoding', encoding);
+    res.removeHeader('Content-Length');
+
+    stream = encoding === 'gzip' ? zlib.createGzip() : zlib.createDeflate();
+    stream.on('data', (chunk) => {
+      if (originalWrite.call(res, chunk) === false) {
+        stream.pause();
+      }
+    });
+    stream.on('end', () => originalEnd.call(res));
+    // Le socket a vidé son tampon : reprendre la compression ;
+    // le compresseur a vidé le sien : prévenir les producteurs qui attendent 'drain'
+    res.on('drain', () => stream.resume());
+    stream.on('drain', () => res.emit('drain'));
+  };
+
+  res.write = function write(chunk, chunkEncoding, callback) {
+    if (!decided) {
+      // Longueur inconnue : réponse envoyée en streaming
+      decide(null);
+    }
+    if (!stream) {
+      return originalWrite.apply(this, arguments);
+    }
+    return stream.write(toBuffer(chunk, chunkEncoding), callback);
+  };
+
+  res.end = function end(chunk, chunkEncoding, callback) {
+    if (typeof chunk === 'function') {
+      callback = chunk;
+      chunk = undefined;
+    }
+    if (!decided) {
+      decide(chunk ? toBuffer(chunk, chunkEncoding).length : 0);
+    }
+    if (!stream) {
+      return originalEnd.apply(this, arguments);
+    }
+    if (callback) {
+      res.once('finish', callback);
+    }
+    if (chunk) {
+      stream.end(toBuffer(chunk, chunkEncoding));
+    } else {
+      stream.end();
+    }
+    return this;
+  };
+
+  // Force l'envoi des données déjà compressées (utile en streaming)
+  res.flush = () => {
+    if (stream) {
+      stream.flush();
+    }
+  };
+
+  next();
+};
+
+module.exports = { compression, negotiateEncoding };
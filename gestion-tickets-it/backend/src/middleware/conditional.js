@@ -0,0 +1,97 @@
+// Requêtes conditionnelles (If-None-Match / If-Modified-Since).
+// Les validateurs d'une ressource sont calculés à partir de ses compteurs de
+// version, avant d'exécuter le contrôleur : si le client possède déjà la version
+// courante, la réponse 304 est envoyée sans aucune requête SQL.
+
+// Taille de la dernière réponse 200 par URL et validateur, pour estimer les octets économisés
+const MAX_TRACKED_RESPONSES = 10000;
+const responseSizes = new Map();
+
+const counters = {
+  conditional_requests: 0,
+  not_modified: 0,
+  queries_avoided: 0,
+  bytes_avoided: 0,
+};
+
+const etagMatches = (header, etag) => {
+  if (!header) {
+    return false;
+  }
+  // Comparaison faible : W/"x" et "x" désignent la même version
+  const opaque = etag.replace(/^W\//, '');
+  return header.split(',').some((candidate) => {
+    const value = candidate.trim();
+    return value === '*' || value.replace(/^W\//, '') === opaque;
+  });
+};
+
+const isNotModified = (req, { etag, lastModified }) => {
+  const ifNoneMatch = req.headers['if-none-match'];
+  if (ifNoneMatch) {
+    // If-None-Match est prioritaire sur If-Modified-Since
+    return etagMatches(ifNoneMatch, etag);
+  }
+
+  const ifModifiedSince = Date.parse(req.headers['if-modified-since'] || '');
+  if (Number.isNaN(ifModifiedSince)) {
+    return false;
+  }
+  // Last-Modified a une précision à la seconde
+  return Math.floor(lastModified / 1000) * 1000 <= ifModifiedSince;
+};
+
+const rememberSize = (key, size) => {
+  responseSizes.delete(key);
+  responseSizes.set(key, size);
+  if (responseSizes.size > MAX_TRACKED_RESPONSES) {
+    responseSizes.delete(responseSizes.keys().next().value);
+  }
+};
+
+// getValidators(req) retourne { etag, lastModified } ou null si la ressource
+// ne peut pas être validée (la requête est alors traitée normalement)
+const conditional = (getValidators) => (req, res, next) => {
+  if (req.method !== 'GET' && req.method !== 'HEAD') {
+    return next();
+  }
+
+  const validators = getValidators(req);
+  if (!validators) {
+    return next();
+  }
+
+  const sizeKey = `${req.originalUrl} ${validators.etag}`;
+  if (req.headers['if-none-match'] || req.headers['if-modified-since']) {
+    counters.conditional_requests += 1;
+  }
+
+  res.set('ETag', validators.etag);
+  res.set('Last-Modified', new Date(validators.lastModified).toUTCString());
+  res.set('Cache-Control', 'no-cache');
+
+  if (isNotModified(req, validators)) {
+    counters.not_modified += 1;
+    counters.queries_avoided += 1;
+    counters.bytes_avoided += responseSizes.get(sizeKey) || 0;
+    return res.status(304).end();
+  }
+
+  // Mémorise la taille du corps renvoyé (avant compression) ; les réponses
+  // d'erreur ne portent pas de validateur
+  const send = res.send.bind(res);
+  res.send = (body) => {
+    if (res.statusCode === 200 && body !== undefined) {
+      rememberSize(sizeKey, Buffer.isBuffer(body) ? body.length : Buffer.byteLength(String(body)));
+    } else if (res.statusCode !== 200) {
+      res.removeHeader('ETag');
+      res.removeHeader('Last-Modified');
+    }
+    return send(body);
+  };
+  return next();
+};
+
+const getCounters = () => ({ ...counters, tracked_responses: responseSizes.size });
+
+module.exports = { conditional, getCounters };
@@ -1,9 +1,21 @@
 const express = require('express');
 const router = express.Router();
 const authController = require('../controllers/authController');
+const { requireRole, USER_ROLES } = require('../middleware/auth');
+
+// Jetons de session des comptes utilisateurs (pas la clé de service du frontend)
+const usersOnly = requireRole(...USER_ROLES);
 
 
 router.post('/auth/verify', authController.loginUser);
 
+// Utilisateur de la session, lu dans le jeton
+router.get('/auth/me', usersOnly, authController.getSessionUser);
+
+// Codes de reprise de session à usage unique : l'URL du frontend ne porte pas le jeton
+router.post('/auth/resume-code', usersOnly, authController.createResumeCode);
+router.post('/auth/resume', authController.resumeSession);
+router.post('/auth/logout', authController.logoutUser);
+
 
 module.exports = router;
\ No newline at end of file
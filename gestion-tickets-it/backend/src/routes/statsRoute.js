@@ -1,9 +1,34 @@
 const express = require('express');
 const router = express.Router();
 const statsController = require('../controllers/statsController');
+const { conditional } = require('../middleware/conditional');
+const statsEngine = require('../services/statsEngine');
+const { validatorsFor } = require('../services/resourceVersions');
+const { requireRole, ROLES } = require('../middleware/auth');
 
+// Statistiques et compteurs du tableau de bord : réservés aux administrateurs
+const adminOnly = requireRole(ROLES.ADMIN);
 
-router.get('/statistics', statsController.getTicketStats);
+// Validateurs HTTP des statistiques, dérivés de leur version matérialisée
+const statsValidators = conditional(() => {
+  const current = statsEngine.getValidatorState();
+  return current ? validatorsFor('statistics', current.version, current.modifiedAt) : null;
+});
+
+
+router.get('/statistics', adminOnly, statsValidators, statsController.getTicketStats);
+
+// Route pour recalculer les statistiques matérialisées (relecture complète de la table)
+router.post('/statistics/rebuild', adminOnly, statsController.rebuildTicketStats);
+
+// Compteurs des requêtes conditionnelles (304, requêtes SQL et octets évités)
+router.get('/statistics/http-cache', adminOnly, statsController.getHttpCacheStats);
+
+// Charge des techniciens et file d'attente de l'assignation automatique
+router.get('/statistics/assignment', adminOnly, statsController.getAssignmentStats);
+
+// Disponibilité du serveur et de la base
+router.get('/health', statsController.getHealth);
 
 
 module.exports = router;
\ No newline at end of file
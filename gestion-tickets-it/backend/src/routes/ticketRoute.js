@@ -1,21 +1,54 @@
 const express = require('express');
 const router = express.Router();
 const ticketController = require('../controllers/ticketController');
+const { conditional } = require('../middleware/conditional');
+const { requireRole, ROLES, USER_ROLES } = require('../middleware/auth');
+const { collectionValidators, recordValidators } = require('../services/resourceVersions');
 
+// Validateurs HTTP : la liste dépend de tous les tickets, la fiche d'un seul
+const ticketsValidators = conditional(() => collectionValidators('tickets'));
+const ticketValidators = conditional((req) => recordValidators('tickets', req.params.id));
+const ticketEventsValidators = conditional((req) => recordValidators('ticket-events', req.params.id));
 
-router.get('/tickets', ticketController.getAllTickets);
+// Tout utilisateur connecté crée des tickets et lit les siens ; seuls les techniciens et admins les traitent
+const usersOnly = requireRole(...USER_ROLES);
+const staffOnly = requireRole(ROLES.TECHNICIAN, ROLES.ADMIN);
+// Lectures de tous les tickets : techniciens, admins et structures partagées du frontend
+const staffReads = requireRole(ROLES.TECHNICIAN, ROLES.ADMIN, ROLES.SERVICE);
+// Lectures limitées aux tickets de l'appelant pour un employé (voir canReadTicket)
+const readers = requireRole(...USER_ROLES, ROLES.SERVICE);
+
+
+router.get('/tickets', readers, ticketsValidators, ticketController.getAllTickets);
+
+// Recherche plein texte (déclarée avant les routes /tickets/:id)
+router.get('/tickets/search', readers, ticketsValidators, ticketController.searchTickets);
+
+// Flux des modifications de tickets (Server-Sent Events)
+router.get('/tickets/changes', staffReads, ticketController.streamTicketChanges);
+
+// Route pour exporter les tickets en colonnes (analyses du tableau de bord)
+router.get('/tickets/columns', staffReads, ticketsValidators, ticketController.getTicketColumns);
 
 // Route pour ajouter un ticket
-router.post('/tickets', ticketController.createTicket);
+router.post('/tickets', usersOnly, ticketController.createTicket);
+
+// Routes des opérations groupées (déclarées avant les routes /tickets/:id)
+router.put('/tickets/bulk', staffOnly, ticketController.bulkUpdateTickets);
+router.delete('/tickets/bulk', staffOnly, ticketController.bulkDeleteTickets);
 
 // Route pour récupérer un ticket
 
-router.get('/tickets/:id', ticketController.getTicket);
+router.get('/tickets/:id', readers, ticketValidators, ticketController.getTicket);
+
+// Historique d'un ticket (statuts, assignations, commentaires) et ajout d'un commentaire
+router.get('/tickets/:id/events', readers, ticketEventsValidators, ticketController.getTicketEvents);
+router.post('/tickets/:id/comments', usersOnly, ticketController.addTicketComment);
 
 // Route pour modifier un ticket
-router.put('/tickets/:id', ticketController.updateTicket);
+router.put('/tickets/:id', staffOnly, ticketController.updateTicket);
 
 // Route pour supprimer un ticket
-router.delete('/tickets/:id', ticketController.deleteTicket);
+router.delete('/tickets/:id', staffOnly, ticketController.deleteTicket);
 
 module.exports = router;
\ No newline at end of file
@@ -1,25 +1,39 @@
 const express = require('express');
 const router = express.Router();
 const userController = require('../controllers/userController');  // Ajustez le chemin selon votre structure
+const { conditional } = require('../middleware/conditional');
+const { requireRole, ROLES, USER_ROLES } = require('../middleware/auth');
+const { collectionValidators, recordValidators } = require('../services/resourceVersions');
+
+// Validateurs HTTP des listes et des fiches utilisateur
+const usersValidators = conditional(() => collectionValidators('users'));
+const userValidators = conditional((req) => recordValidators('users', req.params.id));
+
+// La gestion des comptes est réservée aux administrateurs
+const adminOnly = requireRole(ROLES.ADMIN);
+// Les listes de comptes sont lues par les techniciens et les admins ; celle des
+// techniciens et la fiche d'un technicien (noms affichés sur un ticket) par tout utilisateur
+const staffOnly = requireRole(ROLES.TECHNICIAN, ROLES.ADMIN);
+const usersOnly = requireRole(...USER_ROLES);
 
 // Route pour récupérer tous les utilisateurs
-router.get('/users', userController.getAllUsers);
+router.get('/users', staffOnly, usersValidators, userController.getAllUsers);
 
-router.get('/users/technicians', userController.getAllTechnicians);
+router.get('/users/technicians', usersOnly, usersValidators, userController.getAllTechnicians);
 
-router.get('/users/employees', userController.getAllEmployees);
+router.get('/users/employees', staffOnly, usersValidators, userController.getAllEmployees);
 
-router.get('/users/:id', userController.getUser);
+router.get('/users/admins', staffOnly, usersValidators, userController.getAllAdmins);
 
-router.get('/users/admins', userController.getAllAdmins);
+router.get('/users/:id', usersOnly, userValidators, userController.getUser);
 
 // Route pour ajouter un utilisateur
-router.post('/users', userController.createUser);
+router.post('/users', adminOnly, userController.createUser);
 
 // Route pour modifier un utilisateur
-router.put('/users/:id', userController.updateUser);
+router.put('/users/:id', adminOnly, userController.updateUser);
 
 // Route pour supprimer un utilisateur
-router.delete('/users/:id', userController.deleteUser);
+router.delete('/users/:id', adminOnly, userController.deleteUser);
 
 module.exports = router;
\ No newline at end of file
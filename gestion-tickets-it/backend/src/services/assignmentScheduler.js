@@ -0,0 +1,206 @@
+const { IndexedHeap } = require('./../utils/heap');
+
+// Ordonnanceur de l'assignation automatique des tickets aux techniciens.
+//
+// Les techniciens disponibles (moins de maxOpenTickets tickets ouverts) sont
+// rangés dans un tas selon la politique choisie ; un nouveau ticket est confié
+// au technicien en tête du tas, dont la clé est ensuite mise à jour. Quand tous
+// les techniciens sont à pleine charge, le ticket attend dans une file ordonnée
+// par priorité puis par ancienneté, vidée dès qu'un ticket est clos. Chaque
+// décision coûte O(log n). Ce module ne dépend pas de la base : il sert à
+// l'assignation en production (services/autoAssignment) et à la simulation
+// (scripts/simulateAssignment.js).
+
+// Niveaux de priorité, du plus faible au plus urgent (comme PRIORITY_LEVELS du frontend)
+const PRIORITY_LEVELS = ['Faible', 'Moyenne', 'Élevée', 'Critique'];
+
+// Statuts d'un ticket encore à traiter
+const OPEN_STATUSES = ['ouvert', 'en cours'];
+
+// Nombre de résolutions fictives de durée defaultResolutionHours ajoutées à
+// l'historique de chaque technicien : un nouveau technicien n'est ni favorisé
+// ni pénalisé par ses premiers tickets
+const PRIOR_RESOLUTIONS = 5;
+
+// Poids d'un ticket dans la charge d'un technicien : 1 (Faible) à 4 (Critique)
+const priorityWeight = (priorite) => {
+  const index = PRIORITY_LEVELS.findIndex((level) => level.toLowerCase() === String(priorite || '').toLowerCase());
+  return index === -1 ? 1 : index + 1;
+};
+
+const isOpen = (row) => Boolean(row) && OPEN_STATUSES.includes(String(row.statut || '').toLowerCase());
+
+// Clé de tri des techniciens disponibles pour chaque politique (la plus petite est servie)
+const POLICIES = {
+  // Temps estimé avant qu'un ticket supplémentaire soit traité : charge pondérée
+  // (+1 pour ce ticket) multipliée par le temps moyen de résolution du technicien
+  equilibre: (technician, averageHours) => (technician.load + 1) * averageHours,
+  // Charge pondérée par la priorité des tickets ouverts, sans tenir compte de l'historique
+  charge: (technician) => technician.load,
+  // Chacun son tour : le technicien servi il y a le plus longtemps
+  tourniquet: (technician) => technician.lastAssigned,
+};
+
+class AssignmentScheduler {
+  constructor({ policy = 'equilibre', maxOpenTickets = 10, defaultResolutionHours = 24 } = {}) {
+    if (!POLICIES[policy]) {
+      throw new Error(`Politique d'assignation inconnue : ${policy} (${Object.keys(POLICIES).join(', ')})`);
+    }
+    this.policy = policy;
+    this.maxOpenTickets = maxOpenTickets;
+    this.defaultResolutionHours = defaultResolutionHours;
+    this.technicians = new Map(); // id -> { id, load, open, totalHours, resolved, lastAssigned, key }
+    this.tickets = new Map(); // id du ticket ouvert assigné -> { technicianId, weight }
+    this.sequence = 0;
+
+    this.available = new IndexedHeap((a, b) => a.key - b.key || a.open - b.open || a.id - b.id);
+    // Tickets en attente : priorité décroissante, puis du plus ancien au plus récent
+    this.pending = new IndexedHeap((a, b) => b.weight - a.weight || a.createdAt - b.createdAt || a.id - b.id);
+  }
+
+  averageHours(technician) {
+    return (technician.totalHours + this.defaultResolutionHours * PRIOR_RESOLUTIONS)
+      / (technician.resolved + PRIOR_RESOLUTIONS);
+  }
+
+  // Recalcule la clé d'un technicien et sa place dans le tas des disponibles
+  refresh(technician) {
+    technician.key = POLICIES[this.policy](technician, this.averageHours(technician));
+    if (technician.open >= this.maxOpenTickets) {
+      this.available.remove(technician.id);
+    } else {
+      this.available.push(technician.id, technician);
+    }
+  }
+
+  addTechnician(id, { totalHours = 0, resolved = 0 } = {}) {
+    const technician = this.technicians.get(id) || { id, load: 0, open: 0, lastAssigned: 0 };
+    Object.assign(technician, { totalHours, resolved });
+    this.technicians.set(id, technician);
+    this.refresh(technician);
+  }
+
+  // Compte dans la charge de son technicien un ticket ouvert déjà assigné
+  // (assignation manuelle ou antérieure) ; sans effet pour un non-technicien
+  track(ticket) {
+    const technician = this.technicians.get(Number(ticket.id_technicien));
+    if (!technician) {
+      return;
+    }
+    this.release(ticket.id);
+    const weight = priorityWeight(ticket.priorite);
+    this.tickets.set(Number(ticket.id), { technicianId: technician.id, weight });
+    technician.load += weight;
+    technician.open += 1;
+    this.refresh(technician);
+  }
+
+  // Retire un ticket de la charge de son technicien ou de la file d'attente
+  release(ticketId) {
+    const id = Number(ticketId);
+    this.pending.remove(id);
+    const entry = this.tickets.get(id);
+    if (!entry) {
+      return;
+    }
+    this.tickets.delete(id);
+    const technician = this.technicians.get(entry.technicianId);
+    if (technician) {
+      technician.load -= entry.weight;
+      technician.open -= 1;
+      this.refresh(technician);
+    }
+  }
+
+  // Ajoute la durée d'une résolution à l'historique d'un technicien
+  recordResolution(technicianId, hours) {
+    const technician = this.technicians.get(Number(technicianId));
+    if (!technician || !(hours >= 0)) {
+      return;
+    }
+    technician.totalHours += hours;
+    technician.resolved += 1;
+    this.refresh(technician);
+  }
+
+  static waitingEntry(ticket) {
+    const createdAt = new Date(ticket.date_creation).getTime();
+    return {
+      id: Number(ticket.id),
+      priorite: ticket.priorite,
+      date_creation: ticket.date_creation,
+      weight: priorityWeight(ticket.priorite),
+      createdAt: Number.isNaN(createdAt) ? 0 : createdAt,
+    };
+  }
+
+  enqueue(ticket) {
+    this.pending.push(Number(ticket.id), AssignmentScheduler.waitingEntry(ticket));
+  }
+
+  // Choisit le technicien d'un nouveau ticket (null : ticket mis en attente). Un
+  // ticket en attente plus urgent ou plus ancien à priorité égale passe avant lui.
+  assign(ticket) {
+    const technician = this.available.peek();
+    const waiting = this.pending.peek();
+    if (!technician || (waiting && waiting.id !== Number(ticket.id)
+      && this.pending.compare(waiting, AssignmentScheduler.waitingEntry(ticket)) < 0)) {
+      this.enqueue(ticket);
+      return null;
+    }
+    this.sequence += 1;
+    technician.lastAssigned = this.sequence;
+    this.track({ ...ticket, id_technicien: technician.id });
+    return technician.id;
+  }
+
+  // Assigne les tickets en attente tant qu'un technicien est disponible
+  drain() {
+    const assignments = [];
+    while (this.pending.size > 0 && this.available.size > 0) {
+      const ticket = this.pending.pop();
+      assignments.push({ ticketId: ticket.id, technicianId: this.assign(ticket) });
+    }
+    return assignments;
+  }
+
+  // Tient l'ordonnanceur à jour après l'écriture d'un ticket (avant / après, null
+  // pour une création ou une suppression). Les tickets ouverts non assignés sont
+  // placés en file d'attente.
+  sync(previous, current) {
+    if (previous) {
+      this.release(previous.id);
+    }
+    if (!current) {
+      return;
+    }
+    const technicianId = current.id_technicien;
+    if (isOpen(current)) {
+      if (technicianId === null || technicianId === undefined) {
+        this.enqueue(current);
+      } else {
+        this.track(current);
+      }
+    } else if (isOpen(previous) && technicianId !== null && technicianId !== undefined) {
+      const hours = (new Date(current.date_mise_a_jour) - new Date(current.date_creation)) / (60 * 60 * 1000);
+      this.recordResolution(technicianId, hours);
+    }
+  }
+
+  snapshot() {
+    return {
+      politique: this.policy,
+      max_tickets_ouverts: this.maxOpenTickets,
+      tickets_en_attente: this.pending.size,
+      techniciens: [...this.technicians.values()].map((technician) => ({
+        id_technicien: technician.id,
+        tickets_ouverts: technician.open,
+        charge: technician.load,
+        temps_moyen_heures: Math.round(this.averageHours(technician) * 100) / 100,
+        disponible: this.available.has(technician.id),
+      })),
+    };
+  }
+}
+
+module.exports = { PRIORITY_LEVELS, OPEN_STATUSES, POLICIES, priorityWeight, isOpen, AssignmentScheduler };
@@ -0,0 +1,158 @@
+const db = require('./../db');
+const { AssignmentScheduler, OPEN_STATUSES, isOpen } = require('./assignmentScheduler');
+
+// Assignation automatique des nouveaux tickets (voir services/assignmentScheduler).
+// L'ordonnanceur est construit depuis la base (techniciens, historique de
+// résolution, tickets ouverts) en arrière-plan au démarrage, puis tenu à jour à
+// chaque écriture de ticket faite via l'API ; il est reconstruit après une
+// modification des techniciens.
+// Les tickets ouverts sans technicien, y compris ceux antérieurs à la mise en
+// service, attendent dans sa file et sont assignés dès qu'un technicien a moins
+// de ASSIGNMENT_MAX_OPEN tickets ouverts.
+
+const ENABLED = process.env.AUTO_ASSIGNMENT !== 'false';
+const OPTIONS = {
+  policy: process.env.ASSIGNMENT_POLICY || 'equilibre',
+  maxOpenTickets: Number(process.env.ASSIGNMENT_MAX_OPEN) || 10,
+  defaultResolutionHours: Number(process.env.ASSIGNMENT_DEFAULT_HOURS) || 24,
+};
+
+let scheduler = null;
+let rebuilding = null;
+// Écritures de tickets reçues pendant une reconstruction ([avant, après])
+let changesDuringRebuild = [];
+// Les techniciens ont changé pendant une reconstruction : elle est à refaire
+let techniciansChanged = false;
+
+const loadFromDatabase = async () => {
+  const [technicians] = await db.execute("SELECT id FROM users WHERE role = 'Technicien'");
+  // Même temps de résolution que les statistiques (services/statsEngine)
+  const [history] = await db.execute(`
+    SELECT
+      id_technicien,
+      SUM(TIMESTAMPDIFF(HOUR, date_creation, date_mise_a_jour)) AS total_heures,
+      COUNT(*) AS nombre
+    FROM tickets
+    WHERE statut = 'résolu' AND id_technicien IS NOT NULL
+    GROUP BY id_technicien
+  `);
+  const placeholders = OPEN_STATUSES.map(() => '?').join(', ');
+  const [open] = await db.execute(
+    `SELECT id, statut, priorite, date_creation, id_technicien FROM tickets WHERE statut IN (${placeholders})`,
+    OPEN_STATUSES
+  );
+
+  const next = new AssignmentScheduler(OPTIONS);
+  const historyById = new Map(history.map((row) => [row.id_technicien, row]));
+  technicians.forEach(({ id }) => {
+    const row = historyById.get(id);
+    next.addTechnician(id, row ? { totalHours: Number(row.total_heures), resolved: Number(row.nombre) } : {});
+  });
+  open.forEach((row) => next.sync(null, row));
+  return next;
+};
+
+// Construit l'ordonnanceur depuis la base. Les écritures de tickets faites
+// pendant la lecture sont rejouées sur le nouvel ordonnanceur : sync est
+// idempotent pour un ticket déjà lu dans son dernier état, seule une résolution
+// peut être comptée deux fois dans l'historique de son technicien.
+const rebuild = async () => {
+  if (rebuilding) {
+    return rebuilding;
+  }
+
+  rebuilding = (async () => {
+    changesDuringRebuild = [];
+    techniciansChanged = false;
+    const next = await loadFromDatabase();
+    changesDuringRebuild.forEach(([previous, current]) => next.sync(previous, current));
+    // Liste des techniciens périmée : l'ordonnanceur reste vide jusqu'à la
+    // reconstruction suivante, les créations d'ici là restent non assignées
+    if (!techniciansChanged) {
+      scheduler = next;
+    }
+  })();
+
+  try {
+    await rebuilding;
+  } finally {
+    rebuilding = null;
+    changesDuringRebuild = [];
+    if (techniciansChanged) {
+      rebuildInBackground();
+    }
+  }
+};
+
+const ensureReady = async () => {
+  if (ENABLED && !scheduler) {
+    await rebuild();
+  }
+};
+
+// Prépare l'ordonnanceur avant une création, hors de toute transaction : sa
+// construction lit la base avec les connexions du pool. Une erreur n'empêche pas
+// la création, le ticket reste alors non assigné.
+const prepareAssignment = async () => {
+  try {
+    await ensureReady();
+  } catch (err) {
+    console.error("Erreur lors de la construction de l'ordonnanceur d'assignation:", err);
+  }
+};
+
+// Technicien choisi pour un nouveau ticket (null : désactivé, ordonnanceur pas
+// encore construit, ticket déjà clos ou en attente). Ne lit jamais la base :
+// appelé dans la transaction de création.
+const assignTicket = (ticket) => {
+  if (!scheduler || !isOpen(ticket)) {
+    return null;
+  }
+  return scheduler.assign(ticket);
+};
+
+// Tient l'ordonnanceur à jour après une écriture (avant / après, null pour une création ou une suppression)
+const recordChange = (previous, current) => {
+  if (rebuilding) {
+    changesDuringRebuild.push([previous, current]);
+  }
+  if (scheduler) {
+    scheduler.sync(previous, current);
+  }
+};
+
+// Annule le choix d'un technicien pour un ticket dont l'écriture a échoué
+const cancel = (ticketId) => {
+  if (scheduler) {
+    scheduler.release(ticketId);
+  }
+};
+
+// Assignations des tickets en attente devenues possibles ([{ ticketId, technicianId }])
+const takeAssignments = () => (scheduler ? scheduler.drain() : []);
+
+// Construit l'ordonnanceur en arrière-plan (démarrage du serveur, techniciens modifiés)
+const rebuildInBackground = () => {
+  if (ENABLED) {
+    rebuild().catch((err) => console.error("Erreur lors de la construction de l'ordonnanceur d'assignation:", err));
+  }
+};
+
+// Les techniciens ont changé (création, rôle, suppression) : reconstruction en arrière-plan
+const invalidate = () => {
+  scheduler = null;
+  if (rebuilding) {
+    techniciansChanged = true;
+  } else {
+    rebuildInBackground();
+  }
+};
+
+const getSnapshot = async () => {
+  await ensureReady();
+  return scheduler ? { active: true, ...scheduler.snapshot() } : { active: false };
+};
+
+module.exports = {
+  ENABLED, rebuild, rebuildInBackground, prepareAssignment, assignTicket, recordChange, cancel, takeAssignments, invalidate, getSnapshot,
+};
@@ -0,0 +1,49 @@
+const { EventEmitter } = require('events');
+
+// Flux des modifications de tickets. Chaque création, modification ou
+// suppression faite via l'API reçoit un numéro de séquence croissant et est
+// diffusée aux abonnés (GET /tickets/changes, en Server-Sent Events). Les
+// derniers événements sont conservés pour qu'un client qui se reconnecte avec
+// Last-Event-ID reçoive ce qu'il a manqué ; s'ils ne sont plus disponibles, le
+// client est invité à recharger ses données.
+
+const HISTORY_SIZE = 1000;
+
+const emitter = new EventEmitter();
+emitter.setMaxListeners(0);
+
+const history = [];
+let seq = 0;
+
+// Publie un événement : type 'created' | 'updated' | 'deleted'
+const publish = (type, id, ticket = null) => {
+  seq += 1;
+  const event = { seq, type, id: Number(id), ticket, at: new Date().toISOString() };
+  history.push(event);
+  if (history.length > HISTORY_SIZE) {
+    history.shift();
+  }
+  emitter.emit('change', event);
+  return event;
+};
+
+// Événements postérieurs à `since`, ou null si une partie n'est plus conservée
+const eventsSince = (since) => {
+  if (since >= seq) {
+    return [];
+  }
+  const oldest = history.length > 0 ? history[0].seq : seq + 1;
+  if (since < oldest - 1) {
+    return null;
+  }
+  return history.filter((event) => event.seq > since);
+};
+
+const subscribe = (listener) => {
+  emitter.on('change', listener);
+  return () => emitter.off('change', listener);
+};
+
+const currentSeq = () => seq;
+
+module.exports = { publish, eventsSince, subscribe, currentSeq };
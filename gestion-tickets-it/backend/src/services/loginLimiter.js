@@ -0,0 +1,48 @@
+// Limitation des tentatives de connexion par compte. Chaque tentative compte
+// comme un échec jusqu'à ce que le mot de passe soit vérifié : une rafale de
+// requêtes simultanées sur un même compte est bloquée avant d'atteindre le
+// hachage (coûteux en CPU), et une connexion réussie remet le compteur à zéro.
+
+const MAX_ATTEMPTS = Number(process.env.LOGIN_MAX_ATTEMPTS) || 5;
+const WINDOW_MS = (Number(process.env.LOGIN_WINDOW_SECONDS) || 15 * 60) * 1000;
+const MAX_TRACKED = 100000;
+
+const attempts = new Map(); // compte -> { count, resetAt }
+
+const normalizeAccount = (email) => String(email).trim().toLowerCase();
+
+const sweep = (now) => {
+  for (const [account, entry] of attempts) {
+    if (entry.resetAt <= now) {
+      attempts.delete(account);
+    }
+  }
+};
+
+// Enregistre une tentative : 0 si elle est autorisée, sinon le délai d'attente en secondes
+const begin = (email) => {
+  const account = normalizeAccount(email);
+  const now = Date.now();
+  if (attempts.size > MAX_TRACKED) {
+    sweep(now);
+  }
+
+  let entry = attempts.get(account);
+  if (!entry || entry.resetAt <= now) {
+    entry = { count: 0, resetAt: now + WINDOW_MS };
+    attempts.set(account, entry);
+  }
+  if (entry.count >= MAX_ATTEMPTS) {
+    return Math.ceil((entry.resetAt - now) / 1000);
+  }
+  entry.count += 1;
+  return 0;
+};
+
+const succeed = (email) => {
+  attempts.delete(normalizeAccount(email));
+};
+
+const getCounters = () => ({ tracked_accounts: attempts.size, max_attempts: MAX_ATTEMPTS, window_seconds: WINDOW_MS / 1000 });
+
+module.exports = { begin, succeed, getCounters };
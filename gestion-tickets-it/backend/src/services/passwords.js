@@ -0,0 +1,67 @@
+const crypto = require('crypto');
+const { promisify } = require('util');
+
+// Hachage des mots de passe avec scrypt. crypto.scrypt s'exécute dans le pool de
+// threads de libuv : le calcul, volontairement coûteux (~50 ms), ne bloque pas la
+// boucle d'événements et les autres requêtes continuent d'être servies pendant
+// une connexion. La taille du pool (4 par défaut) est réglée au démarrage du
+// serveur via UV_THREADPOOL_SIZE.
+//
+// Format stocké : scrypt$N$r$p$sel$empreinte (sel et empreinte en base64).
+// Les mots de passe enregistrés en clair avant le hachage restent acceptés et
+// sont signalés pour être hachés à la prochaine connexion réussie.
+
+const scrypt = promisify(crypto.scrypt);
+
+const PARAMS = {
+  N: Number(process.env.PASSWORD_SCRYPT_COST) || 16384,
+  r: 8,
+  p: 1,
+};
+const KEY_LENGTH = 64;
+const SALT_LENGTH = 16;
+const PREFIX = 'scrypt';
+
+const derive = (password, salt, { N, r, p }) =>
+  scrypt(String(password), salt, KEY_LENGTH, { N, r, p, maxmem: 256 * N * r });
+
+const hashPassword = async (password) => {
+  const salt = crypto.randomBytes(SALT_LENGTH);
+  const key = await derive(password, salt, PARAMS);
+  return [PREFIX, PARAMS.N, PARAMS.r, PARAMS.p, salt.toString('base64'), key.toString('base64')].join('$');
+};
+
+const isHashed = (stored) => typeof stored === 'string' && stored.startsWith(`${PREFIX}$`);
+
+// Empreinte de référence pour les comptes inexistants : la réponse prend le même
+// temps qu'un mot de passe erroné et ne révèle pas si l'email existe
+let dummyHash = null;
+const getDummyHash = () => {
+  dummyHash = dummyHash || hashPassword(crypto.randomBytes(16).toString('hex'));
+  return dummyHash;
+};
+
+// Vérifie un mot de passe : { valid, needsRehash }
+const verifyPassword = async (password, stored) => {
+  if (stored === null || stored === undefined) {
+    await verifyPassword(password, await getDummyHash());
+    return { valid: false, needsRehash: false };
+  }
+
+  if (!isHashed(stored)) {
+    const given = crypto.createHash('sha256').update(String(password)).digest();
+    const expected = crypto.createHash('sha256').update(String(stored)).digest();
+    const valid = crypto.timingSafeEqual(given, expected);
+    return { valid, needsRehash: valid };
+  }
+
+  const [, N, r, p, salt, key] = stored.split('$');
+  const params = { N: Number(N), r: Number(r), p: Number(p) };
+  const expected = Buffer.from(key, 'base64');
+  const derived = await derive(password, Buffer.from(salt, 'base64'), params);
+  const valid = derived.length === expected.length && crypto.timingSafeEqual(derived, expected);
+  const outdated = params.N !== PARAMS.N || params.r !== PARAMS.r || params.p !== PARAMS.p;
+  return { valid, needsRehash: valid && outdated };
+};
+
+module.exports = { hashPassword, verifyPassword, isHashed };
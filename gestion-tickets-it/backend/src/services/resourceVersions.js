@@ -0,0 +1,53 @@
+const crypto = require('crypto');
+
+// Versions des ressources servies par l'API, utilisées comme validateurs HTTP
+// (ETag / Last-Modified). Chaque collection (tickets, users) a un compteur global
+// incrémenté à chaque écriture faite via l'API, et chaque enregistrement modifié
+// depuis le démarrage a son propre compteur : modifier un ticket n'invalide pas
+// les autres fiches ticket. L'identifiant de démarrage garantit qu'un validateur
+// émis avant un redémarrage du serveur n'est jamais considéré comme valide.
+
+const BOOT_ID = crypto.randomBytes(4).toString('hex');
+const BOOT_TIME = Date.now();
+
+const collections = new Map(); // nom -> { version, modifiedAt, records: Map(id -> { version, modifiedAt }) }
+
+const getCollection = (name) => {
+  if (!collections.has(name)) {
+    collections.set(name, { version: 0, modifiedAt: BOOT_TIME, records: new Map() });
+  }
+  return collections.get(name);
+};
+
+// Enregistre la modification d'une collection et, si fournis, de certains enregistrements
+const bump = (name, ids = []) => {
+  const collection = getCollection(name);
+  const now = Date.now();
+  collection.version += 1;
+  collection.modifiedAt = now;
+  ids.forEach((id) => {
+    const key = String(id);
+    const record = collection.records.get(key) || { version: 0 };
+    collection.records.set(key, { version: record.version + 1, modifiedAt: now });
+  });
+};
+
+// Validateurs d'une ressource dont la version est tenue ailleurs (statistiques)
+const validatorsFor = (name, version, modifiedAt = BOOT_TIME) => ({
+  etag: `W/"${BOOT_ID}-${name}-${version}"`,
+  lastModified: modifiedAt,
+});
+
+// Validateurs de la collection entière (listes, exports)
+const collectionValidators = (name) => {
+  const collection = getCollection(name);
+  return validatorsFor(name, collection.version, collection.modifiedAt);
+};
+
+// Validateurs d'un enregistrement
+const recordValidators = (name, id) => {
+  const record = getCollection(name).records.get(String(id)) || { version: 0, modifiedAt: BOOT_TIME };
+  return validatorsFor(`${name}-${id}`, record.version, record.modifiedAt);
+};
+
+module.exports = { BOOT_ID, bump, validatorsFor, collectionValidators, recordValidators };
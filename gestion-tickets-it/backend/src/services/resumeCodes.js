@@ -0,0 +1,55 @@
+const crypto = require('crypto');
+
+// Codes de reprise de session. L'URL de la page du frontend ne porte jamais le
+// jeton de session : seulement un code aléatoire, à usage unique et de courte
+// durée, échangé contre le jeton après un rechargement de la page. Un code lu
+// dans l'historique du navigateur, un en-tête Referer ou un journal de proxy a
+// déjà servi ou expire rapidement. Les codes sont gardés en mémoire : un
+// redémarrage du serveur oblige à se reconnecter après un rechargement.
+
+const TTL_MS = (Number(process.env.RESUME_CODE_TTL_SECONDS) || 10 * 60) * 1000;
+const MAX_CODES = 100000;
+
+const codes = new Map(); // code -> { token, expiresAt }
+
+const sweep = (now) => {
+  for (const [code, entry] of codes) {
+    if (entry.expiresAt <= now) {
+      codes.delete(code);
+    }
+  }
+};
+
+// Émet un code pour un jeton de session, en révoquant le code précédent de la page : { code, expiresAt }
+const issue = (token, previous = null) => {
+  const now = Date.now();
+  if (codes.size > MAX_CODES) {
+    sweep(now);
+  }
+  const entry = previous ? codes.get(previous) : null;
+  if (entry && entry.token === token) {
+    codes.delete(previous);
+  }
+
+  const code = crypto.randomBytes(24).toString('base64url');
+  const expiresAt = now + TTL_MS;
+  codes.set(code, { token, expiresAt });
+  return { code, expiresAt: new Date(expiresAt).toISOString() };
+};
+
+// Jeton associé à un code valide, qui ne peut plus resservir ; sinon null
+const consume = (code) => {
+  const entry = typeof code === 'string' ? codes.get(code) : null;
+  if (!entry) {
+    return null;
+  }
+  codes.delete(code);
+  return entry.expiresAt > Date.now() ? entry.token : null;
+};
+
+// Révoque un code (déconnexion)
+const revoke = (code) => {
+  codes.delete(code);
+};
+
+module.exports = { issue, consume, revoke, TTL_MS };
@@ -0,0 +1,201 @@
+const db = require('./../db');
+
+// Statistiques matérialisées des tickets : compteurs par statut et par priorité,
+// et cumul des temps de résolution par technicien. Elles sont reconstruites une
+// fois depuis la base puis tenues à jour à chaque création, modification et
+// suppression de ticket faite via l'API.
+
+// Statut (en minuscules) -> clé renvoyée dans stats_par_statut
+const STATUS_KEYS = {
+  'ouvert': 'total_ouverts',
+  'en cours': 'total_en_cours',
+  'résolu': 'total_resolus',
+  'fermé': 'total_fermes',
+};
+
+const HOUR_MS = 60 * 60 * 1000;
+
+const state = {
+  byStatus: new Map(),
+  byPriority: new Map(),
+  resolution: new Map(), // id_technicien -> { totalHours, count }
+  ready: false,
+  version: 0,
+  rebuiltAt: null,
+  modifiedAt: Date.now(),
+};
+
+let snapshotCache = null;
+let rebuilding = null;
+// Deltas [ligne retirée, ligne ajoutée] reçus pendant une reconstruction,
+// rejoués sur les agrégats chargés depuis la base
+let changesDuringRebuild = [];
+
+const normalize = (value) => (value === null || value === undefined ? null : String(value).toLowerCase());
+
+// Durée de résolution en heures entières, comme TIMESTAMPDIFF(HOUR, ...)
+const resolutionHours = (row) => {
+  const created = new Date(row.date_creation).getTime();
+  const updated = new Date(row.date_mise_a_jour).getTime();
+  if (Number.isNaN(created) || Number.isNaN(updated)) {
+    return null;
+  }
+  return Math.trunc((updated - created) / HOUR_MS);
+};
+
+const increment = (map, key, delta) => {
+  const value = (map.get(key) || 0) + delta;
+  if (value === 0) {
+    map.delete(key);
+  } else {
+    map.set(key, value);
+  }
+};
+
+// Ajoute (sign = 1) ou retire (sign = -1) la contribution d'un ticket aux agrégats
+const applyRow = (row, sign, aggregates = state) => {
+  if (!row) {
+    return;
+  }
+  const statut = normalize(row.statut);
+  increment(aggregates.byStatus, statut, sign);
+  increment(aggregates.byPriority, row.priorite, sign);
+
+  if (statut === 'résolu' && row.id_technicien !== null && row.id_technicien !== undefined) {
+    const hours = resolutionHours(row);
+    if (hours === null) {
+      return;
+    }
+    const entry = aggregates.resolution.get(row.id_technicien) || { totalHours: 0, count: 0 };
+    entry.totalHours += sign * hours;
+    entry.count += sign;
+    if (entry.count === 0) {
+      aggregates.resolution.delete(row.id_technicien);
+    } else {
+      aggregates.resolution.set(row.id_technicien, entry);
+    }
+  }
+};
+
+// Applique un delta aux agrégats courants. Pendant une reconstruction, il est
+// aussi mis de côté pour être rejoué sur les agrégats rechargés ; avant la
+// première reconstruction il est ignoré (la base le contient déjà)
+const recordChange = (oldRow, newRow) => {
+  if (rebuilding) {
+    changesDuringRebuild.push([oldRow, newRow]);
+  }
+  if (!state.ready) {
+    return;
+  }
+  applyRow(oldRow, -1);
+  applyRow(newRow, 1);
+  state.version += 1;
+  state.modifiedAt = Date.now();
+  snapshotCache = null;
+};
+
+const recordInsert = (row) => recordChange(null, row);
+
+const recordUpdate = (oldRow, newRow) => recordChange(oldRow, newRow);
+
+const recordDelete = (row) => recordChange(row, null);
+
+const loadFromDatabase = async () => {
+  const [statusRows] = await db.execute('SELECT statut, priorite, COUNT(*) AS nombre FROM tickets GROUP BY statut, priorite');
+  const [timeRows] = await db.execute(`
+    SELECT
+      id_technicien,
+      SUM(TIMESTAMPDIFF(HOUR, date_creation, date_mise_a_jour)) AS total_heures,
+      COUNT(*) AS nombre
+    FROM tickets
+    WHERE statut = 'résolu' AND id_technicien IS NOT NULL
+    GROUP BY id_technicien
+  `);
+
+  const aggregates = { byStatus: new Map(), byPriority: new Map(), resolution: new Map() };
+  statusRows.forEach((row) => {
+    increment(aggregates.byStatus, normalize(row.statut), Number(row.nombre));
+    increment(aggregates.byPriority, row.priorite, Number(row.nombre));
+  });
+  timeRows.forEach((row) => {
+    aggregates.resolution.set(row.id_technicien, { totalHours: Number(row.total_heures), count: Number(row.nombre) });
+  });
+  return aggregates;
+};
+
+// Recalcule toutes les statistiques depuis la base (parcours complet unique)
+const rebuild = async () => {
+  if (rebuilding) {
+    return rebuilding;
+  }
+
+  rebuilding = (async () => {
+    changesDuringRebuild = [];
+    const next = await loadFromDatabase();
+    // Une écriture validée pendant le chargement peut déjà figurer dans les
+    // lectures : les agrégats restent approchés jusqu'à la reconstruction suivante
+    changesDuringRebuild.forEach(([oldRow, newRow]) => {
+      applyRow(oldRow, -1, next);
+      applyRow(newRow, 1, next);
+    });
+    state.byStatus = next.byStatus;
+    state.byPriority = next.byPriority;
+    state.resolution = next.resolution;
+
+    state.ready = true;
+    state.rebuiltAt = new Date();
+    state.version += 1;
+    state.modifiedAt = state.rebuiltAt.getTime();
+    snapshotCache = null;
+  })();
+
+  try {
+    await rebuilding;
+  } finally {
+    rebuilding = null;
+    changesDuringRebuild = [];
+  }
+};
+
+const buildSnapshot = () => {
+  const stats_par_statut = {};
+  Object.entries(STATUS_KEYS).forEach(([statut, key]) => {
+    stats_par_statut[key] = state.byStatus.get(statut) || 0;
+  });
+
+  const temps_moyen_par_technicien = [...state.resolution.entries()].map(([id_technicien, entry]) => ({
+    id_technicien,
+    temps_moyen_heures: Math.round((entry.totalHours / entry.count) * 100) / 100,
+  }));
+
+  const tickets_par_priorite = [...state.byPriority.entries()].map(([priorite, nombre]) => ({
+    'priorité': priorite,
+    nombre,
+  }));
+
+  return {
+    stats_par_statut,
+    temps_moyen_par_technicien,
+    tickets_par_priorite,
+    version: state.version,
+    rebuilt_at: state.rebuiltAt,
+  };
+};
+
+// Renvoie les statistiques matérialisées (reconstruites au premier appel)
+const getSnapshot = async () => {
+  if (!state.ready) {
+    await rebuild();
+  }
+  if (!snapshotCache) {
+    snapshotCache = buildSnapshot();
+  }
+  return snapshotCache;
+};
+
+const getVersion = () => state.version;
+
+// Version et date de dernière modification des statistiques (null avant la première reconstruction)
+const getValidatorState = () => (state.ready ? { version: state.version, modifiedAt: state.modifiedAt } : null);
+
+module.exports = { rebuild, getSnapshot, getVersion, getValidatorState, recordInsert, recordUpdate, recordDelete };
@@ -0,0 +1,78 @@
+// Journal des événements des tickets (table ticket_events) : création,
+// changements de statut et d'assignation, commentaires, suppression. Le journal
+// est en ajout seul : une ligne n'est jamais modifiée ni supprimée (même avec
+// son ticket), et les événements d'une écriture sont
+// insérés dans la même transaction que la modification du ticket. La durée
+// passée dans chaque statut se déduit des événements d'un seul ticket, lus par
+// l'index (ticket_id, date_evenement).
+
+const EVENT_TYPES = {
+  CREATION: 'creation',
+  STATUS: 'statut',
+  ASSIGNMENT: 'assignation',
+  COMMENT: 'commentaire',
+  DELETION: 'suppression',
+};
+
+// Colonnes d'un ticket suivies par le journal -> type d'événement
+const TRACKED_FIELDS = {
+  statut: EVENT_TYPES.STATUS,
+  id_technicien: EVENT_TYPES.ASSIGNMENT,
+};
+
+const toValue = (value) => (value === null || value === undefined ? null : String(value));
+
+// Événements d'une modification, à partir du ticket avant et après l'écriture
+const diffTicket = (previous, current) => {
+  if (!previous || !current) {
+    return [];
+  }
+  return Object.entries(TRACKED_FIELDS)
+    .filter(([field]) => toValue(previous[field]) !== toValue(current[field]))
+    .map(([field, type]) => ({
+      ticketId: current.id,
+      type,
+      ancienneValeur: toValue(previous[field]),
+      nouvelleValeur: toValue(current[field]),
+    }));
+};
+
+// Événement de création d'un ticket (statut initial et éventuelle assignation)
+const creationEvents = (ticket) => {
+  const events = [{ ticketId: ticket.id, type: EVENT_TYPES.CREATION, ancienneValeur: null, nouvelleValeur: toValue(ticket.statut) }];
+  if (ticket.id_technicien !== null && ticket.id_technicien !== undefined) {
+    events.push({ ticketId: ticket.id, type: EVENT_TYPES.ASSIGNMENT, ancienneValeur: null, nouvelleValeur: toValue(ticket.id_technicien) });
+  }
+  return events;
+};
+
+// Événements de suppression de tickets (statut au moment de la suppression)
+const deletionEvents = (tickets) => tickets.map((ticket) => ({
+  ticketId: ticket.id,
+  type: EVENT_TYPES.DELETION,
+  ancienneValeur: toValue(ticket.statut),
+  nouvelleValeur: null,
+}));
+
+// Insère des événements en une requête. `executor` est le pool ou la connexion
+// de la transaction en cours ; authorId est l'utilisateur à l'origine de l'écriture.
+const record = async (executor, events, authorId = null) => {
+  if (events.length === 0) {
+    return;
+  }
+  const placeholders = events.map(() => '(?, ?, ?, ?, ?, ?)').join(', ');
+  const values = events.flatMap((event) => [
+    event.ticketId,
+    event.type,
+    event.ancienneValeur ?? null,
+    event.nouvelleValeur ?? null,
+    event.commentaire ?? null,
+    authorId,
+  ]);
+  await executor.execute(
+    `INSERT INTO ticket_events (ticket_id, type, ancienne_valeur, nouvelle_valeur, commentaire, id_auteur) VALUES ${placeholders}`,
+    values
+  );
+};
+
+module.exports = { EVENT_TYPES, diffTicket, creationEvents, deletionEvents, record };
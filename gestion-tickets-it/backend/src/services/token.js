@@ -0,0 +1,51 @@
+const crypto = require('crypto');
+
+// Jetons de session signés (HMAC-SHA256) : base64url(données).base64url(signature).
+// Ils sont vérifiés sans accès à la base. AUTH_TOKEN_SECRET est obligatoire en
+// production ; en développement, une clé aléatoire est tirée au démarrage à
+// défaut : les sessions ne survivent pas à un redémarrage et ne sont pas
+// partagées entre plusieurs instances.
+
+const TTL_SECONDS = Number(process.env.AUTH_TOKEN_TTL) || 8 * 60 * 60;
+
+let secret = process.env.AUTH_TOKEN_SECRET;
+if (!secret && process.env.NODE_ENV === 'production') {
+  throw new Error('AUTH_TOKEN_SECRET doit être défini en production (clé de signature des jetons de session)');
+}
+if (!secret) {
+  console.warn('AUTH_TOKEN_SECRET non défini : clé de signature des jetons aléatoire');
+  secret = crypto.randomBytes(32);
+}
+
+const signature = (payload) => crypto.createHmac('sha256', secret).update(payload).digest('base64url');
+
+// Émet un jeton pour les informations fournies (sub, role...) : { token, expiresAt }
+const sign = (claims, ttlSeconds = TTL_SECONDS) => {
+  const exp = Math.floor(Date.now() / 1000) + ttlSeconds;
+  const payload = Buffer.from(JSON.stringify({ ...claims, exp })).toString('base64url');
+  return { token: `${payload}.${signature(payload)}`, expiresAt: new Date(exp * 1000).toISOString() };
+};
+
+// Informations d'un jeton valide et non expiré, sinon null
+const verify = (token) => {
+  if (typeof token !== 'string') {
+    return null;
+  }
+  const [payload, given] = token.split('.');
+  if (!payload || !given) {
+    return null;
+  }
+  const expected = Buffer.from(signature(payload));
+  const received = Buffer.from(given);
+  if (expected.length !== received.length || !crypto.timingSafeEqual(expected, received)) {
+    return null;
+  }
+  try {
+    const claims = JSON.parse(Buffer.from(payload, 'base64url').toString());
+    return claims.exp > Date.now() / 1000 ? claims : null;
+  } catch (err) {
+    return null;
+  }
+};
+
+module.exports = { sign, verify, TTL_SECONDS };
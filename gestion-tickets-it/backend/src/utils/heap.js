@@ -0,0 +1,119 @@
+// Tas binaire indexé : chaque élément est identifié par une clé, ce qui permet de
+// le repositionner (update) ou de le retirer (remove) après un changement de sa
+// priorité. Toutes les opérations sont en O(log n), peek en O(1).
+
+class IndexedHeap {
+  // compare(a, b) < 0 si a doit sortir avant b
+  constructor(compare) {
+    this.compare = compare;
+    this.items = [];
+    this.positions = new Map(); // clé -> indice dans items
+  }
+
+  get size() {
+    return this.items.length;
+  }
+
+  has(key) {
+    return this.positions.has(key);
+  }
+
+  peek() {
+    return this.items.length > 0 ? this.items[0].value : null;
+  }
+
+  // Ajoute un élément, ou le remplace et le repositionne si la clé existe déjà
+  push(key, value) {
+    if (this.positions.has(key)) {
+      this.items[this.positions.get(key)].value = value;
+      this.update(key);
+      return;
+    }
+    this.items.push({ key, value });
+    this.positions.set(key, this.items.length - 1);
+    this.siftUp(this.items.length - 1);
+  }
+
+  pop() {
+    if (this.items.length === 0) {
+      return null;
+    }
+    const top = this.items[0];
+    this.removeAt(0);
+    return top.value;
+  }
+
+  // Repositionne un élément dont la priorité a changé
+  update(key) {
+    const index = this.positions.get(key);
+    if (index === undefined) {
+      return;
+    }
+    this.siftDown(this.siftUp(index));
+  }
+
+  remove(key) {
+    const index = this.positions.get(key);
+    if (index === undefined) {
+      return null;
+    }
+    const { value } = this.items[index];
+    this.removeAt(index);
+    return value;
+  }
+
+  values() {
+    return this.items.map((item) => item.value);
+  }
+
+  removeAt(index) {
+    const last = this.items.pop();
+    this.positions.delete(this.items.length === index ? last.key : this.items[index].key);
+    if (index < this.items.length) {
+      this.items[index] = last;
+      this.positions.set(last.key, index);
+      this.siftDown(this.siftUp(index));
+    }
+  }
+
+  swap(i, j) {
+    [this.items[i], this.items[j]] = [this.items[j], this.items[i]];
+    this.positions.set(this.items[i].key, i);
+    this.positions.set(this.items[j].key, j);
+  }
+
+  siftUp(index) {
+    let current = index;
+    while (current > 0) {
+      const parent = (current - 1) >> 1;
+      if (this.compare(this.items[current].value, this.items[parent].value) >= 0) {
+        break;
+      }
+      this.swap(current, parent);
+      current = parent;
+    }
+    return current;
+  }
+
+  siftDown(index) {
+    let current = index;
+    for (;;) {
+      const left = 2 * current + 1;
+      const right = left + 1;
+      let smallest = current;
+      if (left < this.items.length && this.compare(this.items[left].value, this.items[smallest].value) < 0) {
+        smallest = left;
+      }
+      if (right < this.items.length && this.compare(this.items[right].value, this.items[smallest].value) < 0) {
+        smallest = right;
+      }
+      if (smallest === current) {
+        return current;
+      }
+      this.swap(current, smallest);
+      current = smallest;
+    }
+  }
+}
+
+module.exports = { IndexedHeap };
@@ -0,0 +1,51 @@
+const db = require('./../db');
+
+// Envoie le résultat d'une requête SQL en NDJSON (une ligne JSON par
+// enregistrement), ligne par ligne depuis MySQL et en respectant la
+// contre-pression du client : ni le serveur ni le client n'ont besoin de
+// matérialiser la liste complète.
+
+const FLUSH_EVERY = 1000;
+
+// message : message de la réponse 500 si la requête échoue avant la première ligne
+const streamNdjson = (res, sql, values = [], message = 'Erreur lors de la lecture des données') => {
+  res.status(200);
+  res.setHeader('Content-Type', 'application/x-ndjson; charset=utf-8');
+
+  const rows = db.pool.query(sql, values).stream({ highWaterMark: 500 });
+  let count = 0;
+
+  rows.on('data', (row) => {
+    count += 1;
+    const ready = res.write(`${JSON.stringify(row)}\n`);
+    if (count % FLUSH_EVERY === 0 && res.flush) {
+      res.flush();
+    }
+    if (!ready) {
+      rows.pause();
+      res.once('drain', () => rows.resume());
+    }
+  });
+
+  rows.on('end', () => res.end());
+
+  rows.on('error', (err) => {
+    console.error('Erreur pendant le streaming NDJSON:', err);
+    // Aucune ligne écrite (la compression peut retarder l'envoi des en-têtes) : erreur JSON habituelle
+    if (count === 0 && !res.headersSent) {
+      res.removeHeader('Content-Type');
+      return res.status(500).json({ message, error: err });
+    }
+    // Les en-têtes sont déjà envoyés : couper la connexion signale au client une réponse incomplète
+    res.destroy(err);
+  });
+
+  // Arrêter la lecture si le client se déconnecte
+  res.on('close', () => {
+    if (!res.writableFinished) {
+      rows.destroy();
+    }
+  });
+};
+
+module.exports = { streamNdjson };
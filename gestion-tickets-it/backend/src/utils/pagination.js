@@ -0,0 +1,56 @@
+// Pagination par clé (keyset) : le curseur encode la dernière valeur du champ
+// de tri et l'id de la dernière ligne renvoyée, ce qui évite les OFFSET coûteux.
+
+const DEFAULT_LIMIT = 50;
+const MAX_LIMIT = 500;
+
+const encodeCursor = (row, sortField) => {
+  const value = row[sortField] instanceof Date ? row[sortField].toISOString() : row[sortField];
+  return Buffer.from(JSON.stringify({ v: value, id: row.id })).toString('base64url');
+};
+
+const decodeCursor = (cursor, sortField) => {
+  try {
+    const { v, id } = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (id === undefined || v === undefined) {
+      return null;
+    }
+    // Les dates sont renvoyées sous forme d'objet Date pour que mysql2 les
+    // reconvertisse dans le même fuseau que celui utilisé à la lecture
+    const value = sortField.startsWith('date_') ? new Date(v) : v;
+    return { value, id };
+  } catch (err) {
+    return null;
+  }
+};
+
+const parseLimit = (limit) => {
+  const parsed = parseInt(limit, 10);
+  if (Number.isNaN(parsed) || parsed <= 0) {
+    return DEFAULT_LIMIT;
+  }
+  return Math.min(parsed, MAX_LIMIT);
+};
+
+// Construit la clause keyset et le ORDER BY pour un tri (champ, id)
+const keysetClause = (sortField, order, cursor) => {
+  const direction = order === 'asc' ? 'ASC' : 'DESC';
+  const comparator = order === 'asc' ? '>' : '<';
+  const orderBy = `ORDER BY ${sortField} ${direction}, id ${direction}`;
+
+  if (!cursor) {
+    return { condition: null, values: [], orderBy };
+  }
+
+  if (sortField === 'id') {
+    return { condition: `id ${comparator} ?`, values: [cursor.id], orderBy };
+  }
+
+  return {
+    condition: `(${sortField} ${comparator} ? OR (${sortField} = ? AND id ${comparator} ?))`,
+    values: [cursor.value, cursor.value, cursor.id],
+    orderBy,
+  };
+};
+
+module.exports = { DEFAULT_LIMIT, MAX_LIMIT, encodeCursor, decodeCursor, parseLimit, keysetClause };
@@ -0,0 +1,26 @@
+// Projection de champs (?fields=a,b,c) : seules les colonnes demandées et
+// autorisées sont sélectionnées, ce qui allège les réponses des listes.
+
+// Retourne { columns } ou { error } ; columns vaut null si aucun champ n'est demandé
+const parseFields = (fieldsParam, allowed, required = []) => {
+  if (fieldsParam === undefined || fieldsParam === '') {
+    return { columns: null };
+  }
+
+  const requested = String(fieldsParam)
+    .split(',')
+    .map((field) => field.trim())
+    .filter(Boolean);
+
+  const invalid = requested.filter((field) => !allowed.includes(field));
+  if (requested.length === 0 || invalid.length > 0) {
+    return { error: `Champs invalides: ${invalid.join(', ')} (autorisés: ${allowed.join(', ')})` };
+  }
+
+  // Les champs requis (id, clé de tri...) sont toujours renvoyés
+  return { columns: [...new Set([...required, ...requested])] };
+};
+
+const selectList = (columns) => (columns ? columns.join(', ') : '*');
+
+module.exports = { parseFields, selectList };
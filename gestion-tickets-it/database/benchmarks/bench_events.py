@@ -0,0 +1,148 @@
+"""
+Benchmark de l'historique des tickets (table ticket_events) : lecture de
+l'historique d'un ticket, première page et page suivante, sans index puis avec
+l'index déclaré dans `init-scripts/init.sql`, comparée au calcul de la durée par
+statut sur l'ensemble de la table.
+
+Le journal est recréé dans SQLite (substitut local de MySQL) et rempli
+d'événements synthétiques : création, prise en charge, changements de statut et
+commentaires, dans l'ordre chronologique de chaque ticket.
+
+Usage :
+    python database/benchmarks/bench_events.py [--tickets 200000] [--db bench.sqlite] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+INIT_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "init-scripts", "init.sql")
+
+TECHNICIANS = 50
+PAGE = 101  # taille de page + 1, comme le backend
+
+SCHEMA = """
+CREATE TABLE ticket_events (
+  id INTEGER PRIMARY KEY,
+  ticket_id INTEGER NOT NULL,
+  type TEXT NOT NULL,
+  ancienne_valeur TEXT,
+  nouvelle_valeur TEXT,
+  commentaire TEXT,
+  id_auteur INTEGER,
+  date_evenement TEXT NOT NULL
+)
+"""
+
+ORDER = "ORDER BY date_evenement ASC, id ASC"
+
+# Requêtes émises par GET /tickets/:id/events (dialecte SQLite)
+QUERIES = [
+    ("Historique d'un ticket", f"SELECT * FROM ticket_events WHERE ticket_id = ? {ORDER} LIMIT {PAGE}", (4242,)),
+    ("Historique, page suivante",
+     f"SELECT * FROM ticket_events WHERE ticket_id = ? AND (date_evenement > ? OR (date_evenement = ? AND id > ?)) "
+     f"{ORDER} LIMIT {PAGE}",
+     (4242, "2024-01-01 00:00:00.000", "2024-01-01 00:00:00.000", 0)),
+    ("Changements de statut (tous les tickets)",
+     f"SELECT ticket_id, nouvelle_valeur, date_evenement FROM ticket_events "
+     f"WHERE type IN ('creation', 'statut') ORDER BY ticket_id, date_evenement, id", ()),
+]
+
+
+def index_statements() -> list:
+    """Extrait les CREATE INDEX portant sur la table ticket_events depuis init.sql."""
+    with open(INIT_SQL, encoding="utf-8") as handle:
+        sql = handle.read()
+    return re.findall(r"CREATE INDEX \w+ ON ticket_events \([^)]*\)", sql)
+
+
+def seed(conn: sqlite3.Connection, count: int, seed_value: int) -> int:
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+
+    def timestamp(moment: datetime) -> str:
+        return moment.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+    # Les événements arrivent dans l'ordre d'écriture : ceux des différents
+    # tickets sont entrelacés dans la table, comme en production
+    events = []
+    for ticket_id in range(1, count + 1):
+        moment = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        technician = rng.randrange(1, TECHNICIANS + 1)
+        events.append((ticket_id, "creation", None, "ouvert", None, None, moment))
+        moment += timedelta(hours=rng.expovariate(1 / 4))
+        events.append((ticket_id, "assignation", None, str(technician), None, technician, moment))
+        events.append((ticket_id, "statut", "ouvert", "en cours", None, technician, moment))
+        for _ in range(rng.randrange(0, 4)):
+            moment += timedelta(hours=rng.expovariate(1 / 8))
+            events.append((ticket_id, "commentaire", None, None, "Suivi de l'intervention", technician, moment))
+        moment += timedelta(hours=rng.expovariate(1 / 24))
+        events.append((ticket_id, "statut", "en cours", "résolu", None, technician, moment))
+    events.sort(key=lambda event: event[-1])
+
+    conn.execute(SCHEMA)
+    conn.executemany(
+        "INSERT INTO ticket_events (ticket_id, type, ancienne_valeur, nouvelle_valeur, commentaire, id_auteur, date_evenement) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (event[:-1] + (timestamp(event[-1]),) for event in events),
+    )
+    conn.commit()
+    return len(events)
+
+
+def measure(conn: sqlite3.Connection, repeat: int) -> dict:
+    results = {}
+    for label, sql, params in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        plan = " | ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        results[label] = (statistics.median(timings), plan)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=200_000)
+    parser.add_argument("--db", default=":memory:", help="Fichier SQLite (mémoire par défaut)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--plans", action="store_true", help="Afficher les plans d'exécution")
+    args = parser.parse_args()
+
+    if args.db != ":memory:" and os.path.exists(args.db):
+        os.remove(args.db)
+    conn = sqlite3.connect(args.db)
+
+    started = time.perf_counter()
+    events = seed(conn, args.tickets, args.seed)
+    print(f"{events} événements ({args.tickets} tickets) insérés en {time.perf_counter() - started:.1f} s")
+
+    before = measure(conn, args.repeat)
+
+    started = time.perf_counter()
+    for statement in index_statements():
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+    print(f"Index créés en {time.perf_counter() - started:.1f} s\n")
+
+    after = measure(conn, args.repeat)
+
+    print(f"{'requête':<42} {'sans index (ms)':>16} {'avec index (ms)':>16} {'gain':>8}")
+    for label, _, _ in QUERIES:
+        without, plan_before = before[label]
+        with_index, plan_after = after[label]
+        gain = without / with_index if with_index else float("inf")
+        print(f"{label:<42} {without:>16.2f} {with_index:>16.2f} {gain:>7.0f}x")
+        if args.plans:
+            print(f"    avant : {plan_before}\n    après : {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
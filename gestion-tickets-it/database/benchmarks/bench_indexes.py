@@ -0,0 +1,155 @@
+"""
+Benchmark des requêtes de l'application avant et après création des index.
+
+Le schéma des tickets est recréé dans SQLite (base locale servant de substitut à
+MySQL), rempli de tickets synthétiques, puis chaque requête déclenchée par le
+frontend est chronométrée sans index, puis avec les index déclarés dans
+`init-scripts/init.sql`.
+
+Usage :
+    python database/benchmarks/bench_indexes.py [--tickets 1000000] [--db bench.sqlite] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+INIT_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "init-scripts", "init.sql")
+
+STATUSES = ["ouvert", "en cours", "résolu", "fermé"]
+PRIORITIES = ["Faible", "Moyenne", "Élevée", "Critique"]
+EMPLOYEES = 5000
+TECHNICIANS = 50
+PAGE = 51  # taille de page + 1, comme le backend
+
+SCHEMA = """
+CREATE TABLE tickets (
+  id INTEGER PRIMARY KEY,
+  titre TEXT NOT NULL,
+  description TEXT NOT NULL,
+  statut TEXT NOT NULL,
+  priorite TEXT NOT NULL,
+  date_creation TEXT NOT NULL,
+  date_mise_a_jour TEXT NOT NULL,
+  id_employe INTEGER,
+  id_technicien INTEGER
+)
+"""
+
+ORDER = "ORDER BY date_creation DESC, id DESC"
+
+# Requêtes émises par le backend pour chaque page du frontend (dialecte SQLite)
+QUERIES = [
+    ("Mes tickets (employé)", f"SELECT * FROM tickets WHERE id_employe = ? {ORDER} LIMIT {PAGE}", (42,)),
+    ("Mes tickets, page suivante",
+     f"SELECT * FROM tickets WHERE id_employe = ? AND (date_creation < ? OR (date_creation = ? AND id < ?)) {ORDER} LIMIT {PAGE}",
+     (42, "2024-07-01 00:00:00", "2024-07-01 00:00:00", 10**9)),
+    ("Tickets à traiter (tous)", f"SELECT * FROM tickets {ORDER} LIMIT {PAGE}", ()),
+    ("Tickets à traiter par statut", f"SELECT * FROM tickets WHERE statut = ? {ORDER} LIMIT {PAGE}", ("en cours",)),
+    ("Tickets par statut et priorité",
+     f"SELECT * FROM tickets WHERE statut = ? AND priorite = ? {ORDER} LIMIT {PAGE}", ("ouvert", "Critique")),
+    ("Mes tickets assignés", f"SELECT * FROM tickets WHERE id_technicien = ? {ORDER} LIMIT {PAGE}", (7,)),
+    ("Mes tickets assignés par statut",
+     f"SELECT * FROM tickets WHERE statut = ? AND id_technicien = ? {ORDER} LIMIT {PAGE}", ("en cours", 7)),
+    ("Tickets non assignés", f"SELECT * FROM tickets WHERE id_technicien IS NULL {ORDER} LIMIT {PAGE}", ()),
+    ("Tickets modifiés récemment",
+     "SELECT * FROM tickets WHERE date_mise_a_jour > ? ORDER BY date_mise_a_jour, id LIMIT 500", ("2024-12-30 00:00:00",)),
+    ("Statistiques par statut et priorité",
+     "SELECT statut, priorite, COUNT(*) FROM tickets GROUP BY statut, priorite", ()),
+    ("Temps de résolution par technicien",
+     "SELECT id_technicien, SUM((julianday(date_mise_a_jour) - julianday(date_creation)) * 24), COUNT(*) "
+     "FROM tickets WHERE statut = 'résolu' AND id_technicien IS NOT NULL GROUP BY id_technicien", ()),
+    ("Détail d'un ticket", "SELECT * FROM tickets WHERE id = ?", (123456,)),
+]
+
+
+def index_statements() -> list:
+    """Extrait les CREATE INDEX portant sur la table tickets depuis init.sql."""
+    with open(INIT_SQL, encoding="utf-8") as handle:
+        sql = handle.read()
+    return re.findall(r"CREATE INDEX \w+ ON tickets \([^)]*\)", sql)
+
+
+def seed(conn: sqlite3.Connection, count: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+
+    def rows():
+        for ticket_id in range(1, count + 1):
+            created = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            updated = created + timedelta(hours=rng.expovariate(1 / 36))
+            statut = rng.choices(STATUSES, weights=[10, 10, 50, 30])[0]
+            assigned = statut != "ouvert" or rng.random() < 0.3
+            yield (
+                ticket_id,
+                f"Incident {ticket_id}",
+                "Description du problème rencontré " * 4,
+                statut,
+                rng.choice(PRIORITIES),
+                created.strftime("%Y-%m-%d %H:%M:%S"),
+                updated.strftime("%Y-%m-%d %H:%M:%S"),
+                rng.randrange(1, EMPLOYEES + 1),
+                rng.randrange(1, TECHNICIANS + 1) if assigned else None,
+            )
+
+    conn.execute(SCHEMA)
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows())
+    conn.commit()
+
+
+def measure(conn: sqlite3.Connection, repeat: int) -> dict:
+    results = {}
+    for label, sql, params in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        plan = " | ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        results[label] = (statistics.median(timings), plan)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--db", default=":memory:", help="Fichier SQLite (mémoire par défaut)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--plans", action="store_true", help="Afficher les plans d'exécution")
+    args = parser.parse_args()
+
+    if args.db != ":memory:" and os.path.exists(args.db):
+        os.remove(args.db)
+    conn = sqlite3.connect(args.db)
+
+    started = time.perf_counter()
+    seed(conn, args.tickets, args.seed)
+    print(f"{args.tickets} tickets insérés en {time.perf_counter() - started:.1f} s")
+
+    before = measure(conn, args.repeat)
+
+    started = time.perf_counter()
+    for statement in index_statements():
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+    print(f"Index créés en {time.perf_counter() - started:.1f} s\n")
+
+    after = measure(conn, args.repeat)
+
+    print(f"{'requête':<38} {'sans index (ms)':>16} {'avec index (ms)':>16} {'gain':>8}")
+    for label, _, _ in QUERIES:
+        without, plan_before = before[label]
+        with_index, plan_after = after[label]
+        gain = without / with_index if with_index else float("inf")
+        print(f"{label:<38} {without:>16.2f} {with_index:>16.2f} {gain:>7.0f}x")
+        if args.plans:
+            print(f"    avant : {plan_before}\n    après : {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark de la recherche de tickets : balayage LIKE '%mot%' contre index plein texte.
+
+Comme `bench_indexes.py`, SQLite sert de substitut à MySQL : l'index FULLTEXT
+(titre, description) déclaré dans `init-scripts/init.sql` est représenté par une
+table FTS5 sur les mêmes colonnes. Chaque recherche exige tous les mots, accepte
+les préfixes et renvoie les résultats classés par pertinence, comme
+GET /tickets/search.
+
+Usage :
+    python database/benchmarks/bench_search.py [--tickets 1000000] [--repeat 5]
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+
+LIMIT = 20
+
+SUBJECTS = ["imprimante", "ordinateur", "écran", "clavier", "souris", "réseau", "wifi", "vpn", "messagerie",
+            "outlook", "teams", "serveur", "badge", "téléphone", "scanner", "licence", "compte", "session"]
+PROBLEMS = ["bloqué", "lent", "hors service", "inaccessible", "erreur", "plantage", "déconnexion",
+            "mot de passe expiré", "mise à jour", "installation", "configuration", "accès refusé"]
+
+# Vocabulaire des descriptions : fréquences en loi de Zipf, comme un texte libre
+# (quelques mots très fréquents, une longue traîne de mots rares)
+VOCABULARY_SIZE = 50_000
+DESCRIPTION_WORDS = 25
+
+SEARCHES = [
+    ("sujet fréquent", "imprimante"),
+    ("préfixe", "impri"),
+    ("sujet et problème", "vpn déconnexion"),
+    ("mot courant", "mot00042"),
+    ("mot rare", "mot31337"),
+    ("mots rares", "mot12345 mot23456"),
+]
+
+
+def seed(conn: sqlite3.Connection, count: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    vocabulary = [f"mot{rank:05d}" for rank in range(VOCABULARY_SIZE)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    words = rng.choices(vocabulary, weights=weights, k=count * DESCRIPTION_WORDS)
+
+    def rows():
+        for ticket_id in range(1, count + 1):
+            subject, problem = rng.choice(SUBJECTS), rng.choice(PROBLEMS)
+            start = (ticket_id - 1) * DESCRIPTION_WORDS
+            description = f"{subject.capitalize()} {problem}. " + " ".join(words[start:start + DESCRIPTION_WORDS])
+            yield ticket_id, f"{subject.capitalize()} {problem}", description
+
+    conn.execute("CREATE TABLE tickets (id INTEGER PRIMARY KEY, titre TEXT NOT NULL, description TEXT NOT NULL)")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)", rows())
+    conn.commit()
+
+
+def like_query(terms: list) -> tuple:
+    conditions = " AND ".join("(titre LIKE ? OR description LIKE ?)" for _ in terms)
+    params = [value for term in terms for value in (f"%{term}%", f"%{term}%")]
+    return f"SELECT id, titre FROM tickets WHERE {conditions} ORDER BY id DESC LIMIT {LIMIT}", params
+
+
+def fulltext_query(terms: list) -> tuple:
+    # Équivalent FTS5 de "+mot1* +mot2*" en mode booléen MySQL, classé par bm25
+    expression = " AND ".join(f'"{term}"*' for term in terms)
+    sql = (f"SELECT t.id, t.titre FROM tickets_fts JOIN tickets t ON t.id = tickets_fts.rowid "
+           f"WHERE tickets_fts MATCH ? ORDER BY bm25(tickets_fts) LIMIT {LIMIT}")
+    return sql, [expression]
+
+
+def measure(conn: sqlite3.Connection, build, repeat: int) -> dict:
+    results = {}
+    for label, text in SEARCHES:
+        sql, params = build(text.split())
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[label] = (statistics.median(timings), len(rows))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(":memory:")
+    started = time.perf_counter()
+    seed(conn, args.tickets, args.seed)
+    print(f"{args.tickets} tickets insérés en {time.perf_counter() - started:.1f} s")
+
+    before = measure(conn, like_query, args.repeat)
+
+    started = time.perf_counter()
+    conn.execute("CREATE VIRTUAL TABLE tickets_fts USING fts5(titre, description, content='tickets', "
+                 "content_rowid='id', tokenize='unicode61 remove_diacritics 2')")
+    conn.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+    print(f"Index plein texte créé en {time.perf_counter() - started:.1f} s\n")
+
+    after = measure(conn, fulltext_query, args.repeat)
+
+    print(f"{'recherche':<20} {'LIKE (ms)':>12} {'plein texte (ms)':>18} {'correspondances':>16}")
+    for label, text in SEARCHES:
+        scan, _ = before[label]
+        indexed, _ = after[label]
+        expression = " AND ".join(f'"{term}"*' for term in text.split())
+        matches = conn.execute("SELECT COUNT(*) FROM tickets_fts WHERE tickets_fts MATCH ?", [expression]).fetchone()[0]
+        print(f"{label:<20} {scan:>12.2f} {indexed:>18.2f} {matches:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+-- Schéma de la base des tickets de support IT
+-- Exécuté automatiquement par l'image MySQL au premier démarrage du conteneur
+
+CREATE DATABASE IF NOT EXISTS system_tickets CHARACTER SET utf8mb4 COLLATE utf8mb4_0900_ai_ci;
+USE system_tickets;
+
+-- Utilisateurs
+CREATE TABLE IF NOT EXISTS users (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  nom VARCHAR(100) NOT NULL,
+  email VARCHAR(255) NOT NULL,
+  mot_de_passe VARCHAR(255) NOT NULL,
+  role VARCHAR(20) NOT NULL DEFAULT 'Employé',
+  date_inscription DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uq_users_email (email)
+) ENGINE=InnoDB;
+
+-- Tickets
+-- date_mise_a_jour est NOT NULL et mise à jour automatiquement : elle sert de clé
+-- de tri pour la pagination par curseur et de date de résolution pour les statistiques
+CREATE TABLE IF NOT EXISTS tickets (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  titre VARCHAR(255) NOT NULL,
+  description TEXT NOT NULL,
+  statut VARCHAR(20) NOT NULL DEFAULT 'ouvert',
+  priorite VARCHAR(20) NOT NULL,
+  date_creation DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  date_mise_a_jour DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  id_employe INT NULL,
+  id_technicien INT NULL,
+  CONSTRAINT fk_tickets_employe FOREIGN KEY (id_employe) REFERENCES users (id) ON DELETE SET NULL,
+  CONSTRAINT fk_tickets_technicien FOREIGN KEY (id_technicien) REFERENCES users (id) ON DELETE SET NULL
+) ENGINE=InnoDB;
+
+-- Journal des événements des tickets, en ajout seul : création, changements de
+-- statut et d'assignation, commentaires, suppression. ancienne_valeur /
+-- nouvelle_valeur contiennent le statut ou l'id du technicien avant et après
+-- l'événement. date_evenement est à la milliseconde pour ordonner et mesurer
+-- les durées passées dans chaque statut. ticket_id n'a pas de clé étrangère :
+-- l'historique d'un ticket supprimé est conservé.
+CREATE TABLE IF NOT EXISTS ticket_events (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  ticket_id INT NOT NULL,
+  type VARCHAR(20) NOT NULL,
+  ancienne_valeur VARCHAR(50) NULL,
+  nouvelle_valeur VARCHAR(50) NULL,
+  commentaire TEXT NULL,
+  id_auteur INT NULL,
+  date_evenement DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+  CONSTRAINT fk_ticket_events_auteur FOREIGN KEY (id_auteur) REFERENCES users (id) ON DELETE SET NULL
+) ENGINE=InnoDB;
+
+-- Index des chemins d'accès de l'application. InnoDB ajoute implicitement la clé
+-- primaire (id) à chaque index secondaire, ce qui couvre le départage par id de
+-- la pagination par curseur (ORDER BY <date> DESC, id DESC).
+
+-- Liste des rôles (page "Gestion utilisateurs")
+CREATE INDEX idx_users_role ON users (role);
+
+-- "Mes tickets" : tickets d'un employé, du plus récent au plus ancien
+CREATE INDEX idx_tickets_employe_date ON tickets (id_employe, date_creation);
+
+-- "Tickets à traiter" : tickets assignés (ou non, IS NULL) à un technicien
+CREATE INDEX idx_tickets_technicien_date ON tickets (id_technicien, date_creation);
+
+-- "Tickets à traiter" : tickets assignés à un technicien, filtrés par statut ;
+-- couvre aussi le calcul du temps de résolution par technicien (statut = 'résolu')
+CREATE INDEX idx_tickets_statut_technicien_dates ON tickets (statut, id_technicien, date_creation, date_mise_a_jour);
+
+-- "Tickets à traiter" filtrés par statut et priorité ; statistiques groupées par statut et priorité
+CREATE INDEX idx_tickets_statut_priorite_date ON tickets (statut, priorite, date_creation);
+
+-- "Tickets à traiter" filtrés par statut seul
+CREATE INDEX idx_tickets_statut_date ON tickets (statut, date_creation);
+
+-- Liste complète triée par date de création
+CREATE INDEX idx_tickets_date_creation ON tickets (date_creation);
+
+-- Tri par date de mise à jour et récupération des tickets modifiés depuis une date
+CREATE INDEX idx_tickets_date_mise_a_jour ON tickets (date_mise_a_jour);
+
+-- Recherche plein texte dans les titres et descriptions (GET /tickets/search)
+CREATE FULLTEXT INDEX ft_tickets_titre_description ON tickets (titre, description);
+
+-- Historique d'un ticket dans l'ordre chronologique (GET /tickets/:id/events,
+-- pagination par curseur sur date_evenement, id)
+CREATE INDEX idx_ticket_events_ticket_date ON ticket_events (ticket_id, date_evenement);
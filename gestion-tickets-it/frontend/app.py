@@ -1,6 +1,9 @@
+import time
 import streamlit as st
-from utils.api import ApiClient
-from utils.auth import login_user, logout_user, check_authentication, get_current_user, is_admin, is_technician, is_employee
+from functools import partial
+from utils.auth import login_user, logout_user, restore_session, check_authentication, get_current_user, is_admin, is_technician, is_employee
+from utils.resources import get_metrics, get_api_client, get_analytics_store, get_feed_listener, get_ticket_replica, get_similarity_index
+from utils import startup
 import config
 
 # Configuration de la page
@@ -11,17 +14,25 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialisation de l'API client
-@st.cache_resource
-def get_api_client():
-    return ApiClient(config.API_URL)
-
+# Ressources partagées par les sessions (créées à l'avance par le préchauffage de start.py)
 api_client = get_api_client()
 
+def get_ticket_store(name):
+    """Retourne le store de tickets de la session pour une page, abonné au flux."""
+    key = f"{name}_store"
+    if key not in st.session_state:
+        from utils.feed import TicketStore
+        st.session_state[key] = TicketStore()
+        get_feed_listener().subscribe(st.session_state[key])
+    return st.session_state[key]
+
 # Initialisation de la session si nécessaire
 if "is_logged_in" not in st.session_state:
     st.session_state.is_logged_in = False
 
+# Après un rechargement de la page, la session est restaurée depuis le code de reprise de l'URL
+restore_session(api_client)
+
 # Sidebar pour la navigation et les informations utilisateur
 with st.sidebar:
     st.title("🎫 Support IT")
@@ -54,16 +65,21 @@ with st.sidebar:
         
         # Bouton de déconnexion
         if st.sidebar.button("🚪 Déconnexion"):
-            logout_user()
-            st.experimental_rerun()
+            logout_user(api_client)
+            st.rerun()
     
     st.divider()
     st.caption("© 2025 Support IT - DevOps Project")
 
-# Page principale
+# Page principale, chronométrée jusqu'à la fin du script
+render_started = time.perf_counter()
+rendered_page = "login"
+
 if not check_authentication():
     # Formulaire de connexion
     st.title("Connexion au système de tickets")
+    if st.session_state.pop("session_expired", False):
+        st.info("Votre session a expiré, veuillez vous reconnecter.")
     
     with st.form("login_form"):
         email = st.text_input("Email")
@@ -76,7 +92,7 @@ if not check_authentication():
 
                 if user:
                     st.success(f"Bienvenue, {user.get('email')}!")
-                    st.experimental_rerun()
+                    st.rerun()
 
                 else:
                     st.error("Email ou mot de passe incorrect.")
@@ -94,24 +110,73 @@ else:
         else:
             st.session_state.page = "employee_tickets"
     
+    # Page de diagnostic, absente du menu : accessible aux admins via ?page=diagnostics
+    if st.query_params.get("page") == "diagnostics":
+        del st.query_params["page"]
+        if is_admin():
+            st.session_state.page = "admin_diagnostics"
+    
+    rendered_page = st.session_state.page
+    
     # Afficher la page sélectionnée
     if st.session_state.page == "employee_tickets":
         st.title("Mes tickets")
         user_id = get_current_user().get("id")
-        tickets = api_client.get_tickets({"id_employe": user_id})
+        filters = {"id_employe": user_id}
+        
+        from utils.ui import display_ticket_list, get_page_cursor, TICKET_LIST_COLUMNS
+        from utils.feed import load_ticket_page, watch_ticket_store
+        cursor = get_page_cursor("employee_tickets", filters)
+        store = get_ticket_store("employee_tickets")
+        page = load_ticket_page(
+            get_ticket_replica(),
+            store,
+            get_feed_listener(),
+            filters,
+            cursor=cursor,
+            limit=config.TICKETS_PAGE_SIZE,
+            fields=list(TICKET_LIST_COLUMNS),
+        )
+        
+        # Nouvel affichage uniquement quand le flux modifie les tickets de la page
+        watch_ticket_store(store, config.TICKET_FEED_CHECK_INTERVAL)
         
         # Fonction pour afficher les détails d'un ticket
         def view_ticket_details(ticket_id):
             st.session_state.selected_ticket_id = ticket_id
             st.session_state.page = "ticket_details"
         
-        # Importer et utiliser la fonction d'affichage des tickets
-        from utils.ui import display_ticket_list
-        display_ticket_list(tickets, on_click=view_ticket_details)
+        # Recherche plein texte parmi mes tickets, ou page de tickets avec ses contrôles de pagination
+        search = st.text_input("🔍 Rechercher dans les titres et descriptions", key="employee_ticket_search")
+        if search.strip():
+            # Le serveur limite la recherche aux tickets de l'appelant, identifié par son jeton
+            results = api_client.search_tickets(search, {"mine": "true"}, limit=config.SEARCH_RESULTS_LIMIT, fields=list(TICKET_LIST_COLUMNS))
+            st.caption(f"{len(results)} résultat(s), classés par pertinence")
+            display_ticket_list(results, on_click=view_ticket_details, key="employee_ticket_search")
+        else:
+            display_ticket_list(
+                page["items"],
+                on_click=view_ticket_details,
+                pagination_key="employee_tickets",
+                next_cursor=page["next_cursor"],
+            )
         
     elif st.session_state.page == "new_ticket":
         st.title("Créer un nouveau ticket")
         
+        def create_ticket(ticket_data):
+            result = api_client.create_ticket(ticket_data)
+            if result:
+                ticket_id = result.get("ticketId")
+                get_ticket_replica().invalidate()
+                if ticket_id is not None:
+                    get_similarity_index().add({**ticket_data, "id": ticket_id, "statut": "Ouvert"})
+                st.session_state.pop("new_ticket_draft", None)
+                st.success(f"Ticket #{ticket_id} créé avec succès!" if ticket_id is not None else "Ticket créé avec succès!")
+                # Rediriger vers la liste des tickets
+                st.session_state.page = "employee_tickets"
+                st.rerun()
+        
         with st.form("new_ticket_form"):
             titre = st.text_input("Titre du problème")
             description = st.text_area("Description détaillée")
@@ -121,32 +186,59 @@ else:
             
             if submit:
                 if titre and description:
-                    # Créer le ticket
                     ticket_data = {
                         "titre": titre,
                         "description": description,
                         "priorite": priorite,
                     }
                     
-                    result = api_client.create_ticket(ticket_data)
-                    if result:
-                        st.success(f"Ticket #{result.get('id')} créé avec succès!")
-                        # Rediriger vers la liste des tickets
-                        st.session_state.page = "employee_tickets"
-                        st.experimental_rerun()
+                    # Avant de créer le ticket, proposer les tickets ouverts décrivant le même problème
+                    duplicates = get_similarity_index().find_similar(titre, description, limit=config.DUPLICATE_SUGGESTIONS)
+                    if duplicates:
+                        st.session_state.new_ticket_draft = {"ticket": ticket_data, "duplicates": duplicates}
+                    else:
+                        create_ticket(ticket_data)
                 else:
                     st.warning("Veuillez remplir tous les champs obligatoires.")
+        
+        draft = st.session_state.get("new_ticket_draft")
+        if draft:
+            st.warning("Des tickets ouverts semblent décrire le même problème. Vous pouvez suivre l'un d'eux plutôt que d'en créer un nouveau.")
+            
+            def follow_ticket(ticket_id):
+                st.session_state.pop("new_ticket_draft", None)
+                st.session_state.selected_ticket_id = ticket_id
+                st.session_state.page = "ticket_details"
+            
+            from utils.ui import display_ticket_list
+            display_ticket_list(draft["duplicates"], on_click=follow_ticket, key="new_ticket_duplicates")
+            
+            col1, col2 = st.columns(2)
+            if col1.button("Créer mon ticket quand même"):
+                create_ticket(draft["ticket"])
+            if col2.button("Modifier ma demande"):
+                st.session_state.pop("new_ticket_draft", None)
+                st.rerun()
     
     elif st.session_state.page == "ticket_details":
         # Vérifier si un ticket est sélectionné
         if not hasattr(st.session_state, "selected_ticket_id"):
             st.warning("Aucun ticket sélectionné.")
             st.session_state.page = "employee_tickets"
-            st.experimental_rerun()
+            st.rerun()
         
         ticket_id = st.session_state.selected_ticket_id
         ticket = api_client.get_ticket(ticket_id)
         
+        # Récupérer en parallèle l'employé et le technicien liés au ticket, son
+        # historique complet et les techniciens (noms affichés pour les assignations)
+        employee, technician, events, technicians = api_client.gather(
+            partial(api_client.get_user, ticket["id_employe"]) if ticket.get("id_employe") else dict,
+            partial(api_client.get_user, ticket["id_technicien"]) if ticket.get("id_technicien") else dict,
+            lambda: list(api_client.iter_ticket_events(ticket_id)),
+            api_client.get_technicians,
+        )
+        
         # Bouton de retour
         if st.button("← Retour à la liste"):
             # Rediriger en fonction du rôle
@@ -155,13 +247,26 @@ else:
                 st.session_state.page = "tech_tickets"
             else:
                 st.session_state.page = "employee_tickets"
-            st.experimental_rerun()
+            st.rerun()
         
         st.title(f"Ticket #{ticket_id}: {ticket.get('titre', '')}")
         
         # Afficher les détails du ticket
-        from utils.ui import display_ticket_details
-        display_ticket_details(ticket)
+        from utils.ui import display_ticket_details, display_ticket_timeline
+        from utils.timeline import state_durations
+        display_ticket_details(ticket, employee=employee, technician=technician)
+        
+        # Historique du ticket et temps passé dans chaque statut
+        user_names = {user["id"]: user["nom"] for user in [*technicians, employee, technician] if user.get("id")}
+        display_ticket_timeline(events, state_durations(ticket, events), user_names=user_names)
+        
+        with st.form("ticket_comment_form", clear_on_submit=True):
+            commentaire = st.text_area("Ajouter un commentaire")
+            if st.form_submit_button("Commenter"):
+                if not commentaire.strip():
+                    st.error("Le commentaire est vide.")
+                elif api_client.add_ticket_comment(ticket_id, commentaire.strip()):
+                    st.rerun()
         
         # Si l'utilisateur est technicien ou admin, il peut mettre à jour le statut
         if is_technician():
@@ -183,17 +288,19 @@ else:
                     
                     result = api_client.update_ticket(ticket_id, update_data)
                     if result:
+                        get_ticket_replica().invalidate()
                         st.success("Ticket mis à jour avec succès!")
-                        st.experimental_rerun()
+                        st.rerun()
                     else:
                         st.error("Erreur lors de la mise à jour du ticket.")
 
             st.markdown("---")
             if st.button("🗑️ Supprimer le ticket", type="primary"):
                 if api_client.delete_ticket(ticket_id):
+                    get_ticket_replica().remove([ticket_id])
                     st.success("Ticket supprimé avec succès.")
                     st.session_state.page = "tech_tickets"  # ou "employee_tickets" selon le contexte
-                    st.experimental_rerun()
+                    st.rerun()
                 else:
                     st.error("Erreur lors de la suppression du ticket.")
 
@@ -227,8 +334,23 @@ else:
         elif filter_assigned == "Tickets non assignés":
             filters["id_technicien"] = None
         
-        # Récupérer les tickets selon les filtres
-        tickets = api_client.get_tickets(filters)
+        # Récupérer la page de tickets courante selon les filtres : elle est tenue
+        # à jour par le flux de modifications et n'est recalculée depuis la réplique
+        # locale (index en mémoire) que lorsqu'un ticket entre dans la liste filtrée
+        from utils.ui import display_ticket_list, get_page_cursor, TICKET_LIST_COLUMNS
+        from utils.feed import load_ticket_page, watch_ticket_store
+        cursor = get_page_cursor("tech_tickets", filters)
+        store = get_ticket_store("tech_tickets")
+        page = load_ticket_page(
+            get_ticket_replica(),
+            store,
+            get_feed_listener(),
+            filters,
+            cursor=cursor,
+            limit=config.TICKETS_PAGE_SIZE,
+            fields=list(TICKET_LIST_COLUMNS),
+        )
+        watch_ticket_store(store, config.TICKET_FEED_CHECK_INTERVAL)
         
         # Fonction pour afficher les détails d'un ticket
         def view_ticket_details(ticket_id):
@@ -236,8 +358,82 @@ else:
             st.session_state.page = "ticket_details"
         
         # Afficher la liste des tickets
-        from utils.ui import display_ticket_list
-        display_ticket_list(tickets, on_click=view_ticket_details)
+        # Résultat de la dernière action groupée (affiché après le rechargement de la liste)
+        if "tech_bulk_message" in st.session_state:
+            st.success(st.session_state.pop("tech_bulk_message"))
+        
+        # Recherche plein texte dans les tickets filtrés
+        search = st.text_input("🔍 Rechercher dans les titres et descriptions", key="tech_ticket_search")
+        
+        bulk_mode = st.toggle("Sélection multiple (actions groupées)", key="tech_bulk_mode")
+        if search.strip():
+            results = api_client.search_tickets(search, filters, limit=config.SEARCH_RESULTS_LIMIT, fields=list(TICKET_LIST_COLUMNS))
+            st.caption(f"{len(results)} résultat(s), classés par pertinence")
+            selected_ids = display_ticket_list(
+                results,
+                on_click=view_ticket_details,
+                multi_select=bulk_mode,
+                key="tech_ticket_search",
+            )
+        else:
+            selected_ids = display_ticket_list(
+                page["items"],
+                on_click=view_ticket_details,
+                pagination_key="tech_tickets",
+                next_cursor=page["next_cursor"],
+                multi_select=bulk_mode,
+            )
+        
+        # Regroupement des tickets ouverts signalant probablement le même incident
+        with st.expander("Doublons probables dans les tickets ouverts"):
+            cluster_threshold = st.slider(
+                "Similarité minimale", 0.1, 0.9, config.DUPLICATE_CLUSTER_THRESHOLD, 0.05, key="tech_cluster_threshold"
+            )
+            if st.button("Regrouper les tickets ouverts", key="tech_cluster_button"):
+                st.session_state.tech_clusters = get_similarity_index().clusters(threshold=cluster_threshold)
+            if "tech_clusters" in st.session_state:
+                from utils.ui import display_ticket_clusters
+                display_ticket_clusters(st.session_state.tech_clusters, on_click=view_ticket_details)
+        
+        # Actions groupées sur les tickets cochés, exécutées en une seule transaction
+        if bulk_mode:
+            st.subheader(f"Actions groupées ({len(selected_ids)} ticket(s) sélectionné(s))")
+            technicians = {tech["nom"]: tech["id"] for tech in api_client.get_users(role="Technicien", fields=["id", "nom"])}
+            
+            with st.form("bulk_update_form"):
+                nouveau_statut = st.selectbox("Nouveau statut", ["Inchangé"] + config.TICKET_STATUS)
+                assignation = st.selectbox("Assigner à", ["Inchangé", "Moi", "Personne"] + list(technicians))
+                soumettre_bulk = st.form_submit_button("Appliquer", disabled=not selected_ids)
+                
+                if soumettre_bulk:
+                    bulk_data = {}
+                    if nouveau_statut != "Inchangé":
+                        bulk_data["statut"] = nouveau_statut
+                    if assignation == "Moi":
+                        bulk_data["id_technicien"] = get_current_user().get("id")
+                    elif assignation == "Personne":
+                        bulk_data["id_technicien"] = None
+                    elif assignation != "Inchangé":
+                        bulk_data["id_technicien"] = technicians[assignation]
+                    
+                    if not bulk_data:
+                        st.warning("Aucune modification sélectionnée.")
+                    else:
+                        result = api_client.bulk_update_tickets(selected_ids, bulk_data)
+                        if result:
+                            st.session_state.tech_bulk_message = result.get("message", "Tickets mis à jour.")
+                            store.invalidate()
+                            get_ticket_replica().invalidate()
+                            st.rerun()
+            
+            confirmer = st.checkbox("Confirmer la suppression des tickets sélectionnés")
+            if st.button("🗑️ Supprimer la sélection", disabled=not (selected_ids and confirmer)):
+                result = api_client.bulk_delete_tickets(selected_ids)
+                if result:
+                    st.session_state.tech_bulk_message = result.get("message", "Tickets supprimés.")
+                    store.invalidate()
+                    get_ticket_replica().remove(selected_ids)
+                    st.rerun()
     
     elif st.session_state.page == "admin_dashboard":
         st.title("Tableau de bord administrateur")
@@ -246,8 +442,26 @@ else:
         stats = api_client.get_statistics()
         
         # Afficher les statistiques
-        from utils.ui import display_statistics
+        from utils.ui import display_statistics, display_analytics
         display_statistics(stats)
+        
+        # Analyses détaillées, mémorisées par version des données
+        display_analytics(get_analytics_store().get(api_client, sla_hours=config.SLA_HOURS))
+        
+        # Efficacité des caches HTTP (client et serveur)
+        with st.expander("Cache HTTP"):
+            from utils.ui import display_http_cache_stats
+            display_http_cache_stats(
+                api_client.cache_stats(),
+                api_client.conditional_stats(),
+                api_client.get_http_cache_stats(),
+            )
+        
+        # Répartition des tickets par l'assignation automatique
+        with st.expander("Assignation automatique"):
+            from utils.ui import display_assignment_stats
+            assignment, technicians = api_client.gather(api_client.get_assignment_stats, api_client.get_technicians)
+            display_assignment_stats(assignment, {user["id"]: user["nom"] for user in technicians})
     
     elif st.session_state.page == "admin_users":
         st.title("Gestion des utilisateurs")
@@ -259,19 +473,12 @@ else:
             # Filtre par rôle
             role_filter = st.selectbox("Filtrer par rôle", ["Tous"] + config.USER_ROLES)
             
-            # Récupérer les utilisateurs selon le rôle sélectionné
-            if role_filter == "Technicien":
-                # Récupérer les techniciens
-                users = api_client.get_technicians(role=role_filter)
-            elif role_filter == "Employé":
-                # Récupérer les utilisateurs selon le rôle filtré
-                users = api_client.get_employees(role=role_filter)
-            elif role_filter == "Admin":
-
-                users = api_client.get_admins(role=role_filter)
-            else:
-                # Récupérer tous les utilisateurs si "Tous" est sélectionné
-                users = api_client.get_users()
+            # Récupérer les utilisateurs, filtrés par rôle côté serveur
+            from utils.ui import display_user_list, USER_LIST_COLUMNS
+            users = api_client.get_users(
+                role=None if role_filter == "Tous" else role_filter,
+                fields=list(USER_LIST_COLUMNS),
+            )
             
             # Fonction pour afficher les détails d'un utilisateur
             def view_user_details(user_id):
@@ -279,7 +486,6 @@ else:
                 st.session_state.page = "user_details"
             
             # Afficher la liste des utilisateurs
-            from utils.ui import display_user_list
             display_user_list(users, on_click=view_user_details)
         
         with tab2:
@@ -314,7 +520,7 @@ else:
         if not hasattr(st.session_state, "selected_user_id"):
             st.warning("Aucun utilisateur sélectionné.")
             st.session_state.page = "admin_users"
-            st.experimental_rerun()
+            st.rerun()
         
         user_id = st.session_state.selected_user_id
         user = api_client.get_user(user_id)
@@ -322,7 +528,7 @@ else:
         # Bouton de retour
         if st.button("← Retour à la liste"):
             st.session_state.page = "admin_users"
-            st.experimental_rerun()
+            st.rerun()
         
         st.title(f"Utilisateur: {user.get('nom', '')}")
         
@@ -370,7 +576,7 @@ else:
                     result = api_client.update_user(user_id, update_data)
                     if result:
                         st.success("Utilisateur mis à jour avec succès!")
-                        st.experimental_rerun()
+                        st.rerun()
                     else:
                         st.error("Erreur lors de la mise à jour de l'utilisateur.")
             
@@ -381,6 +587,24 @@ else:
                     if result:
                         st.success("Utilisateur supprimé avec succès!")
                         st.session_state.page = "admin_users"
-                        st.experimental_rerun()
+                        st.rerun()
                     else:
                         st.error("Erreur lors de la suppression de l'utilisateur.")
+    
+    elif st.session_state.page == "admin_diagnostics" and is_admin():
+        st.title("Diagnostic du frontend")
+        
+        from utils.ui import display_diagnostics
+        metrics = get_metrics()
+        display_diagnostics(
+            metrics.endpoint_summary(),
+            metrics.page_summary(),
+            api_client.pool_stats(),
+            startup.report(),
+            metrics.render_prometheus(),
+        )
+
+# Les exécutions interrompues par st.rerun() ne sont pas comptées
+render_duration = time.perf_counter() - render_started
+get_metrics().record_page(rendered_page, render_duration)
+startup.mark("first_render", render_duration)
@@ -0,0 +1,65 @@
+"""
+Benchmark des analyses du tableau de bord (`utils.analytics`) sur des tickets synthétiques.
+
+Usage :
+    python benchmarks/bench_analytics.py [--tickets 1000000] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from utils.analytics import TicketAnalytics, build_ticket_frame  # noqa: E402
+
+
+def synthetic_columns(count: int, seed: int) -> dict:
+    """Génère un export en colonnes semblable à celui de GET /tickets/columns."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-01T00:00:00")
+    created = start + rng.integers(0, 365 * 24 * 3600, count).astype("timedelta64[s]")
+    updated = created + rng.exponential(36 * 3600, count).astype("timedelta64[s]")
+    return {
+        "id": np.arange(1, count + 1).tolist(),
+        "statut": rng.choice(["Ouvert", "En cours", "Résolu", "Fermé"], count, p=[0.1, 0.1, 0.5, 0.3]).tolist(),
+        "priorite": rng.choice(config.PRIORITY_LEVELS, count).tolist(),
+        "date_creation": np.datetime_as_string(created, unit="s").tolist(),
+        "date_mise_a_jour": np.datetime_as_string(updated, unit="s").tolist(),
+        "id_technicien": rng.integers(1, 50, count).tolist(),
+    }
+
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<32} {time.perf_counter() - started:8.3f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    columns = synthetic_columns(args.tickets, args.seed)
+    print(f"{args.tickets} tickets")
+
+    started = time.perf_counter()
+    df = timed("construction du DataFrame", lambda: build_ticket_frame(columns))
+    analytics = TicketAnalytics(df, sla_hours=config.SLA_HOURS)
+    timed("créés / résolus par jour", lambda: analytics.daily_counts)
+    timed("backlog", lambda: analytics.backlog)
+    timed("percentiles par technicien", lambda: analytics.resolution_by_technician)
+    timed("percentiles par priorité", lambda: analytics.resolution_by_priority)
+    timed("taux de dépassement SLA", lambda: analytics.sla_breach_rates)
+    print(f"{'total':<32} {time.perf_counter() - started:8.3f} s")
+    timed("indicateurs déjà mémorisés", lambda: (analytics.daily_counts, analytics.sla_breach_rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Benchmark du rendu des pages de `app.py` : chaque branche est exécutée sans
+navigateur (`streamlit.testing.v1.AppTest`) avec un client API simulé alimenté
+de données synthétiques de tailles croissantes.
+
+Pour chaque page et chaque taille, on mesure la durée d'une réexécution du
+script (médiane et maximum après une exécution de chauffe, qui charge les
+ressources partagées : réplique, analyses...), le nombre d'éléments émis et le
+pic de mémoire allouée pendant une réexécution (tracemalloc). Le temps mesuré
+comprend le traitement des éléments par AppTest, identique d'une version à
+l'autre.
+
+Usage :
+    python benchmarks/bench_pages.py [--sizes 1000,10000,50000] [--repeat 5] [--pages admin_dashboard,admin_users]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, FRONTEND_DIR)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.element_tree import Block  # noqa: E402
+
+import config  # noqa: E402
+import utils.resources  # noqa: E402
+from utils.feed import matches_filters  # noqa: E402
+
+PAGES = ["employee_tickets", "tech_tickets", "ticket_details", "admin_dashboard", "admin_users", "user_details"]
+STATUSES = ["ouvert", "en cours", "résolu", "fermé"]
+SUBJECTS = ["Imprimante", "Ordinateur", "Écran", "Réseau", "Wifi", "VPN", "Messagerie", "Badge", "Téléphone"]
+PROBLEMS = ["bloqué", "lent", "hors service", "inaccessible", "erreur au démarrage", "mot de passe expiré"]
+
+# Utilisateur connecté pendant les mesures : un admin voit toutes les pages
+ADMIN_ID = 1
+
+
+class Dataset:
+    """Tickets et utilisateurs synthétiques."""
+
+    def __init__(self, tickets: int, seed: int):
+        rng = random.Random(seed)
+        user_count = max(20, tickets // 20)
+        technicians = list(range(2, 2 + max(3, user_count // 10)))
+        self.users = [{"id": ADMIN_ID, "nom": "Admin", "email": "admin@example.com", "role": "Admin",
+                       "date_inscription": "2024-01-01T00:00:00.000Z"}]
+        for user_id in range(2, user_count + 1):
+            self.users.append({
+                "id": user_id,
+                "nom": f"Utilisateur {user_id}",
+                "email": f"utilisateur{user_id}@example.com",
+                "role": "Technicien" if user_id in technicians else "Employé",
+                "date_inscription": "2024-01-01T00:00:00.000Z",
+            })
+
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.tickets = []
+        for ticket_id in range(1, tickets + 1):
+            created = start + timedelta(minutes=ticket_id * 30 + rng.randint(0, 29))
+            updated = created + timedelta(hours=rng.expovariate(1 / 24))
+            status = rng.choices(STATUSES, weights=[15, 15, 40, 30])[0]
+            subject, problem = rng.choice(SUBJECTS), rng.choice(PROBLEMS)
+            self.tickets.append({
+                "id": ticket_id,
+                "titre": f"{subject} {problem}",
+                "description": f"{subject} {problem} depuis ce matin, merci de votre aide.",
+                "statut": status,
+                "priorite": rng.choice(config.PRIORITY_LEVELS),
+                "date_creation": created.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "date_mise_a_jour": updated.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                # L'admin connecté a aussi des tickets, pour la page "Mes tickets"
+                "id_employe": ADMIN_ID if ticket_id % 10 == 0 else rng.randint(technicians[-1] + 1, user_count),
+                "id_technicien": None if status == "ouvert" else rng.choice(technicians),
+            })
+        self.users_by_id = {user["id"]: user for user in self.users}
+
+
+class SyntheticApiClient:
+    """
+    Remplace `ApiClient` dans l'application : mêmes méthodes, réponses calculées
+    en mémoire à partir du `Dataset` courant, sans réseau.
+    """
+
+    dataset: Dataset = None
+
+    def __init__(self, base_url: str, **kwargs: Any):
+        self.base_url = base_url
+        self.data = self.dataset
+
+    @staticmethod
+    def _project(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        return {field: item.get(field) for field in fields} if fields else dict(item)
+
+    def _filtered(self, filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        filters = {key: value for key, value in (filters or {}).items() if key != "mine"}
+        return [ticket for ticket in self.data.tickets if matches_filters(ticket, filters)]
+
+    def add_hook(self, hook: Callable) -> None:
+        pass
+
+    def gather(self, *calls: Callable[[], Any]) -> List[Any]:
+        return [call() for call in calls]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {"hit_rate": 0.0}
+
+    def conditional_stats(self) -> Dict[str, Any]:
+        return {"not_modified": 0, "bytes_avoided": 0}
+
+    def pool_stats(self) -> Dict[str, int]:
+        return {"requests": 0, "hits": 0, "misses": 0}
+
+    def get_http_cache_stats(self) -> Dict[str, Any]:
+        return {"queries_avoided": 0}
+
+    def get_assignment_stats(self) -> Dict[str, Any]:
+        technicians = [user for user in self.data.users if user["role"] == "Technicien"]
+        return {"active": True, "politique": "equilibre", "max_tickets_ouverts": 10, "tickets_en_attente": 0,
+                "techniciens": [{"id_technicien": user["id"], "tickets_ouverts": 0, "charge": 0,
+                                 "temps_moyen_heures": 24.0, "disponible": True} for user in technicians]}
+
+    def warm_up(self, connections: int = 1) -> bool:
+        return True
+
+    def verify_user(self, email: str, password: str) -> Dict[str, Any]:
+        return {}
+
+    def create_resume_code(self, previous: Optional[str] = None) -> Dict[str, Any]:
+        return {}
+
+    def resume_session(self, code: str) -> Dict[str, Any]:
+        return {}
+
+    def revoke_resume_code(self, code: str) -> None:
+        pass
+
+    def get_tickets_page(self, filters=None, limit=50, cursor=None, sort="date_creation", order="desc", fields=None):
+        tickets = sorted(self._filtered(filters), key=lambda ticket: (ticket[sort], ticket["id"]), reverse=order == "desc")
+        start = int(cursor or 0)
+        items = tickets[start:start + limit]
+        next_cursor = str(start + limit) if start + limit < len(tickets) else None
+        return {"items": [self._project(ticket, fields) for ticket in items], "next_cursor": next_cursor}
+
+    def iter_ticket_chunks(self, filters=None, fields=None, chunk_size=10000) -> Iterator[List[Dict[str, Any]]]:
+        tickets = self._filtered(filters)
+        for start in range(0, len(tickets), chunk_size):
+            yield [self._project(ticket, fields) for ticket in tickets[start:start + chunk_size]]
+
+    def iter_ticket_pages(self, filters=None, page_size=200, sort="date_creation", order="desc", fields=None):
+        filters = dict(filters or {})
+        since = filters.pop("updated_since", None)
+        changed = [ticket for ticket in self._filtered(filters) if since is None or ticket["date_mise_a_jour"] >= since]
+        for start in range(0, len(changed), page_size):
+            yield [self._project(ticket, fields) for ticket in changed[start:start + page_size]]
+
+    def search_tickets(self, query, filters=None, limit=20, fields=None):
+        terms = query.lower().split()
+        matches = [ticket for ticket in self._filtered(filters)
+                   if all(term in f"{ticket['titre']} {ticket['description']}".lower() for term in terms)]
+        return [{**self._project(ticket, fields), "pertinence": 1.0} for ticket in matches[:limit]]
+
+    def get_ticket_columns(self, fields: List[str]) -> Dict[str, Any]:
+        return {
+            "version": len(self.data.tickets),
+            "count": len(self.data.tickets),
+            "columns": {field: [ticket[field] for ticket in self.data.tickets] for field in fields},
+        }
+
+    def get_ticket(self, ticket_id: int) -> Dict[str, Any]:
+        return dict(self.data.tickets[ticket_id - 1])
+
+    def iter_ticket_events(self, ticket_id: int, page_size: int = 200) -> Iterator[Dict[str, Any]]:
+        ticket = self.data.tickets[ticket_id - 1]
+        yield {"id": 1, "ticket_id": ticket_id, "type": "creation", "ancienne_valeur": None, "nouvelle_valeur": "ouvert",
+               "commentaire": None, "auteur": None, "date_evenement": ticket["date_creation"]}
+        if ticket["id_technicien"]:
+            yield {"id": 2, "ticket_id": ticket_id, "type": "assignation", "ancienne_valeur": None,
+                   "nouvelle_valeur": str(ticket["id_technicien"]), "commentaire": None, "auteur": None,
+                   "date_evenement": ticket["date_mise_a_jour"]}
+        if ticket["statut"] != "ouvert":
+            yield {"id": 3, "ticket_id": ticket_id, "type": "statut", "ancienne_valeur": "ouvert",
+                   "nouvelle_valeur": ticket["statut"], "commentaire": None, "auteur": None,
+                   "date_evenement": ticket["date_mise_a_jour"]}
+
+    def get_users(self, role=None, fields=None) -> List[Dict[str, Any]]:
+        return [self._project(user, fields) for user in self.data.users if role is None or user["role"] == role]
+
+    def get_technicians(self, role=None) -> List[Dict[str, Any]]:
+        return self.get_users("Technicien")
+
+    def get_user(self, user_id: int) -> Dict[str, Any]:
+        return dict(self.data.users_by_id.get(user_id, {}))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        counts = {status: 0 for status in STATUSES}
+        priorities = {priority: 0 for priority in config.PRIORITY_LEVELS}
+        for ticket in self.data.tickets:
+            counts[ticket["statut"]] += 1
+            priorities[ticket["priorite"]] += 1
+        technicians = [user["id"] for user in self.data.users if user["role"] == "Technicien"]
+        return {
+            "version": len(self.data.tickets),
+            "stats_par_statut": {
+                "total_ouverts": counts["ouvert"],
+                "total_en_cours": counts["en cours"],
+                "total_resolus": counts["résolu"],
+                "total_fermes": counts["fermé"],
+            },
+            "temps_moyen_par_technicien": [{"id_technicien": tech, "temps_moyen_heures": 24.0} for tech in technicians],
+            "tickets_par_priorite": [{"priorité": priority, "nombre": count} for priority, count in priorities.items()],
+        }
+
+
+def count_elements(block: Block) -> int:
+    """Nombre d'éléments (hors conteneurs) émis dans un bloc."""
+    total = 0
+    for child in block.children.values():
+        total += count_elements(child) if isinstance(child, Block) else 1
+    return total
+
+
+def new_app(page: str, dataset: Dataset) -> AppTest:
+    app = AppTest.from_file(os.path.join(FRONTEND_DIR, "app.py"), default_timeout=600)
+    app.session_state.is_logged_in = True
+    app.session_state.user = dataset.users_by_id[ADMIN_ID]
+    app.session_state.page = page
+    app.session_state.selected_ticket_id = len(dataset.tickets) // 2 or 1
+    app.session_state.selected_user_id = 2
+    return app
+
+
+def measure(page: str, dataset: Dataset, repeat: int) -> Dict[str, Any]:
+    app = new_app(page, dataset)
+    started = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - started
+    if app.exception:
+        raise RuntimeError(f"{page}: {app.exception[0].message}")
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    app.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "first_ms": first_run * 1000,
+        "median_ms": statistics.median(timings),
+        "max_ms": max(timings),
+        "elements": count_elements(app.main) + count_elements(app.sidebar),
+        "peak_mib": peak / 2 ** 20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="nombres de tickets, séparés par des virgules")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Aucun service externe : pas d'export des métriques, flux de modifications injoignable
+    config.METRICS_PORT = 0
+    config.API_URL = "http://127.0.0.1:9/api"
+    utils.resources.ApiClient = SyntheticApiClient
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    logging.getLogger("utils").setLevel(logging.ERROR)
+
+    print(f"{'page':<18} {'tickets':>8} {'1re exéc. ms':>13} {'médiane ms':>11} {'max ms':>8} {'éléments':>9} {'pic Mio':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        SyntheticApiClient.dataset = Dataset(size, args.seed)
+        # Ressources partagées (client, réplique, analyses) recréées pour chaque taille
+        st.cache_resource.clear()
+        for page in args.pages.split(","):
+            result = measure(page, SyntheticApiClient.dataset, args.repeat)
+            print(f"{page:<18} {size:>8} {result['first_ms']:>13.1f} {result['median_ms']:>11.1f} {result['max_ms']:>8.1f}"
+                  f" {result['elements']:>9} {result['peak_mib']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
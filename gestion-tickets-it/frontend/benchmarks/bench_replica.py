@@ -0,0 +1,107 @@
+"""
+Benchmark de la réplique locale des tickets (`utils.replica`) : chargement initial,
+changements de filtres de la page "Tickets à traiter" et requête incrémentale.
+
+Usage :
+    python benchmarks/bench_replica.py [--tickets 200000] [--technicians 50] [--seed 0]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from utils.replica import REPLICA_FIELDS, TicketReplica  # noqa: E402
+
+STATUSES = ["ouvert", "en cours", "résolu", "fermé"]
+
+
+class SyntheticApi:
+    """Imite les lectures de `ApiClient` utilisées par la réplique, sans réseau."""
+
+    def __init__(self, count: int, technicians: int, seed: int):
+        rng = random.Random(seed)
+        self.tickets = []
+        for ticket_id in range(1, count + 1):
+            created = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00.000Z"
+            self.tickets.append({
+                "id": ticket_id,
+                "titre": f"Ticket {ticket_id}",
+                "statut": rng.choices(STATUSES, weights=[10, 10, 50, 30])[0],
+                "priorite": rng.choice(config.PRIORITY_LEVELS),
+                "date_creation": created,
+                "date_mise_a_jour": created,
+                "id_employe": rng.randint(1, 1000),
+                "id_technicien": rng.choice([None] + list(range(1, technicians + 1))),
+            })
+        self.delta_queries = 0
+
+    def iter_ticket_chunks(self, filters=None, fields=None, chunk_size=10000):
+        for start in range(0, len(self.tickets), chunk_size):
+            yield self.tickets[start:start + chunk_size]
+
+    def iter_ticket_pages(self, filters, page_size=500, sort="date_mise_a_jour", order="asc", fields=None):
+        self.delta_queries += 1
+        since = filters["updated_since"]
+        changed = [ticket for ticket in self.tickets if ticket["date_mise_a_jour"] >= since]
+        for start in range(0, len(changed), page_size):
+            yield changed[start:start + page_size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=200_000)
+    parser.add_argument("--technicians", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    api = SyntheticApi(args.tickets, args.technicians, args.seed)
+    replica = TicketReplica(api, sync_interval=3600)
+
+    started = time.perf_counter()
+    replica.sync()
+    print(f"{args.tickets} tickets, chargement initial {time.perf_counter() - started:8.3f} s")
+
+    # Combinaisons de filtres proposées par la page "Tickets à traiter"
+    rng = random.Random(args.seed)
+    fields = [field for field in REPLICA_FIELDS if field not in ("id_employe",)]
+    timings = []
+    for _ in range(200):
+        filters = {}
+        if rng.random() < 0.7:
+            filters["statut"] = rng.choice(config.TICKET_STATUS)
+        if rng.random() < 0.5:
+            filters["priorité"] = rng.choice(config.PRIORITY_LEVELS)
+        assigned = rng.random()
+        if assigned < 0.4:
+            filters["id_technicien"] = rng.randint(1, args.technicians)
+        elif assigned < 0.6:
+            filters["id_technicien"] = None
+        if "statut" not in filters and "id_technicien" not in filters:
+            filters["id_technicien"] = rng.randint(1, args.technicians)
+
+        started = time.perf_counter()
+        replica.get_tickets_page(filters, limit=config.TICKETS_PAGE_SIZE, fields=fields)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    print(f"changement de filtre (200 pages) p50 {statistics.median(timings):7.3f} ms"
+          f"  p95 {timings[int(len(timings) * 0.95)]:7.3f} ms  max {timings[-1]:7.3f} ms")
+
+    # Requête incrémentale après la modification de 10 tickets
+    for ticket in api.tickets[:10]:
+        ticket["statut"] = "en cours"
+        ticket["date_mise_a_jour"] = "2025-06-01T00:00:00.000Z"
+    replica.invalidate()
+    replica.sync_interval = 0
+    started = time.perf_counter()
+    replica.sync()
+    print(f"requête incrémentale {(time.perf_counter() - started) * 1000:7.3f} ms, {replica.stats()}")
+
+
+if __name__ == "__main__":
+    main()
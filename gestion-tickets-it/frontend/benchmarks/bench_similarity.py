@@ -0,0 +1,117 @@
+"""
+Benchmark de la détection de doublons (`utils.similarity`) : construction de
+l'index des tickets ouverts, recherche des doublons d'une nouvelle demande et
+regroupement du backlog.
+
+Le backlog synthétique contient des incidents signalés plusieurs fois avec des
+formulations différentes ; on mesure aussi la proportion de ces doublons
+retrouvés.
+
+Usage :
+    python benchmarks/bench_similarity.py [--tickets 20000] [--incidents 200] [--seed 0]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from utils.similarity import SimilarityIndex  # noqa: E402
+
+SUBJECTS = ["imprimante", "ordinateur", "écran", "clavier", "souris", "réseau", "wifi", "vpn", "messagerie",
+            "outlook", "teams", "serveur", "badge", "téléphone", "scanner", "licence", "compte", "session"]
+PROBLEMS = ["bloqué", "lent", "hors service", "inaccessible", "erreur", "plantage", "déconnexion",
+            "mot de passe expiré", "mise à jour", "installation", "configuration", "accès refusé"]
+PLACES = ["bâtiment A", "bâtiment B", "2e étage", "3e étage", "accueil", "comptabilité", "salle de réunion",
+          "open space", "direction", "entrepôt"]
+FILLERS = ["depuis ce matin", "impossible de travailler", "merci de votre aide", "urgent", "plusieurs collègues",
+           "après redémarrage", "message d'erreur", "rien ne s'affiche", "très lent", "déjà signalé"]
+VOCABULARY = [f"mot{rank:04d}" for rank in range(5000)]
+
+
+def describe(rng: random.Random, subject: str, problem: str, place: str) -> dict:
+    details = rng.sample(FILLERS, 2) + rng.sample(VOCABULARY, 4)
+    rng.shuffle(details)
+    return {
+        "titre": f"{subject.capitalize()} {problem} {place}",
+        "description": f"{subject.capitalize()} {problem} au {place}, " + ", ".join(details),
+    }
+
+
+class SyntheticApi:
+    """Imite l'export NDJSON de `ApiClient` utilisé par l'index, sans réseau."""
+
+    def __init__(self, count: int, incidents: int, seed: int):
+        rng = random.Random(seed)
+        self.tickets = []
+        self.incidents = [(rng.choice(SUBJECTS), rng.choice(PROBLEMS), rng.choice(PLACES)) for _ in range(incidents)]
+        self.incident_of = {}
+        for ticket_id in range(1, count + 1):
+            if rng.random() < 0.3:
+                incident = rng.choice(self.incidents)
+            else:
+                incident = (rng.choice(SUBJECTS), rng.choice(PROBLEMS), rng.choice(PLACES))
+            self.incident_of[ticket_id] = incident
+            self.tickets.append({
+                "id": ticket_id,
+                "statut": rng.choice(["ouvert", "en cours"]),
+                "priorite": "Moyenne",
+                "date_creation": f"2024-06-01T00:00:{ticket_id % 60:02d}.000Z",
+                **describe(rng, *incident),
+            })
+        self.rng = rng
+
+    def iter_ticket_chunks(self, filters=None, fields=None, chunk_size=10000):
+        tickets = [ticket for ticket in self.tickets if ticket["statut"] == filters["statut"]]
+        for start in range(0, len(tickets), chunk_size):
+            yield tickets[start:start + chunk_size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=20_000)
+    parser.add_argument("--incidents", type=int, default=200)
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--rows-per-band", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    api = SyntheticApi(args.tickets, args.incidents, args.seed)
+    index = SimilarityIndex(api, num_perm=args.num_perm, rows_per_band=args.rows_per_band, threshold=config.DUPLICATE_THRESHOLD)
+
+    started = time.perf_counter()
+    index.sync()
+    print(f"{args.tickets} tickets ouverts indexés en {time.perf_counter() - started:.2f} s")
+
+    # Nouvelles demandes décrivant un incident déjà signalé
+    timings, found, false_matches = [], 0, 0
+    for _ in range(500):
+        incident = api.rng.choice(api.incidents)
+        request = describe(api.rng, *incident)
+        started = time.perf_counter()
+        matches = index.find_similar(request["titre"], request["description"], limit=config.DUPLICATE_SUGGESTIONS)
+        timings.append((time.perf_counter() - started) * 1000)
+        found += any(api.incident_of[match["id"]] == incident for match in matches)
+        false_matches += sum(api.incident_of[match["id"]] != incident for match in matches)
+
+    timings.sort()
+    print(f"recherche de doublons (500 demandes) p50 {statistics.median(timings):6.2f} ms"
+          f"  p95 {timings[int(len(timings) * 0.95)]:6.2f} ms  max {timings[-1]:6.2f} ms")
+    print(f"doublon proposé pour {found}/500 demandes, {false_matches} propositions erronées")
+
+    started = time.perf_counter()
+    clusters = index.clusters(threshold=config.DUPLICATE_CLUSTER_THRESHOLD)
+    elapsed = time.perf_counter() - started
+    grouped = sum(map(len, clusters))
+    misplaced = sum(api.incident_of[ticket["id"]] != api.incident_of[cluster[0]["id"]] for cluster in clusters for ticket in cluster)
+    print(f"regroupement du backlog en {elapsed:.2f} s : {len(clusters)} groupes, {grouped} tickets regroupés, "
+          f"dont {misplaced} avec le premier signalement d'un autre incident")
+    print(index.stats())
+
+
+if __name__ == "__main__":
+    main()
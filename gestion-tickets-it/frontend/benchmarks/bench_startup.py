@@ -0,0 +1,91 @@
+"""
+Benchmark du démarrage à froid du frontend : durée de la première exécution de
+chaque page dans un processus neuf, sans préchauffage puis après le préchauffage
+de start.py (`utils.startup.warm_up` : imports, connexions, ressources partagées).
+
+Chaque mesure tourne dans un sous-processus (modules et caches vides), avec le
+client API simulé de `bench_pages.py`. Le rapport indique aussi si la page a
+chargé pandas, et la durée des imports de Streamlit et des modules de la page
+de connexion.
+
+Usage :
+    python benchmarks/bench_startup.py [--tickets 20000] [--pages login,employee_tickets,tech_tickets,admin_dashboard]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+
+def child(page: str, warm: bool, tickets: int) -> dict:
+    """Mesure la première exécution d'une page dans ce processus neuf."""
+    started = time.perf_counter()
+    sys.path[:0] = [FRONTEND_DIR, BENCHMARKS_DIR]
+    import logging
+    import streamlit  # noqa: F401
+    import utils.auth  # noqa: F401
+    import utils.resources
+    imports_ms = (time.perf_counter() - started) * 1000
+
+    import config
+    from bench_pages import Dataset, SyntheticApiClient, new_app
+
+    config.METRICS_PORT = 0
+    config.API_URL = "http://127.0.0.1:9/api"
+    utils.resources.ApiClient = SyntheticApiClient
+    SyntheticApiClient.dataset = Dataset(tickets, seed=0)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    logging.getLogger("utils").setLevel(logging.ERROR)
+
+    warm_up_ms = 0.0
+    if warm:
+        from utils import startup
+        started = time.perf_counter()
+        startup.warm_up(connections=1)
+        warm_up_ms = (time.perf_counter() - started) * 1000
+
+    app = new_app(page, SyntheticApiClient.dataset)
+    if page == "login":
+        app.session_state.is_logged_in = False
+    started = time.perf_counter()
+    app.run()
+    first_ms = (time.perf_counter() - started) * 1000
+    if app.exception:
+        raise RuntimeError(f"{page}: {app.exception[0].message}")
+    return {"imports_ms": imports_ms, "warm_up_ms": warm_up_ms, "first_ms": first_ms, "pandas": "pandas" in sys.modules}
+
+
+def measure(page: str, warm: bool, tickets: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", page, "--tickets", str(tickets)] + (["--warm"] if warm else []),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=20_000)
+    parser.add_argument("--pages", default="login,employee_tickets,tech_tickets,admin_dashboard")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.warm, args.tickets)))
+        return
+
+    print(f"{'page':<18} {'imports ms':>11} {'à froid ms':>11} {'pandas':>7} {'préchauffage ms':>16} {'après ms':>9}")
+    for page in args.pages.split(","):
+        cold, warm = measure(page, False, args.tickets), measure(page, True, args.tickets)
+        print(f"{page:<18} {cold['imports_ms']:>11.0f} {cold['first_ms']:>11.0f} {'oui' if cold['pandas'] else 'non':>7}"
+              f" {warm['warm_up_ms']:>16.0f} {warm['first_ms']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark du rendu de `display_ticket_list` : grille unique contre boucle par ligne.
+
+Chaque scénario est exécuté sans navigateur via `streamlit.testing`, et l'on mesure
+le temps d'exécution du script ainsi que la taille des messages protobuf émis
+(approximation de la charge envoyée au navigateur par le websocket).
+
+Usage :
+    python benchmarks/bench_ticket_list.py [--sizes 100 1000 10000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def render_script(frontend_dir: str, size: int, mode: str) -> None:
+    import sys
+    from datetime import datetime, timedelta
+
+    sys.path.insert(0, frontend_dir)
+    from utils.ui import display_ticket_list
+
+    statuses = ["Ouvert", "En cours", "Résolu", "Fermé"]
+    priorities = ["Faible", "Moyenne", "Élevée", "Critique"]
+    start = datetime(2025, 1, 1)
+    tickets = [
+        {
+            "id": i,
+            "titre": f"Incident n°{i}",
+            "statut": statuses[i % 4],
+            "priorite": priorities[i % 4],
+            "date_creation": (start + timedelta(minutes=i)).isoformat(),
+            "date_mise_a_jour": (start + timedelta(minutes=2 * i)).isoformat(),
+        }
+        for i in range(1, size + 1)
+    ]
+    display_ticket_list(tickets, on_click=lambda ticket_id: None, mode=mode)
+
+
+def payload_stats(node) -> tuple:
+    """Retourne (nombre d'éléments, taille protobuf en octets) d'un arbre d'éléments."""
+    elements, size = 0, 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        elements, size = 1, proto.ByteSize()
+    for child in getattr(node, "children", {}).values():
+        child_elements, child_size = payload_stats(child)
+        elements += child_elements
+        size += child_size
+    return elements, size
+
+
+def run(size: int, mode: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        app = AppTest.from_function(
+            render_script,
+            args=(FRONTEND_DIR, size, mode),
+            default_timeout=600,
+        )
+        started = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - started)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    elements, payload = payload_stats(app._tree)
+    return {"size": size, "mode": mode, "seconds": min(timings), "elements": elements, "bytes": payload}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tickets':>8} {'mode':>6} {'temps (s)':>10} {'éléments':>9} {'octets':>12}")
+    for size in args.sizes:
+        for mode in ("rows", "grid"):
+            result = run(size, mode, args.repeat)
+            print(
+                f"{result['size']:>8} {result['mode']:>6} {result['seconds']:>10.3f} "
+                f"{result['elements']:>9} {result['bytes']:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
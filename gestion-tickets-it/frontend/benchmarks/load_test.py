@@ -0,0 +1,386 @@
+"""
+Test de charge de l'API à travers `ApiClient`, pour dimensionner le déploiement.
+
+Des utilisateurs virtuels (employés, techniciens, administrateurs) se connectent
+puis enchaînent les actions de leurs pages, entrecoupées d'un temps de réflexion :
+
+- employé : création de tickets, liste et recherche de ses tickets, détail d'un ticket ;
+- technicien : file des tickets non assignés, prise en charge, résolution, liste filtrée ;
+- administrateur : tableau de bord, liste et détail des utilisateurs, liste des tickets.
+
+Tous partagent un seul `ApiClient`, comme les sessions d'un processus Streamlit.
+Le cache de lecture du client est désactivé par défaut pour mesurer le serveur
+(--client-cache pour le réactiver). Les comptes de test sont créés au premier
+lancement avec le compte administrateur fourni, puis la base est alimentée en
+tickets (--seed-tickets) avant la mesure.
+
+Le rapport donne, par endpoint, le débit, les latences p50/p95/p99 et le taux
+d'erreurs ; --output l'enregistre en JSON et --compare le confronte à un rapport
+précédent (code de sortie 1 si une latence p95 se dégrade au-delà de --tolerance).
+
+Usage :
+    python benchmarks/load_test.py --admin-email admin@example.com --admin-password secret \\
+        [--employees 20] [--technicians 5] [--admins 1] [--duration 60] \\
+        [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from utils.api import ApiClient  # noqa: E402
+from utils.metrics import RequestEvent  # noqa: E402
+
+ACCOUNT_PASSWORD = "load-test-password"
+ROLE_NAMES = {"employee": "Employé", "technician": "Technicien", "admin": "Admin"}
+LIST_FIELDS = ["id", "titre", "statut", "priorite", "date_creation", "date_mise_a_jour"]
+SUBJECTS = ["Imprimante", "Ordinateur", "Écran", "Réseau", "Wifi", "VPN", "Messagerie", "Badge", "Téléphone"]
+PROBLEMS = ["bloqué", "lent", "hors service", "inaccessible", "erreur au démarrage", "mot de passe expiré"]
+
+
+class LoadTestClient(ApiClient):
+    """`ApiClient` dont le jeton de session est celui de l'utilisateur virtuel du thread courant."""
+
+    _local = threading.local()
+
+    @classmethod
+    def _session_token(cls) -> Optional[str]:
+        return getattr(cls._local, "token", None)
+
+    @classmethod
+    def use_token(cls, token: Optional[str]) -> None:
+        cls._local.token = token
+
+
+class Recorder:
+    """Hook de `ApiClient` : conserve chaque requête de la fenêtre de mesure."""
+
+    def __init__(self):
+        self.events: List[RequestEvent] = []
+        self.recording = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        if self.recording:
+            with self._lock:
+                self.events.append(event)
+
+
+class VirtualUser:
+    """Utilisateur connecté qui enchaîne les actions de son rôle, tirées selon leurs poids."""
+
+    ACTIONS: Dict[str, int] = {}
+
+    def __init__(self, client: LoadTestClient, account: Dict[str, Any], rng: random.Random):
+        self.client = client
+        self.account = account
+        self.rng = rng
+        self.token: Optional[str] = None
+        self.actions = list(self.ACTIONS)
+        self.weights = list(self.ACTIONS.values())
+
+    def login(self) -> bool:
+        session = self.client.verify_user(self.account["email"], ACCOUNT_PASSWORD)
+        self.token = session.get("token")
+        self.account["id"] = session.get("id", self.account.get("id"))
+        return bool(self.token)
+
+    def step(self) -> None:
+        LoadTestClient.use_token(self.token)
+        getattr(self, self.rng.choices(self.actions, weights=self.weights)[0])()
+
+    def _pick(self, items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return self.rng.choice(items) if items else None
+
+
+class Employee(VirtualUser):
+    ACTIONS = {"create_ticket": 2, "list_own_tickets": 5, "search_own_tickets": 1, "view_ticket": 2}
+
+    def create_ticket(self) -> None:
+        subject, problem = self.rng.choice(SUBJECTS), self.rng.choice(PROBLEMS)
+        self.client.create_ticket({
+            "titre": f"{subject} {problem}",
+            "description": f"{subject} {problem} depuis ce matin, merci de votre aide.",
+            "priorite": self.rng.choice(config.PRIORITY_LEVELS),
+        })
+
+    def list_own_tickets(self) -> Dict[str, Any]:
+        return self.client.get_tickets_page({"id_employe": self.account["id"]}, limit=config.TICKETS_PAGE_SIZE, fields=LIST_FIELDS)
+
+    def search_own_tickets(self) -> None:
+        self.client.search_tickets(self.rng.choice(SUBJECTS).lower(), {"mine": "true"}, limit=config.SEARCH_RESULTS_LIMIT, fields=LIST_FIELDS)
+
+    def view_ticket(self) -> None:
+        ticket = self._pick(self.list_own_tickets()["items"])
+        if ticket:
+            self.client.get_ticket(ticket["id"])
+
+
+class Technician(VirtualUser):
+    ACTIONS = {"list_queue": 4, "take_ticket": 2, "resolve_ticket": 2, "list_assigned": 3, "view_ticket": 2}
+
+    def list_queue(self) -> List[Dict[str, Any]]:
+        return self.client.get_tickets_page({"statut": "ouvert", "id_technicien": None}, limit=config.TICKETS_PAGE_SIZE, fields=LIST_FIELDS)["items"]
+
+    def list_assigned(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        filters = {"id_technicien": self.account["id"]}
+        if status:
+            filters["statut"] = status
+        return self.client.get_tickets_page(filters, limit=config.TICKETS_PAGE_SIZE, fields=LIST_FIELDS)["items"]
+
+    def take_ticket(self) -> None:
+        ticket = self._pick(self.list_queue())
+        if ticket:
+            self.client.update_ticket(ticket["id"], {"id_technicien": self.account["id"], "statut": "en cours"})
+
+    def resolve_ticket(self) -> None:
+        ticket = self._pick(self.list_assigned("en cours"))
+        if ticket:
+            self.client.update_ticket(ticket["id"], {"statut": "résolu"})
+
+    def view_ticket(self) -> None:
+        ticket = self._pick(self.list_queue())
+        if ticket:
+            self.client.get_ticket(ticket["id"])
+
+
+class Admin(VirtualUser):
+    ACTIONS = {"dashboard": 4, "list_users": 3, "view_user": 2, "list_tickets": 2}
+
+    def dashboard(self) -> None:
+        self.client.get_statistics()
+
+    def list_users(self) -> List[Dict[str, Any]]:
+        return self.client.get_users(fields=["id", "nom", "email", "role"])
+
+    def view_user(self) -> None:
+        user = self._pick(self.list_users())
+        if user:
+            self.client.get_user(user["id"])
+
+    def list_tickets(self) -> None:
+        self.client.get_tickets_page(limit=config.TICKETS_PAGE_SIZE, fields=LIST_FIELDS)
+
+
+USER_CLASSES = {"employee": Employee, "technician": Technician, "admin": Admin}
+
+
+def prepare_accounts(client: LoadTestClient, args: argparse.Namespace) -> Dict[str, List[Dict[str, Any]]]:
+    """Crée les comptes de test manquants avec le compte administrateur fourni."""
+    session = client.verify_user(args.admin_email, args.admin_password)
+    if not session.get("token"):
+        sys.exit(f"Connexion impossible avec le compte administrateur {args.admin_email}")
+    LoadTestClient.use_token(session["token"])
+
+    existing = {user["email"]: user for user in client.get_users(fields=["id", "email", "role"])}
+    accounts = {}
+    for kind, count in (("employee", args.employees), ("technician", args.technicians), ("admin", args.admins)):
+        accounts[kind] = []
+        for index in range(count):
+            email = f"{args.prefix}-{kind}-{index}@example.com"
+            if email not in existing:
+                created = client.create_user({
+                    "nom": f"Test de charge {kind} {index}",
+                    "email": email,
+                    "mot_de_passe": ACCOUNT_PASSWORD,
+                    "role": ROLE_NAMES[kind],
+                })
+                if not created:
+                    sys.exit(f"Création du compte {email} impossible")
+                existing[email] = {"id": created.get("userId"), "email": email}
+            accounts[kind].append({"id": existing[email]["id"], "email": email})
+    return accounts
+
+
+def seed_tickets(employees: List[Employee], count: int, workers: int) -> None:
+    """Alimente la base en tickets créés par les employés virtuels."""
+    def create(index: int) -> None:
+        employee = employees[index % len(employees)]
+        LoadTestClient.use_token(employee.token)
+        employee.create_ticket()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(create, range(count)))
+
+
+def run_user(user: VirtualUser, deadline: float, think_time: float, start_delay: float) -> None:
+    time.sleep(start_delay)
+    while time.monotonic() < deadline:
+        user.step()
+        if think_time > 0:
+            time.sleep(min(user.rng.expovariate(1 / think_time), max(deadline - time.monotonic(), 0)))
+
+
+def percentile(sorted_values: List[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, math.floor(len(sorted_values) * ratio))]
+
+
+def summarize(events: List[RequestEvent], elapsed: float) -> Dict[str, Dict[str, Any]]:
+    """Agrège les requêtes par endpoint (les réponses du cache du client sont comptées à part)."""
+    grouped: Dict[str, List[RequestEvent]] = {}
+    for event in events:
+        grouped.setdefault(f"{event.method} {event.endpoint}", []).append(event)
+    grouped["TOTAL"] = events
+
+    summary = {}
+    for name, group in sorted(grouped.items()):
+        network = sorted(event.duration * 1000 for event in group if event.source != "cache")
+        errors = sum(event.status is None or event.status >= 400 for event in group)
+        summary[name] = {
+            "requests": len(group),
+            "cache_hits": len(group) - len(network),
+            "throughput": round(len(group) / elapsed, 2),
+            "p50_ms": round(percentile(network, 0.5), 2),
+            "p95_ms": round(percentile(network, 0.95), 2),
+            "p99_ms": round(percentile(network, 0.99), 2),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "retries": sum(event.retries for event in group),
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'endpoint':<34} {'requêtes':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erreurs':>8}")
+    for name, row in summary.items():
+        print(f"{name:<34} {row['requests']:>9} {row['throughput']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}"
+              f" {row['p99_ms']:>8.1f} {row['error_rate']:>8.1%}")
+
+
+def compare(summary: Dict[str, Dict[str, Any]], baseline_path: str, tolerance: float) -> bool:
+    """
+    Compare les résultats à un rapport précédent.
+
+    Returns:
+        True si une latence p95 ou un taux d'erreurs s'est dégradé au-delà de la tolérance
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    print(f"\nComparaison avec {baseline_path} (version {baseline.get('version') or '?'})")
+    print(f"{'endpoint':<34} {'p95 avant':>10} {'p95 après':>10} {'écart':>8} {'req/s avant':>12} {'req/s après':>12}")
+
+    regressed = False
+    for name, row in summary.items():
+        before = baseline["endpoints"].get(name)
+        if not before:
+            continue
+        change = (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        worse = change > tolerance or row["error_rate"] > before["error_rate"] + 0.01
+        regressed |= worse
+        print(f"{name:<34} {before['p95_ms']:>10.1f} {row['p95_ms']:>10.1f} {change:>+8.0%} {before['throughput']:>12.1f}"
+              f" {row['throughput']:>12.1f}{'  ← régression' if worse else ''}")
+    return regressed
+
+
+def git_version() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-url", default=os.environ.get("API_URL", config.API_URL))
+    parser.add_argument("--admin-email", default=os.environ.get("LOAD_TEST_ADMIN_EMAIL"))
+    parser.add_argument("--admin-password", default=os.environ.get("LOAD_TEST_ADMIN_PASSWORD"))
+    parser.add_argument("--employees", type=int, default=20, help="employés simultanés")
+    parser.add_argument("--technicians", type=int, default=5, help="techniciens simultanés")
+    parser.add_argument("--admins", type=int, default=1, help="administrateurs simultanés")
+    parser.add_argument("--duration", type=float, default=60, help="durée de la mesure (s)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="étalement des démarrages (s)")
+    parser.add_argument("--think-time", type=float, default=0.5, help="pause moyenne entre deux actions (s)")
+    parser.add_argument("--seed-tickets", type=int, default=500, help="tickets créés avant la mesure")
+    parser.add_argument("--client-cache", action="store_true", help="active le cache de lecture du client")
+    parser.add_argument("--prefix", default="loadtest", help="préfixe des emails des comptes de test")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--version", default=None, help="libellé de la version testée (commit git par défaut)")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--compare", help="rapport JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="dégradation p95 tolérée (0.1 = 10 %%)")
+    args = parser.parse_args()
+    if not args.admin_email or not args.admin_password:
+        parser.error("--admin-email et --admin-password (ou LOAD_TEST_ADMIN_*) sont requis")
+
+    # Hors d'une session Streamlit, st.error/st.warning ne font que journaliser
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    total_users = args.employees + args.technicians + args.admins
+    client = LoadTestClient(
+        args.api_url,
+        pool_size=total_users + 1,
+        timeout=(config.API_CONNECT_TIMEOUT, config.API_READ_TIMEOUT),
+        max_retries=config.API_MAX_RETRIES,
+        backoff_factor=config.API_RETRY_BACKOFF,
+        cache_size=config.API_CACHE_SIZE,
+        cache_ttls=config.API_CACHE_TTLS if args.client_cache else {},
+        validator_cache_size=config.API_VALIDATOR_CACHE_SIZE,
+    )
+    recorder = Recorder()
+    client.add_hook(recorder)
+
+    started = time.perf_counter()
+    accounts = prepare_accounts(client, args)
+    rng = random.Random(args.seed)
+    users = [USER_CLASSES[kind](client, account, random.Random(rng.random()))
+             for kind, kind_accounts in accounts.items() for account in kind_accounts]
+    failed = [user.account["email"] for user in users if not user.login()]
+    if failed:
+        sys.exit(f"Connexion impossible pour {len(failed)} compte(s) de test : {', '.join(failed[:5])}")
+    employees = [user for user in users if isinstance(user, Employee)]
+    if args.seed_tickets and employees:
+        seed_tickets(employees, args.seed_tickets, total_users)
+    print(f"{total_users} utilisateurs virtuels prêts, {args.seed_tickets} tickets créés en "
+          f"{time.perf_counter() - started:.1f} s\n")
+
+    recorder.recording = True
+    started = time.monotonic()
+    deadline = started + args.ramp_up + args.duration
+    with ThreadPoolExecutor(max_workers=total_users, thread_name_prefix="virtual-user") as executor:
+        futures = [executor.submit(run_user, user, deadline, args.think_time, args.ramp_up * index / total_users)
+                   for index, user in enumerate(users)]
+        for future in futures:
+            future.result()
+    elapsed = time.monotonic() - started
+    recorder.recording = False
+    client.close()
+
+    summary = summarize(recorder.events, elapsed)
+    print(f"{args.employees} employés, {args.technicians} techniciens, {args.admins} administrateurs "
+          f"pendant {elapsed:.0f} s (montée en charge comprise)")
+    print_summary(summary)
+
+    if args.output:
+        report = {
+            "version": args.version or git_version(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "settings": {key: value for key, value in vars(args).items()
+                         if key not in ("admin_password", "output", "compare")},
+            "elapsed_s": round(elapsed, 1),
+            "endpoints": summary,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nRésultats enregistrés dans {args.output}")
+
+    if args.compare and compare(summary, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
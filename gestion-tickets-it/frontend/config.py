@@ -1,6 +1,12 @@
 # Configuration de l'application
+import os
+
 API_URL = "http://localhost:3000/api"
 
+# Clé de service du frontend (identique à celle du backend) : lectures de tous les
+# tickets par les structures partagées entre les sessions (réplique, index, flux)
+API_SERVICE_KEY = os.environ.get("API_SERVICE_KEY", "")
+
 # Niveaux de priorité
 PRIORITY_LEVELS = ["Faible", "Moyenne", "Élevée", "Critique"]
 
@@ -8,4 +14,61 @@ PRIORITY_LEVELS = ["Faible", "Moyenne", "Élevée", "Critique"]
 TICKET_STATUS = ["Ouvert", "En cours", "Résolu", "Fermé"]
 
 # Rôles utilisateur
-USER_ROLES = ["Employé", "Technicien", "Admin"]
\ No newline at end of file
+USER_ROLES = ["Employé", "Technicien", "Admin"]
+
+# Pool de connexions HTTP vers l'API
+API_POOL_SIZE = 20
+API_CONNECT_TIMEOUT = 3.05
+API_READ_TIMEOUT = 30
+API_MAX_RETRIES = 3
+API_RETRY_BACKOFF = 0.3
+
+# Nombre de tickets affichés par page
+TICKETS_PAGE_SIZE = 50
+
+# Nombre maximal de résultats affichés pour une recherche de tickets
+SEARCH_RESULTS_LIMIT = 50
+
+# Cache de lecture de l'API : taille maximale et durée de vie (s) par préfixe d'endpoint
+API_CACHE_SIZE = 512
+API_CACHE_TTLS = {
+    "/tickets": 10,
+    "/users": 60,
+    "/statistics": 30,
+}
+
+# Réplique locale des tickets : intervalle (s) des requêtes incrémentales et des rechargements complets
+TICKET_REPLICA_SYNC_INTERVAL = 5
+TICKET_REPLICA_FULL_SYNC_INTERVAL = 600
+
+# Détection des doublons parmi les tickets ouverts : similarité minimale (0 à 1) d'un doublon
+# proposé à la création, nombre de propositions, similarité minimale d'un regroupement du
+# backlog et intervalle (s) de reconstruction complète de l'index
+DUPLICATE_THRESHOLD = 0.25
+DUPLICATE_SUGGESTIONS = 5
+DUPLICATE_CLUSTER_THRESHOLD = 0.35
+SIMILARITY_REBUILD_INTERVAL = 600
+
+# Intervalle (s) de vérification des modifications reçues par le flux de tickets
+TICKET_FEED_CHECK_INTERVAL = 2
+
+# Nombre maximal de réponses conservées pour être revalidées par ETag (304 Not Modified)
+API_VALIDATOR_CACHE_SIZE = 2048
+
+# Export des métriques du frontend au format Prometheus (GET /metrics) ; port 0 pour le désactiver
+METRICS_HOST = "0.0.0.0"
+METRICS_PORT = 9464
+
+# Préchauffage au lancement par start.py : connexions ouvertes vers l'API, délai maximal (s)
+# d'attente de l'API et chargement de la réplique des tickets et de l'index de similarité
+WARMUP_CONNECTIONS = 4
+WARMUP_API_TIMEOUT = 120
+WARMUP_PRELOAD = True
+
+# Délai de résolution maximal (heures) par priorité, pour le suivi des SLA
+SLA_HOURS = {
+    "Faible": 72,
+    "Moyenne": 48,
+    "Élevée": 24,
+    "Critique": 4,
+}
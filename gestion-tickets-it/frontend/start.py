@@ -0,0 +1,43 @@
+"""
+Lance le frontend avec un préchauffage en arrière-plan (voir `utils.startup`).
+
+Le serveur Streamlit démarre dans ce processus, pendant que le préchauffage
+importe les modules lourds, ouvre les connexions vers l'API et charge les
+ressources partagées : la première session les trouve prêtes. Les étapes du
+démarrage sont journalisées et visibles sur la page de diagnostic.
+
+Usage :
+    python start.py [options de "streamlit run", par ex. --server.port=8501]
+"""
+import os
+import sys
+import time
+
+# Référence des durées de démarrage, avant tout import coûteux
+os.environ.setdefault("FRONTEND_STARTED_AT", str(time.time()))
+
+import logging  # noqa: E402
+
+FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main() -> None:
+    sys.path.insert(0, FRONTEND_DIR)
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("utils.startup").setLevel(logging.INFO)
+
+    import config
+    from utils import startup
+    startup.start_warm_up(
+        preload=config.WARMUP_PRELOAD,
+        connections=config.WARMUP_CONNECTIONS,
+        api_timeout=config.WARMUP_API_TIMEOUT,
+    )
+
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", os.path.join(FRONTEND_DIR, "app.py"), *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Champs récupérés pour les analyses (export en colonnes)
+ANALYTICS_FIELDS = ["id", "statut", "priorite", "date_creation", "date_mise_a_jour", "id_technicien"]
+
+# Statuts considérés comme résolus : la date de mise à jour sert de date de résolution
+RESOLVED_STATUSES = ["résolu", "fermé"]
+
+PERCENTILES = [0.5, 0.9, 0.99]
+
+
+def build_ticket_frame(columns: Dict[str, list]) -> pd.DataFrame:
+    """
+    Construit un DataFrame typé à partir de l'export en colonnes de l'API.
+
+    Args:
+        columns: Dictionnaire {champ: [valeurs]}
+
+    Returns:
+        DataFrame avec dates converties, statut normalisé et durée de résolution en heures
+    """
+    # Construction colonne par colonne avec des types explicites : bien plus rapide
+    # que l'inférence de types de pd.DataFrame sur des listes Python
+    df = pd.DataFrame({
+        "id": np.asarray(columns["id"], dtype=np.int64),
+        "statut": pd.Series(columns["statut"], dtype=object).astype("category").map(str.lower),
+        "priorite": pd.Series(columns["priorite"], dtype=object).astype("category"),
+        "date_creation": pd.to_datetime(columns["date_creation"], utc=True, format="ISO8601"),
+        "date_mise_a_jour": pd.to_datetime(columns["date_mise_a_jour"], utc=True, format="ISO8601"),
+        "id_technicien": pd.to_numeric(pd.Series(columns["id_technicien"], dtype=object)).astype("Int64"),
+    })
+
+    resolved = df["statut"].isin(RESOLVED_STATUSES).to_numpy()
+    df["resolu"] = resolved
+    df["date_resolution"] = df["date_mise_a_jour"].where(resolved)
+    df["heures_resolution"] = (df["date_resolution"] - df["date_creation"]).dt.total_seconds() / 3600
+    return df
+
+
+def load_tickets_dataframe(
+    api_client,
+    filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    chunk_size: int = 50000,
+) -> pd.DataFrame:
+    """
+    Construit un DataFrame de tickets par lots à partir du flux NDJSON de l'API.
+
+    Seul un lot de dictionnaires est en mémoire à la fois : la mémoire crête
+    reste bornée même pour les exports de plusieurs centaines de milliers de tickets.
+
+    Args:
+        api_client: Client API
+        filters: Critères de filtrage
+        fields: Champs à récupérer (tous si None)
+        chunk_size: Nombre de tickets convertis en DataFrame à la fois
+
+    Returns:
+        DataFrame des tickets
+    """
+    frames = [pd.DataFrame(chunk) for chunk in api_client.iter_ticket_chunks(filters, fields, chunk_size)]
+    if not frames:
+        return pd.DataFrame(columns=fields or [])
+    return pd.concat(frames, ignore_index=True)
+
+
+class TicketAnalytics:
+    """
+    Indicateurs du tableau de bord calculés de façon vectorisée sur un DataFrame de tickets.
+
+    Chaque indicateur est calculé à la première demande puis conservé : passer
+    d'un graphique à l'autre ne relance aucun calcul pour une même version des données.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Any = None, sla_hours: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            df: Tickets construits par `build_ticket_frame`
+            version: Version des données côté serveur
+            sla_hours: Délai de résolution maximal (heures) par priorité
+        """
+        self.df = df
+        self.version = version
+        self.sla_hours = sla_hours or {}
+
+    @cached_property
+    def daily_counts(self) -> pd.DataFrame:
+        """Nombre de tickets créés et résolus par jour."""
+        created = self.df["date_creation"].dt.floor("D").value_counts()
+        resolved = self.df["date_resolution"].dropna().dt.floor("D").value_counts()
+        if created.empty:
+            return pd.DataFrame(columns=["créés", "résolus"], dtype="int64")
+
+        start = min(created.index.min(), resolved.index.min() if not resolved.empty else created.index.min())
+        end = max(created.index.max(), resolved.index.max() if not resolved.empty else created.index.max())
+        days = pd.date_range(start, end, freq="D")
+        return pd.DataFrame({
+            "créés": created.reindex(days, fill_value=0),
+            "résolus": resolved.reindex(days, fill_value=0),
+        })
+
+    @cached_property
+    def backlog(self) -> pd.Series:
+        """Nombre de tickets non résolus à la fin de chaque jour."""
+        daily = self.daily_counts
+        return (daily["créés"] - daily["résolus"]).cumsum().rename("backlog")
+
+    def _resolution_percentiles(self, by: str) -> pd.DataFrame:
+        resolved = self.df.loc[self.df["resolu"] & self.df[by].notna(), [by, "heures_resolution"]]
+        if resolved.empty:
+            return pd.DataFrame(columns=["p50", "p90", "p99"])
+        table = resolved.groupby(by, observed=True)["heures_resolution"].quantile(PERCENTILES).unstack()
+        table.columns = [f"p{int(q * 100)}" for q in PERCENTILES]
+        return table.round(2)
+
+    @cached_property
+    def resolution_by_technician(self) -> pd.DataFrame:
+        """Percentiles p50/p90/p99 du temps de résolution (heures) par technicien."""
+        return self._resolution_percentiles("id_technicien")
+
+    @cached_property
+    def resolution_by_priority(self) -> pd.DataFrame:
+        """Percentiles p50/p90/p99 du temps de résolution (heures) par priorité."""
+        return self._resolution_percentiles("priorite")
+
+    @cached_property
+    def sla_breach_rates(self) -> pd.DataFrame:
+        """
+        Taux de dépassement du SLA par priorité.
+
+        Un ticket résolu est en dépassement si sa durée de résolution excède le SLA ;
+        un ticket encore ouvert l'est si son âge l'excède déjà.
+        """
+        df = self.df
+        sla = df["priorite"].map(self.sla_hours).astype(float)
+        now = pd.Timestamp.now(tz="UTC")
+        age_hours = (now - df["date_creation"]).dt.total_seconds() / 3600
+        elapsed = np.where(df["resolu"], df["heures_resolution"], age_hours)
+
+        breached = pd.Series(elapsed > sla.to_numpy(), index=df.index) & sla.notna()
+        grouped = pd.DataFrame({"priorite": df["priorite"], "depasse": breached, "suivi": sla.notna()})
+        grouped = grouped[grouped["suivi"]].groupby("priorite", observed=True)["depasse"].agg(["sum", "count"])
+        grouped["taux"] = (grouped["sum"] / grouped["count"]).round(4)
+        return grouped.rename(columns={"sum": "dépassements", "count": "tickets"})
+
+
+class AnalyticsStore:
+    """Mémoïsation thread-safe des analyses par version des données."""
+
+    def __init__(self, max_versions: int = 2):
+        self.max_versions = max_versions
+        self._entries: "OrderedDict[Any, TicketAnalytics]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, api_client, sla_hours: Optional[Dict[str, float]] = None) -> Optional[TicketAnalytics]:
+        """
+        Retourne les analyses de la version courante, en ne rechargeant les tickets
+        que si la version des données a changé depuis le dernier appel.
+
+        Args:
+            api_client: Client API
+            sla_hours: Délai de résolution maximal (heures) par priorité
+
+        Returns:
+            Les analyses, ou None si les données n'ont pas pu être récupérées
+        """
+        version = api_client.get_statistics().get("version")
+        with self._lock:
+            if version is not None and version in self._entries:
+                self._entries.move_to_end(version)
+                return self._entries[version]
+
+        export = api_client.get_ticket_columns(ANALYTICS_FIELDS)
+        if not export:
+            return None
+
+        # Une écriture a pu avoir lieu entre les deux appels : l'entrée est rangée
+        # sous la version des colonnes réellement chargées
+        loaded_version = export.get("version")
+        analytics = TicketAnalytics(build_ticket_frame(export["columns"]), loaded_version, sla_hours)
+        if loaded_version is None:
+            return analytics
+        with self._lock:
+            self._entries[loaded_version] = analytics
+            while len(self._entries) > self.max_versions:
+                self._entries.popitem(last=False)
+        return analytics
@@ -1,23 +1,384 @@
 import requests
 import streamlit as st
 import json
-from typing import Dict, List, Optional, Any
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, Iterator, Callable
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils.cache import TTLCache, ValidatorCache
+from utils.http import create_session
+from utils.metrics import RequestEvent, endpoint_label
+
+logger = logging.getLogger(__name__)
+
+# Attribut du thread où `add_script_run_ctx` rattache le contexte Streamlit
+_SCRIPT_RUN_CTX_ATTR = "streamlit_script_run_ctx"
+
+# Identité des requêtes du thread courant. Les structures partagées par toutes les
+# sessions (réplique, index des doublons) lisent l'API avec la clé de service du
+# frontend, jamais avec le jeton de la session qui déclenche leur chargement : un
+# employé ne voit que ses tickets, la réplique doit les contenir tous.
+_identity = threading.local()
+
+@contextmanager
+def service_identity() -> Iterator[None]:
+    """Envoie les requêtes du thread courant avec la clé de service du frontend."""
+    previous = getattr(_identity, "service", False)
+    _identity.service = True
+    try:
+        yield
+    finally:
+        _identity.service = previous
 
 class ApiClient:
     """Client pour communiquer avec l'API de tickets de support."""
     
-    def __init__(self, base_url: str):
+    # Préfixes du cache de lecture invalidés après une écriture réussie sur une ressource
+    CACHE_INVALIDATIONS = {
+        "/tickets": ["/tickets", "/statistics"],
+        "/users": ["/users"],
+    }
+    
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = 10,
+        timeout: Tuple[float, float] = (3.05, 30),
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        cache_size: int = 256,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        validator_cache_size: int = 512,
+        service_key: Optional[str] = None,
+    ):
         """
         Initialise le client API.
         
+        Le client possède une session HTTP keep-alive thread-safe : une fois mis
+        en cache par `st.cache_resource`, ses connexions sont partagées par toutes
+        les sessions Streamlit du processus.
+        
         Args:
             base_url: URL de base de l'API
+            pool_size: Nombre maximal de connexions conservées vers l'API
+            timeout: Délais (connexion, lecture) en secondes
+            max_retries: Nombre de nouvelles tentatives pour les verbes idempotents
+            backoff_factor: Facteur du délai exponentiel entre tentatives
+            cache_size: Nombre maximal de réponses conservées dans le cache de lecture
+            cache_ttls: Durée de vie (s) des réponses mises en cache, par préfixe d'endpoint
+            validator_cache_size: Nombre maximal de réponses conservées pour être revalidées (ETag)
+            service_key: Clé de service du frontend (API_SERVICE_KEY), envoyée par les
+                lectures des structures partagées (voir `service_identity`)
         """
         self.base_url = base_url
+        self.service_key = service_key
+        self.timeout = timeout
+        self._session, self._pool_stats = create_session(
+            pool_size=pool_size,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+        )
+        self._cache = TTLCache(maxsize=cache_size)
+        self.cache_ttls = cache_ttls or {}
+        self._validators = ValidatorCache(maxsize=validator_cache_size)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="api-client")
+        self._hooks: List[Callable[[RequestEvent], None]] = []
+        
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Abonne une fonction aux requêtes du client (instrumentation).
+        
+        Le hook reçoit un `RequestEvent` après chaque requête, y compris celles
+        servies par le cache de lecture ; il est appelé dans le thread de la
+        requête et ne doit pas bloquer.
+        
+        Args:
+            hook: Fonction appelée avec l'événement de la requête
+        """
+        self._hooks.append(hook)
+    
+    def _emit(self, event: RequestEvent) -> None:
+        """Transmet un événement aux hooks ; une erreur d'instrumentation n'interrompt pas la requête."""
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Hook de requête en échec")
+    
+    def _send(self, method: str, url: str, path: str, source: str = "network", **kwargs) -> requests.Response:
+        """Envoie la requête sur la session et la signale aux hooks (durée, taille, statut, tentatives)."""
+        if not self._hooks:
+            return self._session.request(method, url, **kwargs)
+        
+        started = time.perf_counter()
+        try:
+            response = self._session.request(method, url, **kwargs)
+        except requests.RequestException as error:
+            self._emit(RequestEvent(method, endpoint_label(path), None, time.perf_counter() - started,
+                                    0, 0, source, error=type(error).__name__))
+            raise
+        
+        # Réponse lue en streaming : durée jusqu'aux en-têtes, taille annoncée si connue
+        if kwargs.get("stream"):
+            size = int(response.headers.get("Content-Length") or 0)
+        else:
+            size = len(response.content)
+        retry_state = getattr(response.raw, "retries", None)
+        retries = len(retry_state.history) if retry_state is not None else 0
+        if response.status_code == 304:
+            source = "revalidated"
+        self._emit(RequestEvent(method, endpoint_label(path), response.status_code,
+                                time.perf_counter() - started, size, retries, source))
+        return response
         
     def _get_headers(self) -> Dict[str, str]:
-        """Crée les en-têtes pour les requêtes API."""
-        return {"Content-Type": "application/json"}
+        """
+        Crée les en-têtes pour les requêtes API.
+        
+        Le jeton de session de l'utilisateur courant est joint s'il existe. Dans un
+        bloc `service_identity` (réplique, index partagés par le processus), c'est
+        la clé de service du frontend qui est jointe.
+        """
+        headers = {"Content-Type": "application/json"}
+        if getattr(_identity, "service", False):
+            if self.service_key:
+                headers["Authorization"] = f"Service {self.service_key}"
+            return headers
+        token = self._session_token()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+    
+    @staticmethod
+    def _session_token() -> Optional[str]:
+        """Retourne le jeton de la session Streamlit courante, s'il y en a une."""
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return None
+        return st.session_state.get("auth_token")
+    
+    def _cache_key(self, path: str, params: Dict[str, Any], headers: Dict[str, str]) -> Tuple:
+        """
+        Clé de cache d'une lecture.
+        
+        Le serveur filtre les réponses selon l'appelant (un employé ne voit que ses
+        tickets) : l'en-tête Authorization fait partie de la clé, pour qu'une
+        réponse ne soit jamais servie à une autre session ou à la clé de service.
+        """
+        return (path, tuple(sorted(params.items())), headers.get("Authorization"))
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Envoie une requête via la session partagée avec les délais configurés.
+        
+        Les GET réussis sont servis depuis le cache de lecture tant que leur TTL
+        n'a pas expiré (sauf les réponses lues en streaming) ; une écriture réussie
+        invalide les lectures qu'elle rend obsolètes. Au-delà du TTL, les réponses
+        porteuses d'un ETag sont revalidées par une requête conditionnelle : si le
+        serveur répond 304, le corps déjà reçu est réutilisé. Chaque requête est
+        signalée aux hooks du client (voir `add_hook`). Une réponse 401 à une
+        requête portant le jeton de la session la termine (voir `_check_session`).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        
+        if method == "GET" and not kwargs.get("stream"):
+            ttl = self._cache_ttl(path)
+            key = self._cache_key(path, kwargs.get("params") or {}, kwargs.get("headers") or {})
+            if ttl > 0:
+                found, cached = self._cache.get(key)
+                if found:
+                    if self._hooks:
+                        self._emit(RequestEvent(method, endpoint_label(path), cached.status_code, 0.0,
+                                                len(cached.content), 0, "cache"))
+                    return cached
+            
+            conditional_headers = self._validators.conditional_headers(key)
+            if conditional_headers:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **conditional_headers}
+            
+            response = self._send(method, url, path, **kwargs)
+            self._check_session(response, kwargs.get("headers"))
+            if response.status_code == 304:
+                response = self._validators.revalidated(key) or response
+            elif response.status_code == 200:
+                self._validators.store(key, response)
+            
+            if ttl > 0 and response.status_code == 200:
+                self._cache.set(key, response, ttl)
+            return response
+        
+        response = self._send(method, url, path, **kwargs)
+        self._check_session(response, kwargs.get("headers"))
+        if method != "GET" and response.status_code < 400:
+            self._invalidate_after_write(path)
+        return response
+    
+    def _check_session(self, response: requests.Response, headers: Optional[Dict[str, str]]) -> None:
+        """
+        Termine la session Streamlit dont le jeton est refusé par le serveur.
+        
+        Un jeton expiré, ou signé avant un changement de la clé du serveur, fait
+        échouer toutes les requêtes de la session : l'utilisateur est déconnecté
+        et renvoyé au formulaire de connexion.
+        """
+        if response.status_code != 401:
+            return
+        token = self._session_token()
+        if not token or (headers or {}).get("Authorization") != f"Bearer {token}":
+            return
+        
+        # Import local : utils.auth dépend de ce module
+        from utils.auth import logout_user
+        logout_user()
+        st.session_state.session_expired = True
+        st.rerun()
+    
+    def _iter_ndjson(self, url: str, params: Dict[str, Any], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lit une réponse NDJSON (compressée si le serveur l'accepte) au fil de l'eau.
+        
+        Yields:
+            Des lots d'au plus `chunk_size` enregistrements
+        """
+        params = dict(params, format="ndjson")
+        with self._request("GET", url, headers=self._get_headers(), params=params, stream=True) as response:
+            if response.status_code != 200:
+                st.error(f"Erreur lors de la lecture de {url}: {response.status_code}, {response.text}")
+                return
+            
+            chunk = []
+            for line in response.iter_lines(chunk_size=64 * 1024):
+                if not line:
+                    continue
+                chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+    
+    def _cache_ttl(self, path: str) -> float:
+        """Retourne le TTL du préfixe d'endpoint le plus spécifique correspondant au chemin."""
+        matches = [prefix for prefix in self.cache_ttls if path.startswith(prefix)]
+        if not matches:
+            return 0
+        return self.cache_ttls[max(matches, key=len)]
+    
+    def _invalidate_after_write(self, path: str) -> None:
+        """Invalide les lectures en cache dépendant de la ressource modifiée."""
+        resource = "/" + path.strip("/").split("/")[0]
+        for prefix in self.CACHE_INVALIDATIONS.get(resource, []):
+            self._cache.invalidate(prefix)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache de lecture.
+        
+        Returns:
+            Taille, hits, misses, évictions, invalidations et taux de succès
+        """
+        return self._cache.stats()
+    
+    def conditional_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs des requêtes conditionnelles.
+        
+        Returns:
+            Réponses conservées, revalidations, réponses 304 et octets non retransférés
+        """
+        return self._validators.stats()
+    
+    def clear_cache(self) -> None:
+        """Vide le cache de lecture et les réponses conservées pour revalidation."""
+        self._cache.invalidate()
+        self._validators.clear()
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """
+        Retourne les compteurs du pool de connexions.
+        
+        Returns:
+            Nombre de requêtes, de connexions réutilisées (hits) et ouvertes (misses)
+        """
+        return self._pool_stats.snapshot()
+    
+    def ping(self) -> bool:
+        """
+        Vérifie que l'API et sa base de données répondent (GET /health).
+        
+        Returns:
+            True si l'API est disponible
+        """
+        try:
+            response = self._request("GET", f"{self.base_url}/health", headers=self._get_headers())
+        except requests.RequestException:
+            return False
+        return response.status_code == 200
+    
+    def warm_up(self, connections: int = 1) -> bool:
+        """
+        Ouvre à l'avance des connexions keep-alive vers l'API (préchauffage).
+        
+        Les requêtes simultanées ouvrent chacune une connexion, conservée ensuite
+        dans le pool : les premières pages n'attendent pas l'établissement des
+        connexions.
+        
+        Args:
+            connections: Nombre de connexions à ouvrir (au plus la taille du pool)
+            
+        Returns:
+            True si l'API a répondu
+        """
+        futures = [self._executor.submit(self.ping) for _ in range(max(connections, 1))]
+        return all([future.result() for future in futures])
+    
+    def close(self) -> None:
+        """Ferme les connexions du pool et le pool de threads."""
+        self._executor.shutdown(wait=False)
+        self._session.close()
+    
+    def gather(self, *calls: Callable[[], Any]) -> List[Any]:
+        """
+        Exécute des appels indépendants en parallèle et attend tous les résultats.
+        
+        Les appels tournent dans le pool de threads du client avec le contexte
+        Streamlit de la session appelante, afin que leurs `st.error` s'affichent
+        sur la bonne page. La latence totale devient celle de l'appel le plus lent.
+        
+        Args:
+            calls: Fonctions sans argument, par ex. `functools.partial(api_client.get_user, 3)`
+            
+        Returns:
+            Les résultats dans l'ordre des appels
+        """
+        ctx = get_script_run_ctx(suppress_warning=True)
+        
+        def run(call: Callable[[], Any]) -> Any:
+            # Les threads du pool sont réutilisés : le contexte est rattaché le temps
+            # de l'appel, puis retiré pour ne pas fuir vers la tâche suivante
+            thread = threading.current_thread()
+            previous = get_script_run_ctx(suppress_warning=True)
+            if ctx is not None:
+                add_script_run_ctx(thread, ctx)
+            try:
+                return call()
+            finally:
+                setattr(thread, _SCRIPT_RUN_CTX_ATTR, previous)
+        
+        futures = [self._executor.submit(run, call) for call in calls]
+        return [future.result() for future in futures]
+    
+    @staticmethod
+    def _ticket_params(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convertit les filtres en paramètres de requête (None -> "null" pour IS NULL)."""
+        if not filters:
+            return {}
+        return {key: "null" if value is None else value for key, value in filters.items()}
     
     def verify_user(self, email: str, password: str) -> Dict[str, Any]:
         """
@@ -28,9 +389,11 @@ class ApiClient:
             password: Mot de passe de l'utilisateur
             
         Returns:
-            Informations de l'utilisateur si authentifié, sinon un dictionnaire vide
+            Informations de l'utilisateur (id, nom, email, rôle) et jeton de session
+            signé (token, expires_at) si authentifié, sinon un dictionnaire vide
         """
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{self.base_url}/auth/verify",
             headers=self._get_headers(),
             data=json.dumps({"email": email, "mot_de_passe": password})
@@ -38,23 +401,97 @@ class ApiClient:
         
         if response.status_code == 200:
             return response.json()
+        elif response.status_code == 429:
+            st.warning(f"Trop de tentatives de connexion : réessayez dans {response.headers.get('Retry-After', '?')} s.")
+            return {}
         else:
             return {}
     
+    def create_resume_code(self, previous: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Demande un code de reprise de la session courante, à placer dans l'URL de la page.
+        
+        Le code est à usage unique et de courte durée : il remplace le jeton de
+        session dans l'URL (historique du navigateur, en-têtes Referer, journaux).
+        
+        Args:
+            previous: Code précédent de la page, révoqué par le serveur
+            
+        Returns:
+            Code et date d'expiration (code, expires_at), sinon un dictionnaire vide
+        """
+        response = self._request(
+            "POST",
+            f"{self.base_url}/auth/resume-code",
+            headers=self._get_headers(),
+            data=json.dumps({"previous": previous})
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        return {}
+    
+    def resume_session(self, code: str) -> Dict[str, Any]:
+        """
+        Échange un code de reprise contre la session (restauration après un rechargement).
+        
+        Le code ne peut servir qu'une fois ; le serveur vérifie la signature du
+        jeton associé sans relire la table des utilisateurs.
+        
+        Args:
+            code: Code émis par `create_resume_code`
+            
+        Returns:
+            Informations de l'utilisateur (id, nom, email, rôle) et jeton de session
+            (token, expires_at) si le code est valide, sinon un dictionnaire vide
+        """
+        response = self._request(
+            "POST",
+            f"{self.base_url}/auth/resume",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"code": code})
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        return {}
+    
+    def revoke_resume_code(self, code: str) -> None:
+        """
+        Révoque le code de reprise de la page à la déconnexion.
+        
+        Args:
+            code: Code émis par `create_resume_code`
+        """
+        self._request(
+            "POST",
+            f"{self.base_url}/auth/logout",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"code": code})
+        )
+    
     # === TICKETS ===
     
-    def get_tickets(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def get_tickets(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Récupère la liste des tickets avec filtres optionnels.
         
         Args:
             filters: Critères de filtrage (statut, priorité, id_employe, id_technicien, etc.)
+            fields: Champs à renvoyer pour chaque ticket (tous si None)
             
         Returns:
             Liste des tickets correspondant aux critères
         """
-        params = filters if filters else {}
-        response = requests.get(
+        params = self._ticket_params(filters)
+        if fields:
+            params["fields"] = ",".join(fields)
+        response = self._request(
+            "GET",
             f"{self.base_url}/tickets",
             headers=self._get_headers(),
             params=params
@@ -66,6 +503,183 @@ class ApiClient:
             st.error(f"Erreur lors de la récupération des tickets: {response.status_code}, {response.text}")
             return []
     
+    def get_tickets_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "date_creation",
+        order: str = "desc",
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Récupère une page de tickets filtrés (pagination par curseur).
+        
+        Args:
+            filters: Critères de filtrage (statut, priorité, id_employe, id_technicien)
+            limit: Nombre maximal de tickets dans la page
+            cursor: Curseur renvoyé par la page précédente (None pour la première page)
+            sort: Champ de tri (date_creation, date_mise_a_jour ou id)
+            order: Ordre de tri ("asc" ou "desc")
+            fields: Champs à renvoyer pour chaque ticket (tous si None)
+            
+        Returns:
+            Dictionnaire avec les tickets de la page (`items`) et le curseur de la page suivante (`next_cursor`)
+        """
+        params = self._ticket_params(filters)
+        params.update({"limit": limit, "sort": sort, "order": order})
+        if cursor:
+            params["cursor"] = cursor
+        if fields:
+            params["fields"] = ",".join(fields)
+        
+        response = self._request(
+            "GET",
+            f"{self.base_url}/tickets",
+            headers=self._get_headers(),
+            params=params
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de la récupération des tickets: {response.status_code}, {response.text}")
+            return {"items": [], "next_cursor": None}
+    
+    def iter_ticket_pages(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 200,
+        sort: str = "date_creation",
+        order: str = "desc",
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt toutes les pages de tickets correspondant aux filtres.
+        
+        Args:
+            filters: Critères de filtrage
+            page_size: Nombre de tickets par page
+            sort: Champ de tri
+            order: Ordre de tri
+            fields: Champs à renvoyer pour chaque ticket (tous si None)
+            
+        Yields:
+            Les tickets de chaque page
+        """
+        cursor = None
+        while True:
+            page = self.get_tickets_page(filters, limit=page_size, cursor=cursor, sort=sort, order=order, fields=fields)
+            if page["items"]:
+                yield page["items"]
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+    
+    def iter_ticket_chunks(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        chunk_size: int = 10000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt tous les tickets filtrés, reçus en streaming NDJSON, par lots.
+        
+        Args:
+            filters: Critères de filtrage
+            fields: Champs à renvoyer pour chaque ticket (tous si None)
+            chunk_size: Nombre maximal de tickets par lot
+            
+        Yields:
+            Des lots de tickets
+        """
+        params = self._ticket_params(filters)
+        if fields:
+            params["fields"] = ",".join(fields)
+        yield from self._iter_ndjson(f"{self.base_url}/tickets", params, chunk_size)
+    
+    def iter_tickets(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt tous les tickets filtrés un par un, sans matérialiser la liste complète.
+        
+        Args:
+            filters: Critères de filtrage
+            fields: Champs à renvoyer pour chaque ticket (tous si None)
+            
+        Yields:
+            Les tickets, au fur et à mesure de leur réception
+        """
+        for chunk in self.iter_ticket_chunks(filters, fields):
+            yield from chunk
+    
+    def search_tickets(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche des tickets par mots du titre et de la description.
+        
+        Args:
+            query: Mots recherchés (préfixes acceptés, tous obligatoires)
+            filters: Critères de filtrage
+            limit: Nombre maximal de résultats
+            fields: Champs à renvoyer pour chaque ticket (tous si None)
+            
+        Returns:
+            Tickets classés par pertinence décroissante (champ `pertinence`)
+        """
+        params = self._ticket_params(filters)
+        params.update({"q": query, "limit": limit})
+        if fields:
+            params["fields"] = ",".join(fields)
+        
+        response = self._request(
+            "GET",
+            f"{self.base_url}/tickets/search",
+            headers=self._get_headers(),
+            params=params
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 400:
+            st.warning(response.json().get("message", "Recherche invalide."))
+            return []
+        else:
+            st.error(f"Erreur lors de la recherche de tickets: {response.status_code}, {response.text}")
+            return []
+    
+    def get_ticket_columns(self, fields: List[str]) -> Dict[str, Any]:
+        """
+        Récupère tous les tickets au format colonnes, limités aux champs demandés.
+        
+        Args:
+            fields: Champs à exporter
+            
+        Returns:
+            Dictionnaire avec la version des données (`version`), le nombre de tickets
+            (`count`) et les valeurs par champ (`columns`)
+        """
+        response = self._request(
+            "GET",
+            f"{self.base_url}/tickets/columns",
+            headers=self._get_headers(),
+            params={"fields": ",".join(fields)}
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de l'export des tickets: {response.status_code}, {response.text}")
+            return {}
+    
     def get_ticket(self, ticket_id: int) -> Dict[str, Any]:
         """
         Récupère les détails d'un ticket.
@@ -76,7 +690,8 @@ class ApiClient:
         Returns:
             Informations détaillées du ticket
         """
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/tickets/{ticket_id}",
             headers=self._get_headers()
         )
@@ -100,7 +715,8 @@ class ApiClient:
         Returns:
             Informations détaillées du ticket
         """
-        response = requests.delete(
+        response = self._request(
+            "DELETE",
             f"{self.base_url}/tickets/{ticket_id}",
             headers=self._get_headers()
         )
@@ -123,7 +739,8 @@ class ApiClient:
         Returns:
             Ticket créé
         """
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{self.base_url}/tickets",
             headers=self._get_headers(),
             data=json.dumps(ticket_data)
@@ -146,7 +763,8 @@ class ApiClient:
         Returns:
             Ticket mis à jour
         """
-        response = requests.put(
+        response = self._request(
+            "PUT",
             f"{self.base_url}/tickets/{ticket_id}",
             headers=self._get_headers(),
             data=json.dumps(ticket_data)
@@ -158,20 +776,157 @@ class ApiClient:
             st.error(f"Erreur lors de la mise à jour du ticket: {response.status_code}, {response.text}")
             return {}
       
+    def bulk_update_tickets(self, ticket_ids: List[int], ticket_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Met à jour plusieurs tickets en une seule transaction côté serveur.
+        
+        Args:
+            ticket_ids: Identifiants des tickets à mettre à jour
+            ticket_data: Nouvelles données (statut, id_technicien, ...) appliquées à chaque ticket
+            
+        Returns:
+            Résultat de l'opération (nombre de tickets modifiés, ids introuvables)
+        """
+        response = self._request(
+            "PUT",
+            f"{self.base_url}/tickets/bulk",
+            headers=self._get_headers(),
+            data=json.dumps({"ids": list(ticket_ids), "data": ticket_data})
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de la mise à jour groupée des tickets: {response.status_code}, {response.text}")
+            return {}
+    
+    def bulk_assign_tickets(self, ticket_ids: List[int], technician_id: Optional[int]) -> Dict[str, Any]:
+        """
+        Assigne plusieurs tickets à un technicien (None pour les désassigner).
+        
+        Args:
+            ticket_ids: Identifiants des tickets à assigner
+            technician_id: Identifiant du technicien
+            
+        Returns:
+            Résultat de l'opération
+        """
+        return self.bulk_update_tickets(ticket_ids, {"id_technicien": technician_id})
+    
+    def bulk_delete_tickets(self, ticket_ids: List[int]) -> Dict[str, Any]:
+        """
+        Supprime plusieurs tickets en une seule transaction côté serveur.
+        
+        Args:
+            ticket_ids: Identifiants des tickets à supprimer
+            
+        Returns:
+            Résultat de l'opération (nombre de tickets supprimés, ids introuvables)
+        """
+        response = self._request(
+            "DELETE",
+            f"{self.base_url}/tickets/bulk",
+            headers=self._get_headers(),
+            data=json.dumps({"ids": list(ticket_ids)})
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de la suppression groupée des tickets: {response.status_code}, {response.text}")
+            return {}
+    
+    def get_ticket_events(self, ticket_id: int, cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Récupère une page de l'historique d'un ticket (création, statuts, assignations, commentaires).
+        
+        Args:
+            ticket_id: Identifiant du ticket
+            cursor: Curseur renvoyé par la page précédente (None pour la première page)
+            limit: Nombre maximal d'événements dans la page
+        
+        Returns:
+            Dictionnaire avec les événements de la page, du plus ancien au plus récent
+            (`items`), et le curseur de la page suivante (`next_cursor`)
+        """
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        
+        response = self._request(
+            "GET",
+            f"{self.base_url}/tickets/{ticket_id}/events",
+            headers=self._get_headers(),
+            params=params
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de la récupération de l'historique du ticket: {response.status_code}, {response.text}")
+            return {"items": [], "next_cursor": None}
+    
+    def iter_ticket_events(self, ticket_id: int, page_size: int = 200) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt tout l'historique d'un ticket, page par page.
+        
+        Args:
+            ticket_id: Identifiant du ticket
+            page_size: Nombre d'événements par page
+        
+        Yields:
+            Les événements, du plus ancien au plus récent
+        """
+        cursor = None
+        while True:
+            page = self.get_ticket_events(ticket_id, cursor=cursor, limit=page_size)
+            yield from page["items"]
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+    
+    def add_ticket_comment(self, ticket_id: int, commentaire: str) -> Dict[str, Any]:
+        """
+        Ajoute un commentaire à l'historique d'un ticket.
+        
+        Args:
+            ticket_id: Identifiant du ticket
+            commentaire: Texte du commentaire
+        
+        Returns:
+            Réponse du serveur (vide en cas d'erreur)
+        """
+        response = self._request(
+            "POST",
+            f"{self.base_url}/tickets/{ticket_id}/comments",
+            headers=self._get_headers(),
+            data=json.dumps({"commentaire": commentaire})
+        )
+        
+        if response.status_code == 201:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de l'ajout du commentaire: {response.status_code}, {response.text}")
+            return {}
+    
     # === UTILISATEURS ===
     
-    def get_users(self, role: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_users(self, role: Optional[str] = None, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Récupère la liste des utilisateurs, éventuellement filtrée par rôle.
         
         Args:
             role: Rôle des utilisateurs à récupérer (optionnel)
+            fields: Champs à renvoyer pour chaque utilisateur (tous sauf le mot de passe si précisé)
             
         Returns:
             Liste des utilisateurs
         """
         params = {"role": role} if role else {}
-        response = requests.get(
+        if fields:
+            params["fields"] = ",".join(fields)
+        response = self._request(
+            "GET",
             f"{self.base_url}/users",
             headers=self._get_headers(),
             params=params
@@ -189,6 +944,46 @@ class ApiClient:
 
 
 
+    def iter_user_chunks(
+        self,
+        role: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        chunk_size: int = 10000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt tous les utilisateurs, reçus en streaming NDJSON, par lots.
+        
+        Args:
+            role: Rôle des utilisateurs à récupérer (optionnel)
+            fields: Champs à renvoyer pour chaque utilisateur
+            chunk_size: Nombre maximal d'utilisateurs par lot
+            
+        Yields:
+            Des lots d'utilisateurs
+        """
+        params = {"role": role} if role else {}
+        if fields:
+            params["fields"] = ",".join(fields)
+        yield from self._iter_ndjson(f"{self.base_url}/users", params, chunk_size)
+    
+    def iter_users(
+        self,
+        role: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt tous les utilisateurs un par un, sans matérialiser la liste complète.
+        
+        Args:
+            role: Rôle des utilisateurs à récupérer (optionnel)
+            fields: Champs à renvoyer pour chaque utilisateur
+            
+        Yields:
+            Les utilisateurs, au fur et à mesure de leur réception
+        """
+        for chunk in self.iter_user_chunks(role, fields):
+            yield from chunk
+    
     def get_technicians(self, role: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Récupère la liste des utilisateurs, éventuellement filtrée par rôle.
@@ -200,7 +995,8 @@ class ApiClient:
             Liste des utilisateurs
         """
         params = {"role": role} if role else {}
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/users/technicians",
             headers=self._get_headers(),
             params=params
@@ -225,7 +1021,8 @@ class ApiClient:
             Liste des utilisateurs
         """
         params = {"role": role} if role else {}
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/users/admins",
             headers=self._get_headers(),
             params=params
@@ -250,7 +1047,8 @@ class ApiClient:
             Liste des utilisateurs
         """
         params = {"role": role} if role else {}
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/users/employees",
             headers=self._get_headers(),
             params=params
@@ -281,7 +1079,8 @@ class ApiClient:
         Returns:
             Informations détaillées de l'utilisateur
         """
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/users/{user_id}",
             headers=self._get_headers()
         )
@@ -303,7 +1102,8 @@ class ApiClient:
         Returns:
             Utilisateur créé
         """
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{self.base_url}/users",
             headers=self._get_headers(),
             data=json.dumps(user_data)
@@ -326,7 +1126,8 @@ class ApiClient:
         Returns:
             Utilisateur mis à jour
         """
-        response = requests.put(
+        response = self._request(
+            "PUT",
             f"{self.base_url}/users/{user_id}",
             headers=self._get_headers(),
             data=json.dumps(user_data)
@@ -348,7 +1149,8 @@ class ApiClient:
         Returns:
             True si la suppression a réussi, False sinon
         """
-        response = requests.delete(
+        response = self._request(
+            "DELETE",
             f"{self.base_url}/users/{user_id}",
             headers=self._get_headers()
         )
@@ -368,7 +1170,8 @@ class ApiClient:
         Returns:
             Statistiques de l'application
         """
-        response = requests.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/statistics",
             headers=self._get_headers()
         )
@@ -377,4 +1180,42 @@ class ApiClient:
             return response.json()
         else:
             st.error(f"Erreur lors de la récupération des statistiques: {response.status_code}, {response.text}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    def get_http_cache_stats(self) -> Dict[str, Any]:
+        """
+        Récupère les compteurs des requêtes conditionnelles côté serveur.
+        
+        Returns:
+            Nombre de réponses 304, de requêtes SQL et d'octets évités
+        """
+        response = self._request(
+            "GET",
+            f"{self.base_url}/statistics/http-cache",
+            headers=self._get_headers()
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de la récupération des compteurs de cache: {response.status_code}, {response.text}")
+            return {}
+    
+    def get_assignment_stats(self) -> Dict[str, Any]:
+        """
+        Récupère l'état de l'assignation automatique des tickets.
+        
+        Returns:
+            Politique, tickets en attente et, par technicien, tickets ouverts, charge et temps moyen de résolution
+        """
+        response = self._request(
+            "GET",
+            f"{self.base_url}/statistics/assignment",
+            headers=self._get_headers()
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            st.error(f"Erreur lors de la récupération de l'assignation automatique: {response.status_code}, {response.text}")
+            return {}
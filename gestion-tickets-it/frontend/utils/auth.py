@@ -1,7 +1,37 @@
 import streamlit as st
+from datetime import datetime, timezone
 from utils.api import ApiClient
 from typing import Dict, Optional, Any
 
+# Paramètre d'URL portant un code de reprise de session : un rechargement de la
+# page retrouve la session sans se reconnecter. Le jeton de session n'apparaît
+# jamais dans l'URL (historique du navigateur, en-têtes Referer, journaux) : le
+# code est à usage unique, de courte durée, et renouvelé à mi-vie tant que la
+# page est utilisée
+SESSION_QUERY_PARAM = "session"
+
+def _start_session(user_data: Dict[str, Any], token: Optional[str]) -> None:
+    """Enregistre dans la session l'utilisateur et son jeton de session signé."""
+    st.session_state.auth_token = token
+    st.session_state.auth_expires_at = user_data.pop("expires_at", None)
+    # Stocker les infos utilisateur dans la session
+    st.session_state.user = user_data
+    st.session_state.is_logged_in = True
+
+def _publish_resume_code(api_client: ApiClient) -> None:
+    """Place dans l'URL un nouveau code de reprise de la session, en révoquant le précédent."""
+    resume = api_client.create_resume_code(st.query_params.get(SESSION_QUERY_PARAM))
+    if not resume:
+        st.session_state.auth_resume_refresh_at = None
+        if SESSION_QUERY_PARAM in st.query_params:
+            del st.query_params[SESSION_QUERY_PARAM]
+        return
+    
+    st.query_params[SESSION_QUERY_PARAM] = resume["code"]
+    issued_at = datetime.now(timezone.utc)
+    expires_at = datetime.fromisoformat(resume["expires_at"].replace("Z", "+00:00"))
+    st.session_state.auth_resume_refresh_at = issued_at + (expires_at - issued_at) / 2
+
 def login_user(api_client: ApiClient, email: str, password: str) -> Optional[Dict[str, Any]]:
     """
     Vérifie les identifiants utilisateur et initialise la session si valides.
@@ -17,17 +47,63 @@ def login_user(api_client: ApiClient, email: str, password: str) -> Optional[Dic
     user_data = api_client.verify_user(email, password)
     
     if user_data:
-        # Stocker les infos utilisateur dans la session
-        st.session_state.user = user_data
-        st.session_state.is_logged_in = True
+        token = user_data.pop("token", None)
+        _start_session(user_data, token)
+        if token:
+            _publish_resume_code(api_client)
         return user_data
     
     return None
 
-def logout_user() -> None:
-    """Déconnecte l'utilisateur en effaçant ses données de session."""
-    if "user" in st.session_state:
-        del st.session_state.user
+def restore_session(api_client: ApiClient) -> bool:
+    """
+    Restaure la session depuis le code de reprise présent dans l'URL, sans nouvelle
+    vérification du mot de passe, puis le remplace par un nouveau code. Pour une
+    session déjà connectée, renouvelle le code de l'URL arrivé à mi-vie.
+    
+    Args:
+        api_client: Client API pour communiquer avec le backend
+        
+    Returns:
+        True si l'utilisateur est connecté (déjà ou grâce au code), False sinon
+    """
+    if check_authentication():
+        refresh_at = st.session_state.get("auth_resume_refresh_at")
+        if SESSION_QUERY_PARAM not in st.query_params or (refresh_at and refresh_at <= datetime.now(timezone.utc)):
+            _publish_resume_code(api_client)
+        return True
+    
+    code = st.query_params.get(SESSION_QUERY_PARAM)
+    if not code:
+        return False
+    
+    user_data = api_client.resume_session(code)
+    if not user_data:
+        # Code déjà utilisé, expiré ou émis avant un redémarrage du serveur : retour au formulaire de connexion
+        del st.query_params[SESSION_QUERY_PARAM]
+        return False
+    
+    token = user_data.pop("token", None)
+    _start_session(user_data, token)
+    _publish_resume_code(api_client)
+    return True
+
+def logout_user(api_client: Optional[ApiClient] = None) -> None:
+    """
+    Déconnecte l'utilisateur en effaçant ses données de session.
+    
+    Args:
+        api_client: Client API utilisé pour révoquer le code de reprise de l'URL
+    """
+    code = st.query_params.get(SESSION_QUERY_PARAM)
+    if code and api_client is not None:
+        api_client.revoke_resume_code(code)
+    
+    for key in ("user", "auth_token", "auth_expires_at", "auth_resume_refresh_at"):
+        if key in st.session_state:
+            del st.session_state[key]
+    if SESSION_QUERY_PARAM in st.query_params:
+        del st.query_params[SESSION_QUERY_PARAM]
     
     st.session_state.is_logged_in = False
 
@@ -38,7 +114,16 @@ def check_authentication() -> bool:
     Returns:
         True si l'utilisateur est connecté, False sinon
     """
-    return st.session_state.get("is_logged_in", False)
+    if not st.session_state.get("is_logged_in", False):
+        return False
+    
+    # Jeton expiré : l'API refuserait les requêtes de la session
+    expires_at = st.session_state.get("auth_expires_at")
+    if expires_at and datetime.fromisoformat(expires_at.replace("Z", "+00:00")) <= datetime.now(timezone.utc):
+        logout_user()
+        st.session_state.session_expired = True
+        return False
+    return True
 
 def get_current_user() -> Optional[Dict[str, Any]]:
     """
@@ -0,0 +1,202 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Cache LRU borné et thread-safe dont chaque entrée expire après un délai."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialise le cache.
+
+        Args:
+            maxsize: Nombre maximal d'entrées conservées
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Recherche une entrée non expirée.
+
+        Args:
+            key: Clé de l'entrée
+
+        Returns:
+            Un couple (trouvé, valeur)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Ajoute ou remplace une entrée, en évinçant la moins récemment utilisée si besoin.
+
+        Args:
+            key: Clé de l'entrée
+            value: Valeur à conserver
+            ttl: Durée de vie en secondes
+        """
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """
+        Supprime les entrées dont la clé commence par `prefix` (toutes si None).
+
+        Les clés doivent être des tuples dont le premier élément est le chemin de l'endpoint.
+
+        Args:
+            prefix: Préfixe de chemin à invalider
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            if prefix is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if str(key[0]).startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            Taille, hits, misses, évictions, invalidations et taux de succès
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class ValidatorCache:
+    """
+    Cache LRU borné et thread-safe des réponses porteuses d'un validateur HTTP
+    (ETag / Last-Modified), réutilisées quand le serveur répond 304 Not Modified.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        """
+        Initialise le cache.
+
+        Args:
+            maxsize: Nombre maximal de réponses conservées
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.revalidations = 0
+        self.not_modified = 0
+        self.bytes_avoided = 0
+
+    def conditional_headers(self, key: Hashable) -> Dict[str, str]:
+        """
+        Retourne les en-têtes If-None-Match / If-Modified-Since à envoyer pour une clé.
+
+        Args:
+            key: Clé de la requête
+
+        Returns:
+            Les en-têtes conditionnels (vide si aucune réponse n'est conservée)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            self.revalidations += 1
+            return dict(entry[0])
+
+    def store(self, key: Hashable, response: Any) -> None:
+        """
+        Conserve une réponse 200 si elle porte un validateur.
+
+        Args:
+            key: Clé de la requête
+            response: Réponse `requests` dont le corps a été lu
+        """
+        headers = {}
+        if response.headers.get("ETag"):
+            headers["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+        if not headers:
+            return
+        with self._lock:
+            self._entries[key] = (headers, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revalidated(self, key: Hashable) -> Optional[Any]:
+        """
+        Retourne la réponse conservée après un 304 Not Modified.
+
+        Args:
+            key: Clé de la requête
+
+        Returns:
+            La réponse conservée, ou None si elle a été évincée entre-temps
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.not_modified += 1
+            self.bytes_avoided += len(entry[1].content)
+            return entry[1]
+
+    def clear(self) -> None:
+        """Supprime toutes les réponses conservées."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            Taille, requêtes conditionnelles, réponses 304 et octets non retransférés
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "revalidations": self.revalidations,
+                "not_modified": self.not_modified,
+                "bytes_avoided": self.bytes_avoided,
+                "not_modified_rate": self.not_modified / self.revalidations if self.revalidations else 0.0,
+            }
@@ -0,0 +1,357 @@
+import json
+import logging
+import threading
+import unicodedata
+import weakref
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import requests
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Paramètres de filtre -> colonne du ticket
+FILTER_COLUMNS = {"priorité": "priorite"}
+
+
+def normalize_filter_value(value: Any) -> Optional[str]:
+    """Normalise une valeur comme la collation MySQL (insensible à la casse et aux accents)."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", str(value).casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def matches_filters(ticket: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """
+    Indique si un ticket satisfait les filtres de la liste, comme le ferait l'API.
+
+    Args:
+        ticket: Ticket complet
+        filters: Filtres de la liste (None -> champ vide)
+
+    Returns:
+        True si le ticket fait partie de la liste filtrée
+    """
+    for key, expected in filters.items():
+        value = ticket.get(FILTER_COLUMNS.get(key, key))
+        if expected is None:
+            if value is not None:
+                return False
+        elif normalize_filter_value(value) != normalize_filter_value(expected):
+            return False
+    return True
+
+
+class TicketStore:
+    """
+    Page de tickets affichée par une session, tenue à jour par le flux de modifications.
+
+    Les modifications d'un ticket affiché sont appliquées sur place ; l'arrivée
+    d'un ticket dans la liste filtrée (création, changement de statut...) ou un
+    `reset` du flux rend la page obsolète : elle sera rechargée depuis l'API.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key: Optional[Hashable] = None
+        self._filters: Dict[str, Any] = {}
+        self._tickets: Dict[int, Dict[str, Any]] = {}
+        self._next_cursor: Optional[str] = None
+        self._stale = True
+        self._changed = False
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Retourne la page conservée pour une clé (filtres, curseur...).
+
+        Returns:
+            {"items", "next_cursor"}, ou None si la page doit être rechargée
+        """
+        with self._lock:
+            if self._stale or key != self._key:
+                return None
+            return {"items": list(self._tickets.values()), "next_cursor": self._next_cursor}
+
+    def load(self, key: Hashable, filters: Dict[str, Any], page: Dict[str, Any]) -> None:
+        """
+        Remplace la page conservée par une page lue depuis l'API.
+
+        Args:
+            key: Clé de la page (filtres, curseur...)
+            filters: Filtres de la liste
+            page: Page renvoyée par `ApiClient.get_tickets_page`
+        """
+        with self._lock:
+            self._key = key
+            self._filters = dict(filters)
+            self._tickets = {ticket["id"]: ticket for ticket in page.get("items", [])}
+            self._next_cursor = page.get("next_cursor")
+            self._stale = False
+            self._changed = False
+
+    def invalidate(self) -> None:
+        """Force le rechargement de la page au prochain affichage."""
+        with self._lock:
+            self._stale = True
+            self._changed = True
+
+    def apply(self, event_type: str, event: Dict[str, Any]) -> None:
+        """
+        Applique un événement du flux de modifications.
+
+        Args:
+            event_type: created, updated, deleted ou reset
+            event: Données de l'événement ({"id", "ticket", ...})
+        """
+        with self._lock:
+            if self._key is None or self._stale:
+                return
+
+            if event_type == "reset":
+                self._stale = True
+                self._changed = True
+                return
+
+            ticket_id = event.get("id")
+            ticket = event.get("ticket")
+            visible = self._tickets.get(ticket_id)
+
+            if event_type == "deleted" or ticket is None:
+                if visible is not None:
+                    del self._tickets[ticket_id]
+                    self._changed = True
+                return
+
+            if not matches_filters(ticket, self._filters):
+                if visible is not None:
+                    del self._tickets[ticket_id]
+                    self._changed = True
+                return
+
+            if visible is None:
+                # Le ticket entre dans la liste filtrée : sa place dépend du tri et de la pagination
+                self._stale = True
+                self._changed = True
+                return
+
+            updated = {field: ticket.get(field, value) for field, value in visible.items()}
+            if updated != visible:
+                self._tickets[ticket_id] = updated
+                self._changed = True
+
+    def consume_change(self) -> bool:
+        """
+        Indique si la page affichée a changé depuis le dernier appel.
+
+        Returns:
+            True si un nouvel affichage est nécessaire
+        """
+        with self._lock:
+            changed, self._changed = self._changed, False
+            return changed
+
+
+class TicketFeedListener:
+    """
+    Écoute en arrière-plan le flux SSE des modifications de tickets.
+
+    Un seul listener (et une seule connexion) par processus : il est mis en cache
+    par `st.cache_resource` et distribue chaque événement aux `TicketStore` des
+    sessions abonnées. Après une coupure, il se reconnecte avec Last-Event-ID
+    pour recevoir les événements manqués.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        service_key: Optional[str] = None,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 45,
+        max_backoff: float = 30,
+    ):
+        """
+        Args:
+            url: URL du flux (GET /tickets/changes)
+            service_key: Clé de service du frontend : le flux porte tous les tickets
+            connect_timeout: Délai de connexion en secondes
+            read_timeout: Délai sans donnée (heartbeat compris) avant reconnexion
+            max_backoff: Délai maximal entre deux tentatives de connexion
+        """
+        self.url = url
+        self.service_key = service_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_backoff = max_backoff
+        self.last_event_id: Optional[str] = None
+        self.connected = False
+        self.events_received = 0
+        self.reconnections = 0
+        self._replicas: List[Any] = []
+        self._stores: "weakref.WeakSet[TicketStore]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._session = requests.Session()
+        self._thread = threading.Thread(target=self._run, name="ticket-feed", daemon=True)
+
+    def start(self) -> "TicketFeedListener":
+        """Démarre le thread d'écoute."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le thread d'écoute et ferme la connexion."""
+        self._stop.set()
+        self._session.close()
+
+    def subscribe(self, store: TicketStore) -> None:
+        """Abonne le store d'une session (désabonné automatiquement à sa destruction)."""
+        with self._lock:
+            self._stores.add(store)
+
+    def add_replica(self, replica: Any) -> None:
+        """
+        Abonne une réplique partagée : elle reçoit chaque événement avant les
+        stores des sessions, qui peuvent donc se recharger depuis elle.
+        """
+        with self._lock:
+            self._replicas.append(replica)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du listener.
+
+        Returns:
+            Connexion, dernier événement, nombre d'événements, reconnexions et abonnés
+        """
+        with self._lock:
+            subscribers = len(self._stores)
+        return {
+            "connected": self.connected,
+            "last_event_id": self.last_event_id,
+            "events_received": self.events_received,
+            "reconnections": self.reconnections,
+            "subscribers": subscribers,
+        }
+
+    def _dispatch(self, event_type: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            stores = self._replicas + list(self._stores)
+        for store in stores:
+            store.apply(event_type, data)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except requests.RequestException as error:
+                logger.debug("Flux des tickets interrompu: %s", error)
+            except Exception:
+                # Événement illisible, erreur d'une réplique... : le thread ne
+                # doit pas s'arrêter, on se reconnecte depuis le dernier événement reçu
+                logger.exception("Erreur lors du traitement du flux des tickets")
+
+            if self.connected:
+                self.connected = False
+                backoff = 1.0
+                # Des événements ont pu être manqués si le serveur ne peut pas les rejouer
+                self.reconnections += 1
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _listen(self) -> None:
+        headers = {"Accept": "text/event-stream"}
+        if self.service_key:
+            headers["Authorization"] = f"Service {self.service_key}"
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        with self._session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 200:
+                logger.warning("Flux des tickets indisponible: %s", response.status_code)
+                return
+            self.connected = True
+            for event_id, event_type, data in parse_sse(response.iter_lines(decode_unicode=True)):
+                if self._stop.is_set():
+                    return
+                if event_id:
+                    self.last_event_id = event_id
+                self.events_received += 1
+                self._dispatch(event_type, json.loads(data) if data else {})
+
+
+def parse_sse(lines: Iterator[str]) -> Iterator[Tuple[Optional[str], str, str]]:
+    """
+    Découpe un flux Server-Sent Events en événements.
+
+    Args:
+        lines: Lignes du flux (sans les fins de ligne)
+
+    Yields:
+        Des triplets (id, type, données)
+    """
+    event_id, event_type, data = None, "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event_id, event_type, "\n".join(data)
+            event_id, event_type, data = None, "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "id":
+            event_id = value
+        elif field == "event":
+            event_type = value
+        elif field == "data":
+            data.append(value)
+
+
+def load_ticket_page(
+    source,
+    store: TicketStore,
+    listener: TicketFeedListener,
+    filters: Dict[str, Any],
+    cursor: Optional[str],
+    limit: int,
+    fields: List[str],
+) -> Dict[str, Any]:
+    """
+    Retourne une page de tickets depuis le store de la session, ou depuis la
+    source (API ou réplique locale, même interface `get_tickets_page`) si elle
+    est obsolète ou si le flux de modifications n'est pas connecté.
+
+    Returns:
+        {"items", "next_cursor"}
+    """
+    key = (tuple(sorted(filters.items(), key=lambda item: item[0])), cursor, limit, tuple(fields))
+    page = store.get(key) if listener.connected else None
+    if page is None:
+        events_before = listener.events_received
+        page = source.get_tickets_page(filters, limit=limit, cursor=cursor, fields=fields)
+        store.load(key, filters, page)
+        # Un événement reçu pendant la lecture a pu être ignoré : la page sera relue
+        if listener.events_received != events_before:
+            store.invalidate()
+    return page
+
+
+def watch_ticket_store(store: TicketStore, interval: float) -> None:
+    """
+    Relance l'affichage de la page quand le flux a modifié les tickets affichés.
+
+    Le fragment ne fait qu'une vérification en mémoire à chaque intervalle :
+    aucune requête n'est envoyée à l'API tant que rien n'a changé.
+
+    Args:
+        store: Store de la page affichée
+        interval: Intervalle de vérification en secondes
+    """
+    @st.fragment(run_every=interval)
+    def check() -> None:
+        if store.consume_change():
+            st.rerun()
+
+    check()
@@ -0,0 +1,122 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Verbes HTTP idempotents pouvant être rejoués sans risque
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+
+class PoolStats:
+    """Compteurs thread-safe d'utilisation du pool de connexions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Retourne l'état courant des compteurs.
+
+        Returns:
+            Dictionnaire avec le nombre de requêtes, de connexions réutilisées (hits)
+            et de nouvelles connexions ouvertes (misses)
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hits": max(self.requests - self.new_connections, 0),
+                "misses": self.new_connections,
+            }
+
+
+def _counting_pool_class(base, stats: PoolStats):
+    """Crée une sous-classe de pool urllib3 qui alimente les compteurs `stats`."""
+
+    class CountingPool(base):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+        def urlopen(self, *args, **kwargs):
+            # Chaque nouvelle tentative de urllib3 rappelle urlopen avec un Retry
+            # dont l'historique n'est pas vide : seul l'appel initial est compté
+            retries = kwargs["retries"] if "retries" in kwargs else (args[4] if len(args) > 4 else None)
+            if not (isinstance(retries, Retry) and retries.history):
+                stats.record_request()
+            return super().urlopen(*args, **kwargs)
+
+    CountingPool.__name__ = f"Counting{base.__name__}"
+    return CountingPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """Adaptateur HTTP dont les pools comptent les connexions réutilisées."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+
+def create_session(
+    pool_size: int = 10,
+    max_retries: int = 3,
+    backoff_factor: float = 0.3,
+    stats: Optional[PoolStats] = None,
+) -> Tuple[requests.Session, PoolStats]:
+    """
+    Crée une session HTTP keep-alive avec pool de connexions et retries.
+
+    Seuls les verbes idempotents sont rejoués, avec un délai exponentiel
+    (backoff) entre les tentatives, sur erreur réseau ou réponse 502/503/504.
+
+    Args:
+        pool_size: Nombre maximal de connexions conservées par hôte
+        max_retries: Nombre maximal de nouvelles tentatives
+        backoff_factor: Facteur du délai exponentiel entre tentatives
+        stats: Compteurs à alimenter (créés si absents)
+
+    Returns:
+        La session configurée et ses compteurs de pool
+    """
+    stats = stats or PoolStats()
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+    )
+    adapter = PooledAdapter(
+        stats,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session, stats
@@ -0,0 +1,287 @@
+import bisect
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bornes supérieures des histogrammes (la dernière classe, +Inf, est implicite)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Segments variables d'un chemin d'API (identifiants numériques)
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_label(path: str) -> str:
+    """
+    Regroupe les chemins d'un même endpoint ("/tickets/42" -> "/tickets/:id").
+
+    Args:
+        path: Chemin relatif à l'URL de base de l'API
+
+    Returns:
+        Le gabarit de l'endpoint, sans paramètres de requête
+    """
+    return _ID_SEGMENT.sub("/:id", path.split("?", 1)[0]) or "/"
+
+
+@dataclass
+class RequestEvent:
+    """Requête envoyée par `ApiClient`, transmise à ses hooks."""
+
+    method: str
+    endpoint: str
+    status: Optional[int]  # None si aucune réponse (erreur réseau)
+    duration: float  # secondes
+    response_bytes: int
+    retries: int
+    source: str  # "network", "cache" (TTL) ou "revalidated" (304)
+    error: Optional[str] = None
+
+
+class Histogram:
+    """Histogramme à classes fixes, au format cumulatif de Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estime un quantile par interpolation linéaire dans sa classe (comme
+        `histogram_quantile` de Prometheus).
+
+        Returns:
+            La valeur estimée, ou None si l'histogramme est vide
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Compteurs et histogrammes du frontend, partagés par toutes les sessions du processus.
+
+    Les séries sont identifiées par leur nom et leurs étiquettes ; l'export suit le
+    format texte de Prometheus.
+    """
+
+    def __init__(self, prefix: str = "tickets_frontend"):
+        """
+        Args:
+            prefix: Préfixe des noms de métriques exportées
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    # --- Enregistrement ---
+
+    def _name(self, name: str, kind: str, help_text: str) -> str:
+        full_name = f"{self.prefix}_{name}"
+        self._help.setdefault(full_name, (kind, help_text))
+        return full_name
+
+    def inc(self, name: str, labels: Dict[str, Any], amount: float = 1, help_text: str = "") -> None:
+        """Incrémente un compteur."""
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(self._name(name, "counter", help_text), {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(
+        self,
+        name: str,
+        labels: Dict[str, Any],
+        value: float,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        help_text: str = "",
+    ) -> None:
+        """Ajoute une observation à un histogramme."""
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(self._name(name, "histogram", help_text), {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_request(self, event: RequestEvent) -> None:
+        """
+        Hook de `ApiClient` : enregistre une requête vers l'API.
+
+        Les réponses servies par le cache de lecture ne sont que comptées : leur
+        durée fausserait les latences de l'API.
+        """
+        endpoint = {"method": event.method, "endpoint": event.endpoint}
+        status = event.status if event.status is not None else "error"
+        self.inc("api_requests_total", {**endpoint, "status": status, "source": event.source},
+                 help_text="Requêtes vers l'API par statut et origine de la réponse")
+        if event.source == "cache":
+            return
+
+        self.observe("api_request_duration_seconds", endpoint, event.duration,
+                     help_text="Durée des requêtes vers l'API (réseau et revalidation)")
+        self.observe("api_response_bytes", endpoint, event.response_bytes, buckets=SIZE_BUCKETS,
+                     help_text="Taille des réponses de l'API (octets décompressés)")
+        if event.retries:
+            self.inc("api_retries_total", endpoint, event.retries,
+                     help_text="Nouvelles tentatives faites par le pool de connexions")
+        if event.error:
+            self.inc("api_errors_total", {**endpoint, "error": event.error},
+                     help_text="Requêtes vers l'API sans réponse (erreurs réseau)")
+
+    def record_page(self, page: str, duration: float) -> None:
+        """Enregistre la durée d'exécution du script pour une page."""
+        self.observe("page_render_seconds", {"page": page}, duration,
+                     help_text="Durée d'exécution du script Streamlit par page")
+
+    # --- Lecture ---
+
+    def render_prometheus(self) -> str:
+        """
+        Exporte toutes les séries au format texte de Prometheus.
+
+        Returns:
+            Le texte d'exposition (version 0.0.4)
+        """
+        def format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = labels + extra
+            if not pairs:
+                return ""
+            escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+            return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                kind, help_text = self._help[name]
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{format_labels(labels)} {value:g}" for labels, value in sorted(series.items())]
+
+            for name, series in sorted(self._histograms.items()):
+                kind, help_text = self._help[name]
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    bounds = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{format_labels(labels, (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def endpoint_summary(self) -> List[Dict[str, Any]]:
+        """
+        Résume les requêtes par endpoint pour la page de diagnostic.
+
+        Returns:
+            Une ligne par (méthode, endpoint) : volume, erreurs, latences estimées, taille et tentatives
+        """
+        duration_name = f"{self.prefix}_api_request_duration_seconds"
+        rows: Dict[Labels, Dict[str, Any]] = {}
+        with self._lock:
+            for labels, counter in self._counters.get(f"{self.prefix}_api_requests_total", {}).items():
+                values = dict(labels)
+                key = (("endpoint", values["endpoint"]), ("method", values["method"]))
+                row = rows.setdefault(key, {"method": values["method"], "endpoint": values["endpoint"],
+                                            "requests": 0, "cache_hits": 0, "errors": 0, "retries": 0})
+                row["requests"] += counter
+                if values["source"] == "cache":
+                    row["cache_hits"] += counter
+                if values["status"] == "error" or values["status"].startswith("5"):
+                    row["errors"] += counter
+
+            for key, count in self._counters.get(f"{self.prefix}_api_retries_total", {}).items():
+                if key in rows:
+                    rows[key]["retries"] += count
+
+            for key, row in rows.items():
+                latency = self._histograms.get(duration_name, {}).get(key)
+                size = self._histograms.get(f"{self.prefix}_api_response_bytes", {}).get(key)
+                for label, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                    value = latency.quantile(q) if latency else None
+                    row[label] = round(value * 1000, 1) if value is not None else None
+                row["avg_kb"] = round(size.sum / size.count / 1024, 1) if size and size.count else None
+        return sorted(rows.values(), key=lambda row: row["requests"], reverse=True)
+
+    def page_summary(self) -> List[Dict[str, Any]]:
+        """
+        Résume les durées d'exécution par page.
+
+        Returns:
+            Une ligne par page : nombre d'exécutions et durées estimées
+        """
+        with self._lock:
+            series = dict(self._histograms.get(f"{self.prefix}_page_render_seconds", {}))
+            rows = []
+            for labels, histogram in series.items():
+                row = {"page": dict(labels)["page"], "renders": histogram.count,
+                       "avg_ms": round(histogram.sum / histogram.count * 1000, 1)}
+                for label, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                    row[label] = round(histogram.quantile(q) * 1000, 1)
+                rows.append(row)
+        return sorted(rows, key=lambda row: row["renders"], reverse=True)
+
+
+def start_metrics_server(registry: MetricsRegistry, host: str, port: int) -> Optional[ThreadingHTTPServer]:
+    """
+    Expose les métriques au format Prometheus (GET /metrics) dans un thread dédié.
+
+    Args:
+        registry: Registre à exporter
+        host: Adresse d'écoute
+        port: Port d'écoute
+
+    Returns:
+        Le serveur démarré, ou None si le port est indisponible
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("metrics: " + format, *args)
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as error:
+        logger.warning("Export des métriques indisponible sur %s:%s : %s", host, port, error)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,360 @@
+import bisect
+import heapq
+import sys
+import threading
+import time
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.api import service_identity
+from utils.feed import FILTER_COLUMNS, matches_filters, normalize_filter_value
+
+# Champs conservés pour chaque ticket (la description n'est lue que sur la fiche ticket)
+REPLICA_FIELDS = ["id", "titre", "statut", "priorite", "date_creation", "date_mise_a_jour", "id_employe", "id_technicien"]
+
+# Champs disposant d'un index en mémoire (valeur normalisée -> ids)
+INDEXED_FIELDS = ["statut", "priorite", "id_technicien", "id_employe"]
+
+# Champs à faible cardinalité dont les chaînes sont partagées entre tickets
+INTERNED_FIELDS = ["statut", "priorite"]
+
+# Tri par défaut des listes, dont l'ordre est maintenu en permanence
+ORDERED_FIELD = "date_creation"
+
+# Coût relatif (mesuré) d'un ticket sélectionné par tas par rapport à un ticket parcouru
+HEAP_COST_RATIO = 8
+
+
+class TicketReplica:
+    """
+    Réplique en mémoire des tickets, partagée par toutes les sessions du processus.
+
+    Elle est chargée une fois (export NDJSON en streaming), puis tenue à jour par
+    le flux de modifications quand il est connecté, et sinon par des requêtes
+    incrémentales ne renvoyant que les tickets dont `date_mise_a_jour` dépasse la
+    plus grande date déjà reçue. Les filtres de liste sont résolus par
+    intersection d'index en mémoire, sans requête vers l'API.
+
+    Les suppressions ne sont visibles que via le flux : une resynchronisation
+    complète périodique rattrape celles qui auraient été manquées.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        fields: Optional[List[str]] = None,
+        sync_interval: float = 5.0,
+        full_sync_interval: float = 600.0,
+        delta_page_size: int = 500,
+    ):
+        """
+        Args:
+            api_client: Client API
+            fields: Champs conservés pour chaque ticket (doit inclure les champs indexés)
+            sync_interval: Intervalle minimal (s) entre deux requêtes incrémentales
+            full_sync_interval: Intervalle (s) entre deux rechargements complets
+            delta_page_size: Nombre de tickets par page des requêtes incrémentales
+        """
+        self.api_client = api_client
+        self.fields = list(fields or REPLICA_FIELDS)
+        self.sync_interval = sync_interval
+        self.full_sync_interval = full_sync_interval
+        self.delta_page_size = delta_page_size
+
+        self._positions = {field: position for position, field in enumerate(self.fields)}
+        self._rows: Dict[int, Tuple[Any, ...]] = {}
+        self._indexes: Dict[str, Dict[Optional[str], Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self._order: List[Tuple[str, int]] = []  # (date_creation, id) croissants
+        self._high_water: Optional[str] = None
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._ready = False
+        self._pending: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self._last_sync = 0.0
+        self._last_full_sync = 0.0
+
+        self.full_syncs = 0
+        self.delta_queries = 0
+        self.delta_rows = 0
+        self.events_applied = 0
+
+    # --- Maintenance des données et des index ---
+
+    def _to_row(self, ticket: Dict[str, Any]) -> Tuple[Any, ...]:
+        values = []
+        for field in self.fields:
+            value = ticket.get(field)
+            if field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            values.append(value)
+        return tuple(values)
+
+    def _index_row(self, indexes, ticket_id: int, row: Tuple[Any, ...], add: bool) -> None:
+        for field in INDEXED_FIELDS:
+            key = normalize_filter_value(row[self._positions[field]])
+            ids = indexes[field].get(key)
+            if add:
+                if ids is None:
+                    ids = indexes[field][key] = set()
+                ids.add(ticket_id)
+            elif ids is not None:
+                ids.discard(ticket_id)
+                if not ids:
+                    del indexes[field][key]
+
+    def _order_key(self, row: Tuple[Any, ...]) -> Tuple[str, int]:
+        return (row[self._positions[ORDERED_FIELD]] or "", row[0])
+
+    def _upsert(self, rows, indexes, ticket: Dict[str, Any], order: Optional[List[Tuple[str, int]]] = None) -> None:
+        """Ajoute ou remplace un ticket ; l'ordre de tri n'est tenu à jour que s'il est fourni."""
+        ticket_id = ticket["id"]
+        previous = rows.get(ticket_id)
+        if previous is not None:
+            self._index_row(indexes, ticket_id, previous, add=False)
+        row = self._to_row(ticket)
+        rows[ticket_id] = row
+        self._index_row(indexes, ticket_id, row, add=True)
+
+        if order is not None:
+            key = self._order_key(row)
+            if previous is not None and self._order_key(previous) != key:
+                del order[bisect.bisect_left(order, self._order_key(previous))]
+                previous = None
+            if previous is None:
+                bisect.insort(order, key)
+
+        updated_at = ticket.get("date_mise_a_jour")
+        if updated_at and (self._high_water is None or updated_at > self._high_water):
+            self._high_water = updated_at
+
+    def _remove(self, ticket_id: int) -> None:
+        previous = self._rows.pop(ticket_id, None)
+        if previous is not None:
+            self._index_row(self._indexes, ticket_id, previous, add=False)
+            del self._order[bisect.bisect_left(self._order, self._order_key(previous))]
+
+    # --- Synchronisation ---
+
+    def _full_sync(self) -> None:
+        """Recharge tous les tickets ; les événements reçus pendant le chargement sont rejoués."""
+        with self._lock:
+            self._pending = []
+            self._high_water = None
+
+        rows: Dict[int, Tuple[Any, ...]] = {}
+        indexes: Dict[str, Dict[Optional[str], Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        try:
+            with service_identity():
+                for chunk in self.api_client.iter_ticket_chunks(None, self.fields):
+                    for ticket in chunk:
+                        self._upsert(rows, indexes, ticket)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        order = sorted(self._order_key(row) for row in rows.values())
+        with self._lock:
+            self._rows, self._indexes, self._order = rows, indexes, order
+            pending, self._pending = self._pending, None
+            for event_type, event in pending:
+                self._apply_locked(event_type, event)
+            self._ready = True
+            self._last_sync = time.monotonic()
+            # Une réplique vide (base vide ou API en erreur) est rechargée à la prochaine synchronisation
+            self._last_full_sync = self._last_sync if rows else 0.0
+            self.full_syncs += 1
+
+    def _pull_delta(self) -> None:
+        """Récupère les tickets modifiés depuis la plus grande date de mise à jour connue."""
+        with self._lock:
+            since = self._high_water
+        self.delta_queries += 1
+        if since is not None:
+            with service_identity():
+                pages = self.api_client.iter_ticket_pages(
+                    {"updated_since": since},
+                    page_size=self.delta_page_size,
+                    sort="date_mise_a_jour",
+                    order="asc",
+                    fields=self.fields,
+                )
+                for page in pages:
+                    with self._lock:
+                        for ticket in page:
+                            self._upsert(self._rows, self._indexes, ticket, self._order)
+                    self.delta_rows += len(page)
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """
+        Met la réplique à jour si nécessaire.
+
+        Le premier appel bloque jusqu'à la fin du chargement initial ; ensuite,
+        une seule session à la fois lance la requête incrémentale et les autres
+        lisent les données déjà présentes.
+        """
+        if not self._ready:
+            with self._sync_lock:
+                if not self._ready:
+                    self._full_sync()
+            return
+
+        now = time.monotonic()
+        if now - self._last_sync < self.sync_interval and now - self._last_full_sync < self.full_sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if now - self._last_full_sync >= self.full_sync_interval:
+                self._full_sync()
+            else:
+                self._pull_delta()
+        finally:
+            self._sync_lock.release()
+
+    def invalidate(self) -> None:
+        """Force une requête incrémentale à la prochaine lecture (après une écriture locale)."""
+        self._last_sync = 0.0
+
+    def remove(self, ticket_ids: List[int]) -> None:
+        """
+        Retire des tickets supprimés par cette application, sans attendre le flux.
+
+        Args:
+            ticket_ids: Identifiants des tickets supprimés
+        """
+        with self._lock:
+            for ticket_id in ticket_ids:
+                self._remove(ticket_id)
+
+    # --- Flux de modifications ---
+
+    def _apply_locked(self, event_type: str, event: Dict[str, Any]) -> None:
+        if event_type == "reset":
+            # Des modifications ont été manquées : rechargement complet à la prochaine lecture
+            self._last_full_sync = 0.0
+            return
+        ticket_id = event.get("id")
+        ticket = event.get("ticket")
+        if event_type == "deleted" or ticket is None:
+            self._remove(ticket_id)
+        elif event_type in ("created", "updated"):
+            self._upsert(self._rows, self._indexes, ticket, self._order)
+        self.events_applied += 1
+
+    def apply(self, event_type: str, event: Dict[str, Any]) -> None:
+        """
+        Applique un événement du flux de modifications (appelé par `TicketFeedListener`).
+
+        Args:
+            event_type: created, updated, deleted ou reset
+            event: Données de l'événement ({"id", "ticket", ...})
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((event_type, event))
+            elif self._ready:
+                self._apply_locked(event_type, event)
+
+    # --- Lecture ---
+
+    def _filter_sets(self, filters: Dict[str, Any]) -> Tuple[List[Set[int]], Dict[str, Any]]:
+        """
+        Sélectionne les entrées d'index correspondant aux filtres (à appeler sous verrou).
+
+        Returns:
+            Les ensembles d'ids à intersecter, du plus petit au plus grand, et les filtres sans index
+        """
+        indexed = []
+        remaining = {}
+        for key, value in filters.items():
+            field = FILTER_COLUMNS.get(key, key)
+            if field in self._indexes:
+                indexed.append(self._indexes[field].get(normalize_filter_value(value), set()))
+            else:
+                remaining[key] = value
+
+        indexed.sort(key=len)
+        return indexed, remaining
+
+    def _to_ticket(self, row: Tuple[Any, ...], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        if fields is None:
+            return dict(zip(self.fields, row))
+        return {field: row[self._positions[field]] for field in fields if field in self._positions}
+
+    def get_tickets_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "date_creation",
+        order: str = "desc",
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Récupère une page de tickets filtrés et triés depuis la réplique.
+
+        Même interface que `ApiClient.get_tickets_page` ; le curseur est ici la
+        position de la page dans la liste filtrée.
+
+        Returns:
+            {"items": tickets de la page, "next_cursor": curseur de la page suivante ou None}
+        """
+        self.sync()
+        offset = int(cursor) if cursor else 0
+        wanted = offset + limit + 1  # un ticket de plus pour savoir s'il existe une page suivante
+
+        def accepted(row: Tuple[Any, ...]) -> bool:
+            return not remaining or matches_filters(self._to_ticket(row), remaining)
+
+        with self._lock:
+            sets, remaining = self._filter_sets(filters or {})
+            total = len(self._rows)
+            # Nombre de candidats estimé en supposant les filtres indépendants
+            candidates = total
+            for ids in sets:
+                candidates *= len(ids) / total if total else 0
+
+            # Parcourir l'ordre maintenu coûte environ wanted * total / candidates
+            # tickets ; intersecter les index puis sélectionner par tas coûte environ
+            # `candidates` tickets, chacun HEAP_COST_RATIO fois plus cher
+            if sort == ORDERED_FIELD and wanted * total < HEAP_COST_RATIO * candidates * candidates:
+                # Itérateurs chaînés : le parcours reste dans du code C
+                ticket_ids = map(itemgetter(1), reversed(self._order) if order == "desc" else self._order)
+                for ids in sets:
+                    ticket_ids = filter(ids.__contains__, ticket_ids)
+                rows = map(self._rows.__getitem__, ticket_ids)
+                if remaining:
+                    rows = filter(accepted, rows)
+                picked = list(islice(rows, wanted))
+            else:
+                if sets:
+                    rows = [self._rows[ticket_id] for ticket_id in sets[0].intersection(*sets[1:])]
+                else:
+                    rows = self._rows.values()
+                position = self._positions[sort]
+                select = heapq.nlargest if order == "desc" else heapq.nsmallest
+                picked = select(wanted, filter(accepted, rows), key=lambda row: (row[position] or "", row[0]))
+
+        items = [self._to_ticket(row, fields) for row in picked[offset:offset + limit]]
+        next_cursor = str(offset + limit) if len(picked) > offset + limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état de la réplique.
+
+        Returns:
+            Nombre de tickets, date de mise à jour la plus récente et compteurs de synchronisation
+        """
+        with self._lock:
+            return {
+                "tickets": len(self._rows),
+                "high_water": self._high_water,
+                "full_syncs": self.full_syncs,
+                "delta_queries": self.delta_queries,
+                "delta_rows": self.delta_rows,
+                "events_applied": self.events_applied,
+            }
@@ -0,0 +1,77 @@
+import streamlit as st
+
+import config
+from utils.api import ApiClient
+
+# Ressources partagées par toutes les sessions du processus. Elles sont définies
+# ici plutôt que dans app.py pour que le préchauffage (utils.startup) puisse les
+# créer avant la première session : `st.cache_resource` renvoie ensuite les mêmes
+# instances au script. Les modules lourds (pandas, numpy) ne sont importés qu'à
+# la création de la ressource qui en a besoin.
+
+
+# Mesures du frontend (requêtes vers l'API, durée des pages), exportées au format Prometheus
+@st.cache_resource
+def get_metrics():
+    from utils.metrics import MetricsRegistry, start_metrics_server
+    metrics = MetricsRegistry()
+    if config.METRICS_PORT:
+        start_metrics_server(metrics, config.METRICS_HOST, config.METRICS_PORT)
+    return metrics
+
+# Initialisation de l'API client
+@st.cache_resource
+def get_api_client():
+    client = ApiClient(
+        config.API_URL,
+        pool_size=config.API_POOL_SIZE,
+        timeout=(config.API_CONNECT_TIMEOUT, config.API_READ_TIMEOUT),
+        max_retries=config.API_MAX_RETRIES,
+        backoff_factor=config.API_RETRY_BACKOFF,
+        cache_size=config.API_CACHE_SIZE,
+        cache_ttls=config.API_CACHE_TTLS,
+        validator_cache_size=config.API_VALIDATOR_CACHE_SIZE,
+        service_key=config.API_SERVICE_KEY,
+    )
+    client.add_hook(get_metrics().record_request)
+    return client
+
+# Analyses du tableau de bord partagées entre les sessions
+@st.cache_resource
+def get_analytics_store():
+    from utils.analytics import AnalyticsStore
+    return AnalyticsStore()
+
+# Écoute du flux des modifications de tickets, partagée par les sessions
+@st.cache_resource
+def get_feed_listener():
+    from utils.feed import TicketFeedListener
+    return TicketFeedListener(
+        f"{config.API_URL}/tickets/changes",
+        service_key=config.API_SERVICE_KEY,
+        connect_timeout=config.API_CONNECT_TIMEOUT,
+    ).start()
+
+# Réplique en mémoire des tickets partagée par les sessions, tenue à jour par le flux
+@st.cache_resource
+def get_ticket_replica():
+    from utils.replica import TicketReplica
+    replica = TicketReplica(
+        get_api_client(),
+        sync_interval=config.TICKET_REPLICA_SYNC_INTERVAL,
+        full_sync_interval=config.TICKET_REPLICA_FULL_SYNC_INTERVAL,
+    )
+    get_feed_listener().add_replica(replica)
+    return replica
+
+# Index de similarité des tickets ouverts (détection des doublons), tenu à jour par le flux
+@st.cache_resource
+def get_similarity_index():
+    from utils.similarity import SimilarityIndex
+    index = SimilarityIndex(
+        get_api_client(),
+        threshold=config.DUPLICATE_THRESHOLD,
+        rebuild_interval=config.SIMILARITY_REBUILD_INTERVAL,
+    )
+    get_feed_listener().add_replica(index)
+    return index
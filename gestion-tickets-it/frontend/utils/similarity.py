@@ -0,0 +1,444 @@
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from utils.api import service_identity
+from utils.feed import normalize_filter_value
+
+# Statuts (normalisés) des tickets comparés aux nouvelles demandes
+OPEN_STATUSES = ("ouvert", "en cours")
+
+# Champs lus pour construire l'index (la description ne sert qu'au calcul des empreintes)
+SIMILARITY_FIELDS = ["id", "titre", "description", "statut", "priorite", "date_creation"]
+
+# Champs conservés pour afficher les tickets similaires
+DISPLAY_FIELDS = ["id", "titre", "statut", "priorite", "date_creation"]
+
+# Mots trop fréquents pour distinguer deux demandes
+STOP_WORDS = frozenset("""
+    au aux avec ce ces cette dans de des du elle en est et il ils je la le les leur ma mais me mes
+    mon ne nous on ou par pas plus pour qu que qui sa se ses son sur ta te tes ton tu un une vos
+    votre vous y a ai as avons ont suis sont etait etre fait faire depuis tres bien aussi donc
+    bonjour merci cordialement svp plait encore toujours
+""".split())
+
+_WORD = re.compile(r"\w+")
+
+# Nombre premier supérieur à 2**32 pour les permutations (a * x + b) mod p
+_PRIME = np.uint64(4294967311)
+
+# Écart toléré entre la similarité estimée par les signatures et la similarité exacte
+ESTIMATE_MARGIN = 0.1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en mots significatifs, normalisés comme la collation MySQL.
+
+    Args:
+        text: Titre ou description
+
+    Returns:
+        Les mots, sans mots vides ni marque du pluriel
+    """
+    words = []
+    for word in _WORD.findall(normalize_filter_value(text) or ""):
+        if len(word) < 2 or word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word[-1] in "sx":
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def _fragments(words: List[str], prefix: str = "") -> Set[str]:
+    fragments = {prefix + word for word in words}
+    fragments.update(f"{prefix}{first} {second}" for first, second in zip(words, words[1:]))
+    return fragments
+
+
+def shingles(titre: str, description: str = "") -> FrozenSet[int]:
+    """
+    Calcule l'ensemble des fragments (mots et paires de mots consécutifs) d'une demande.
+
+    Les mots seuls rapprochent des demandes formulées différemment, les paires
+    des demandes reprenant la même expression. Les fragments du titre sont
+    distincts de ceux de la description : un titre commun pèse davantage qu'un
+    mot commun dans deux descriptions longues.
+
+    Returns:
+        Les empreintes 32 bits des fragments
+    """
+    fragments = _fragments(tokenize(titre), "titre:") | _fragments(tokenize(description))
+    return frozenset(zlib.crc32(fragment.encode()) for fragment in fragments)
+
+
+def jaccard(first: FrozenSet[int], second: FrozenSet[int]) -> float:
+    """Indice de Jaccard entre deux ensembles de fragments."""
+    if not first or not second:
+        return 0.0
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+
+class _IndexData:
+    """Tickets indexés : signatures (une ligne par ticket), fragments et bandes LSH."""
+
+    def __init__(self, num_perm: int, bands: int, capacity: int = 1024):
+        self.tickets: Dict[int, Dict[str, Any]] = {}
+        self.shingles: Dict[int, FrozenSet[int]] = {}
+        self.row_of: Dict[int, int] = {}
+        self.free_rows: List[int] = []
+        self.signatures = np.zeros((capacity, num_perm), dtype=np.uint32)
+        self.buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+
+    def allocate_row(self) -> int:
+        if self.free_rows:
+            return self.free_rows.pop()
+        row = len(self.row_of)
+        if row == len(self.signatures):
+            self.signatures = np.concatenate([self.signatures, np.zeros_like(self.signatures)])
+        return row
+
+    def snapshot(self) -> "_IndexData":
+        """Copie des tickets, fragments et signatures (sans les bandes LSH), lisible hors verrou."""
+        copy = _IndexData(self.signatures.shape[1], 0, capacity=0)
+        ids = list(self.row_of)
+        copy.tickets = dict(self.tickets)
+        copy.shingles = dict(self.shingles)
+        copy.row_of = {ticket_id: row for row, ticket_id in enumerate(ids)}
+        copy.signatures = self.signatures[[self.row_of[ticket_id] for ticket_id in ids]]
+        return copy
+
+
+class SimilarityIndex:
+    """
+    Index de similarité des tickets ouverts, partagé par toutes les sessions du processus.
+
+    Chaque ticket est résumé par une signature MinHash de ses fragments (titre et
+    description) ; la signature est découpée en bandes, et deux tickets dont une
+    bande est identique sont candidats (LSH). Une recherche ne compare donc le
+    texte soumis qu'aux tickets partageant une bande : leur similarité est estimée
+    en une opération vectorisée sur les signatures, puis vérifiée exactement pour
+    les plus proches.
+
+    L'index est chargé une fois depuis l'API, puis tenu à jour par le flux de
+    modifications (un ticket résolu ou fermé en sort) et rechargé périodiquement.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        num_perm: int = 128,
+        rows_per_band: int = 2,
+        threshold: float = 0.25,
+        rebuild_interval: float = 600.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            api_client: Client API
+            num_perm: Nombre de permutations de la signature MinHash
+            rows_per_band: Valeurs de la signature par bande LSH (moins de valeurs :
+                plus de candidats comparés, moins de doublons manqués)
+            threshold: Similarité (Jaccard) minimale d'un doublon probable
+            rebuild_interval: Intervalle (s) entre deux rechargements complets
+            seed: Graine des permutations
+        """
+        if num_perm % rows_per_band:
+            raise ValueError("num_perm doit être un multiple de rows_per_band")
+        self.api_client = api_client
+        self.num_perm = num_perm
+        self.rows_per_band = rows_per_band
+        self.bands = num_perm // rows_per_band
+        self.threshold = threshold
+        self.rebuild_interval = rebuild_interval
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32 - 1, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32 - 1, size=(num_perm, 1), dtype=np.uint64)
+
+        self._data = _IndexData(num_perm, self.bands)
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._ready = False
+        self._pending: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self._last_build = 0.0
+
+        self.builds = 0
+        self.queries = 0
+        self.candidates_checked = 0
+
+    # --- Signatures ---
+
+    def signature(self, fragments: FrozenSet[int]) -> np.ndarray:
+        """
+        Calcule la signature MinHash d'un ensemble de fragments.
+
+        Returns:
+            Pour chaque permutation, la plus petite image d'un fragment (32 bits)
+        """
+        if not fragments:
+            return np.full(self.num_perm, 2 ** 32 - 1, dtype=np.uint32)
+        values = np.fromiter(fragments, dtype=np.uint64, count=len(fragments))
+        # a, b et les fragments tiennent sur 32 bits : a * x + b ne déborde pas de 64 bits
+        return ((self._a * values + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows_per_band)]
+
+    # --- Maintenance de l'index ---
+
+    def _add(self, data: _IndexData, ticket: Dict[str, Any]) -> None:
+        ticket_id = ticket["id"]
+        # Un ticket peut changer de statut entre les lectures des différents statuts ouverts
+        self._remove(data, ticket_id)
+        fragments = shingles(ticket.get("titre") or "", ticket.get("description") or "")
+        signature = self.signature(fragments)
+        row = data.allocate_row()
+        data.signatures[row] = signature
+        data.row_of[ticket_id] = row
+        data.tickets[ticket_id] = {field: ticket.get(field) for field in DISPLAY_FIELDS}
+        data.shingles[ticket_id] = fragments
+        for bucket, key in zip(data.buckets, self._band_keys(signature)):
+            bucket.setdefault(key, set()).add(ticket_id)
+
+    def _remove(self, data: _IndexData, ticket_id: int) -> None:
+        row = data.row_of.pop(ticket_id, None)
+        if row is None:
+            return
+        del data.tickets[ticket_id]
+        del data.shingles[ticket_id]
+        for bucket, key in zip(data.buckets, self._band_keys(data.signatures[row])):
+            ids = bucket.get(key)
+            if ids is not None:
+                ids.discard(ticket_id)
+                if not ids:
+                    del bucket[key]
+        data.free_rows.append(row)
+
+    def _upsert(self, ticket: Dict[str, Any]) -> None:
+        if normalize_filter_value(ticket.get("statut")) in OPEN_STATUSES:
+            self._add(self._data, ticket)
+        else:
+            self._remove(self._data, ticket["id"])
+
+    def _build(self) -> None:
+        """Recharge les tickets ouverts ; les événements reçus pendant le chargement sont rejoués."""
+        with self._lock:
+            self._pending = []
+
+        data = _IndexData(self.num_perm, self.bands)
+        try:
+            with service_identity():
+                for status in OPEN_STATUSES:
+                    for chunk in self.api_client.iter_ticket_chunks({"statut": status}, SIMILARITY_FIELDS):
+                        for ticket in chunk:
+                            self._add(data, ticket)
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            self._data = data
+            pending, self._pending = self._pending, None
+            for event_type, event in pending:
+                self._apply_locked(event_type, event)
+            self._ready = True
+            # Un index vide (aucun ticket ouvert ou API en erreur) est reconstruit à la prochaine recherche
+            self._last_build = time.monotonic() if data.tickets else 0.0
+            self.builds += 1
+
+    def sync(self) -> None:
+        """
+        Charge l'index au premier appel, puis le recharge à l'échéance.
+
+        Pendant un rechargement, les autres sessions continuent d'interroger
+        l'index existant.
+        """
+        if not self._ready:
+            with self._build_lock:
+                if not self._ready:
+                    self._build()
+            return
+
+        if time.monotonic() - self._last_build < self.rebuild_interval:
+            return
+        if not self._build_lock.acquire(blocking=False):
+            return
+        try:
+            self._build()
+        finally:
+            self._build_lock.release()
+
+    def add(self, ticket: Dict[str, Any]) -> None:
+        """
+        Ajoute un ticket créé par cette application, sans attendre le flux.
+
+        Args:
+            ticket: Ticket avec au moins id, titre, description et statut
+        """
+        with self._lock:
+            if self._ready:
+                self._upsert(ticket)
+
+    # --- Flux de modifications ---
+
+    def _apply_locked(self, event_type: str, event: Dict[str, Any]) -> None:
+        if event_type == "reset":
+            # Des modifications ont été manquées : rechargement à la prochaine recherche
+            self._last_build = 0.0
+            return
+        ticket = event.get("ticket")
+        if event_type == "deleted" or ticket is None:
+            self._remove(self._data, event.get("id"))
+        elif event_type in ("created", "updated"):
+            self._upsert(ticket)
+
+    def apply(self, event_type: str, event: Dict[str, Any]) -> None:
+        """
+        Applique un événement du flux de modifications (appelé par `TicketFeedListener`).
+
+        Args:
+            event_type: created, updated, deleted ou reset
+            event: Données de l'événement ({"id", "ticket", ...})
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((event_type, event))
+            elif self._ready:
+                self._apply_locked(event_type, event)
+
+    # --- Recherche ---
+
+    def _similar_ids(
+        self,
+        data: _IndexData,
+        buckets: List[Dict[bytes, Set[int]]],
+        fragments: FrozenSet[int],
+        signature: np.ndarray,
+        threshold: float,
+    ) -> List[Tuple[float, int]]:
+        """
+        Tickets des bandes LSH dont la similarité avec des fragments atteint le seuil
+        (à appeler sous verrou, sauf sur une copie de l'index).
+
+        Returns:
+            Des couples (similarité exacte, id)
+        """
+        candidates: Set[int] = set()
+        for bucket, key in zip(buckets, self._band_keys(signature)):
+            ids = bucket.get(key)
+            if ids:
+                candidates.update(ids)
+        if not candidates:
+            return []
+        self.candidates_checked += len(candidates)
+
+        # Proportion de valeurs de signature égales : estimation de l'indice de Jaccard
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        rows = np.fromiter(map(data.row_of.__getitem__, candidates), dtype=np.int64, count=len(candidates))
+        estimates = (data.signatures[rows] == signature).mean(axis=1)
+        similar = []
+        for ticket_id in ids[estimates >= threshold - ESTIMATE_MARGIN].tolist():
+            score = jaccard(fragments, data.shingles[ticket_id])
+            if score >= threshold:
+                similar.append((score, ticket_id))
+        return similar
+
+    def find_similar(
+        self,
+        titre: str,
+        description: str = "",
+        limit: int = 5,
+        threshold: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche les tickets ouverts décrivant probablement le même problème.
+
+        Args:
+            titre: Titre de la demande
+            description: Description de la demande
+            limit: Nombre maximal de tickets renvoyés
+            threshold: Similarité minimale (par défaut celle de l'index)
+
+        Returns:
+            Les tickets similaires avec leur similarité (0 à 1), du plus proche au moins proche
+        """
+        self.sync()
+        threshold = self.threshold if threshold is None else threshold
+        fragments = shingles(titre, description)
+        if not fragments:
+            return []
+        signature = self.signature(fragments)
+
+        with self._lock:
+            self.queries += 1
+            data = self._data
+            scored = self._similar_ids(data, data.buckets, fragments, signature, threshold)
+            scored.sort(key=lambda item: (-item[0], -item[1]))
+            return [{**data.tickets[ticket_id], "similarite": score} for score, ticket_id in scored[:limit]]
+
+    def clusters(self, threshold: Optional[float] = None, min_size: int = 2) -> List[List[Dict[str, Any]]]:
+        """
+        Regroupe les tickets ouverts similaires (incidents signalés plusieurs fois).
+
+        Les tickets sont parcourus du plus ancien au plus récent : chacun rejoint le
+        groupe du premier signalement dont il est le plus proche, s'il atteint le
+        seuil, et devient sinon le premier signalement d'un nouveau groupe. Chaque
+        ticket n'est comparé qu'aux premiers signalements, via leurs propres bandes
+        LSH, ce qui évite aussi d'enchaîner des tickets de proche en proche.
+
+        Args:
+            threshold: Similarité minimale avec le premier signalement (par défaut celle de l'index)
+            min_size: Taille minimale d'un groupe renvoyé
+
+        Returns:
+            Les groupes, du plus grand au plus petit, chacun trié du ticket le plus ancien au plus récent
+        """
+        self.sync()
+        threshold = self.threshold if threshold is None else threshold
+        leader_buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(self.bands)]
+        groups: Dict[int, List[Dict[str, Any]]] = {}
+
+        # Le regroupement (plusieurs secondes sur un grand index) se fait sur une
+        # copie : les recherches et le flux de modifications ne l'attendent pas
+        with self._lock:
+            data = self._data.snapshot()
+
+        tickets = sorted(data.tickets.values(), key=lambda ticket: (ticket.get("date_creation") or "", ticket["id"]))
+        for ticket in tickets:
+            ticket_id = ticket["id"]
+            signature = data.signatures[data.row_of[ticket_id]]
+            similar = self._similar_ids(data, leader_buckets, data.shingles[ticket_id], signature, threshold)
+            if similar:
+                groups[max(similar)[1]].append(ticket)
+                continue
+            groups[ticket_id] = [ticket]
+            for bucket, key in zip(leader_buckets, self._band_keys(signature)):
+                bucket.setdefault(key, set()).add(ticket_id)
+
+        result = [members for members in groups.values() if len(members) >= min_size]
+        result.sort(key=len, reverse=True)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état de l'index.
+
+        Returns:
+            Tickets indexés, chargements, recherches et candidats comparés
+        """
+        with self._lock:
+            return {
+                "tickets": len(self._data.tickets),
+                "bands": self.bands,
+                "builds": self.builds,
+                "queries": self.queries,
+                "candidates_checked": self.candidates_checked,
+            }
@@ -0,0 +1,155 @@
+import importlib
+import logging
+import os
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modules lourds chargés par le préchauffage plutôt que par la première page qui
+# les utilise : pandas et numpy (listes, analyses), pyarrow (sérialisation des
+# tableaux), altair (graphiques) et les modules des pages qui en dépendent
+WARMUP_MODULES = [
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "altair",
+    "utils.ui",
+    "utils.feed",
+    "utils.replica",
+    "utils.analytics",
+    "utils.similarity",
+]
+
+# Libellés des étapes du démarrage, dans leur ordre habituel
+PHASES = {
+    "server_ready": "Serveur Streamlit prêt",
+    "modules_imported": "Modules importés",
+    "api_connected": "API connectée",
+    "replica_loaded": "Réplique des tickets chargée",
+    "similarity_loaded": "Index de similarité chargé",
+    "first_render": "Première page affichée",
+}
+
+# Début du processus : fixé par start.py avant l'import de Streamlit, sinon au
+# premier import de ce module
+_started_at = float(os.environ.get("FRONTEND_STARTED_AT") or time.time())
+_phases: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def mark(phase: str, duration: Optional[float] = None) -> None:
+    """
+    Enregistre la fin d'une étape du démarrage (seule la première occurrence compte).
+
+    Args:
+        phase: Identifiant de l'étape (clé de `PHASES`)
+        duration: Durée propre de l'étape en secondes, si elle est connue
+    """
+    elapsed = time.time() - _started_at
+    with _lock:
+        if phase in _phases:
+            return
+        _phases[phase] = {"elapsed": elapsed, "duration": duration}
+    logger.info("Démarrage : %s après %.2f s%s", PHASES.get(phase, phase), elapsed,
+                f" (étape : {duration:.2f} s)" if duration is not None else "")
+
+
+def report() -> List[Dict[str, Any]]:
+    """
+    Retourne les étapes du démarrage franchies, dans l'ordre chronologique.
+
+    Returns:
+        Une ligne par étape : libellé, secondes depuis le lancement et durée propre
+    """
+    with _lock:
+        phases = dict(_phases)
+    return [
+        {
+            "etape": PHASES.get(phase, phase),
+            "depuis_lancement_s": round(values["elapsed"], 2),
+            "duree_s": round(values["duration"], 2) if values["duration"] is not None else None,
+        }
+        for phase, values in sorted(phases.items(), key=lambda item: item[1]["elapsed"])
+    ]
+
+
+def _wait_for_server(timeout: float) -> None:
+    """Enregistre l'instant où le serveur Streamlit répond à sa sonde de santé."""
+    from streamlit import config as streamlit_config
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        url = f"http://127.0.0.1:{streamlit_config.get_option('server.port')}/_stcore/health"
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    mark("server_ready")
+                    return
+        except OSError:
+            pass
+        time.sleep(0.1)
+
+
+def warm_up(preload: bool = True, connections: int = 4, api_timeout: float = 120) -> None:
+    """
+    Prépare le processus avant la première session : importe les modules lourds,
+    ouvre les connexions vers l'API puis charge les ressources partagées.
+
+    Les ressources sont créées par les fonctions de `utils.resources` : le script
+    de l'application retrouve ensuite les mêmes instances (`st.cache_resource`).
+
+    Args:
+        preload: Charger la réplique des tickets et l'index de similarité
+        connections: Nombre de connexions keep-alive ouvertes vers l'API
+        api_timeout: Délai maximal (s) d'attente de l'API (démarrage simultané des conteneurs)
+    """
+    started = time.perf_counter()
+    for module in WARMUP_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as error:
+            logger.warning("Préchauffage : import de %s impossible : %s", module, error)
+    mark("modules_imported", time.perf_counter() - started)
+
+    from utils.resources import get_api_client, get_ticket_replica, get_similarity_index
+
+    started = time.perf_counter()
+    client = get_api_client()
+    deadline = time.monotonic() + api_timeout
+    while not client.warm_up(connections):
+        if time.monotonic() >= deadline:
+            logger.warning("Préchauffage : API injoignable après %.0f s, ressources chargées à la demande", api_timeout)
+            return
+        time.sleep(2)
+    mark("api_connected", time.perf_counter() - started)
+
+    if not preload:
+        return
+    started = time.perf_counter()
+    get_ticket_replica().sync()
+    mark("replica_loaded", time.perf_counter() - started)
+    started = time.perf_counter()
+    get_similarity_index().sync()
+    mark("similarity_loaded", time.perf_counter() - started)
+
+
+def start_warm_up(server_timeout: float = 60, **kwargs: Any) -> None:
+    """
+    Lance le préchauffage et la surveillance du serveur dans des threads d'arrière-plan :
+    le serveur accepte les connexions sans attendre leur fin.
+
+    Args:
+        server_timeout: Délai maximal (s) d'attente de la sonde de santé de Streamlit
+        kwargs: Paramètres de `warm_up`
+    """
+    def run() -> None:
+        try:
+            warm_up(**kwargs)
+        except Exception:
+            logger.exception("Préchauffage interrompu")
+
+    threading.Thread(target=_wait_for_server, args=(server_timeout,), name="startup-probe", daemon=True).start()
+    threading.Thread(target=run, name="warm-up", daemon=True).start()
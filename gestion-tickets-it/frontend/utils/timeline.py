@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Calcul des durées passées par un ticket dans chaque statut, à partir de son
+# historique (GET /tickets/:id/events). Seuls les événements du ticket sont lus :
+# aucune requête sur l'ensemble des tickets n'est nécessaire.
+
+# Statuts considérés comme résolus (même liste que utils.analytics, sans dépendre de pandas)
+RESOLVED_STATUSES = ["résolu", "fermé"]
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Convertit une date ISO 8601 de l'API en datetime UTC.
+
+    Args:
+        value: Date renvoyée par l'API (ex. "2025-01-02T08:30:00.000Z")
+
+    Returns:
+        La date avec fuseau UTC, ou None si elle est absente ou invalide
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_duration(hours: float) -> str:
+    """
+    Formate une durée en heures pour l'affichage (jours, heures ou minutes).
+
+    Args:
+        hours: Durée en heures
+
+    Returns:
+        La durée lisible, par ex. "2 j 3 h", "5 h 20 min" ou "12 min"
+    """
+    minutes = int(round(hours * 60))
+    days, minutes = divmod(minutes, 24 * 60)
+    hours_part, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days} j {hours_part} h"
+    if hours_part:
+        return f"{hours_part} h {minutes} min"
+    return f"{minutes} min"
+
+
+def status_periods(
+    ticket: Dict[str, Any],
+    events: List[Dict[str, Any]],
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Reconstitue les périodes successives d'un ticket dans chaque statut.
+
+    Le statut initial est celui de l'événement de création ; pour un ticket créé
+    avant la mise en place de l'historique, la période commence à sa date de
+    création avec l'ancien statut du premier changement (ou son statut actuel).
+
+    Args:
+        ticket: Ticket (date_creation, statut)
+        events: Historique du ticket, du plus ancien au plus récent
+        now: Fin de la période en cours (maintenant par défaut)
+
+    Returns:
+        Une période par statut traversé : statut (en minuscules), début, fin et en_cours
+    """
+    now = now or datetime.now(timezone.utc)
+    changes = [event for event in events if event.get("type") in ("creation", "statut")]
+    creation = next((event for event in changes if event["type"] == "creation"), None)
+
+    if creation:
+        status, started = creation.get("nouvelle_valeur"), parse_timestamp(creation.get("date_evenement"))
+    else:
+        first_change = next(iter(changes), None)
+        status = first_change.get("ancienne_valeur") if first_change else ticket.get("statut")
+        started = parse_timestamp(ticket.get("date_creation"))
+
+    periods = []
+    for event in changes:
+        if event["type"] != "statut":
+            continue
+        changed_at = parse_timestamp(event.get("date_evenement"))
+        if started and changed_at and status:
+            periods.append({"statut": status.lower(), "debut": started, "fin": changed_at, "en_cours": False})
+        status, started = event.get("nouvelle_valeur"), changed_at
+
+    if started and status:
+        periods.append({"statut": status.lower(), "debut": started, "fin": max(now, started), "en_cours": True})
+    return periods
+
+
+def state_durations(
+    ticket: Dict[str, Any],
+    events: List[Dict[str, Any]],
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Calcule le temps passé par un ticket dans chaque statut et son temps de résolution.
+
+    Args:
+        ticket: Ticket (date_creation, statut)
+        events: Historique du ticket, du plus ancien au plus récent
+        now: Fin de la période en cours (maintenant par défaut)
+
+    Returns:
+        Dictionnaire avec, par statut dans l'ordre de premier passage, la durée
+        cumulée en heures et le nombre de passages (`statuts`), le statut en cours
+        (`statut_actuel`) et la durée en heures jusqu'au premier passage dans un
+        statut résolu (`heures_resolution`, None si le ticket n'a jamais été résolu)
+    """
+    periods = status_periods(ticket, events, now)
+    durations: Dict[str, Dict[str, Any]] = {}
+    for period in periods:
+        entry = durations.setdefault(period["statut"], {"heures": 0.0, "passages": 0})
+        entry["heures"] += (period["fin"] - period["debut"]).total_seconds() / 3600
+        entry["passages"] += 1
+
+    resolved_at = next((period["debut"] for period in periods if period["statut"] in RESOLVED_STATUSES), None)
+    return {
+        "statuts": durations,
+        "statut_actuel": periods[-1]["statut"] if periods else None,
+        "heures_resolution": (resolved_at - periods[0]["debut"]).total_seconds() / 3600 if resolved_at else None,
+    }
@@ -1,33 +1,203 @@
 import streamlit as st
-import pandas as pd
-from typing import Dict, List, Any, Optional, Callable
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Callable
 
-def display_ticket_list(tickets: List[Dict[str, Any]], on_click: Optional[Callable[[int], None]] = None) -> None:
+# pandas n'est importé qu'à l'affichage d'un tableau ou d'un graphique : les pages
+# qui n'en affichent pas (connexion, formulaires) ne paient pas son chargement
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Colonnes affichées par les listes (champ de l'API -> libellé). Les pages ne
+# demandent que ces champs à l'API (projection `fields`).
+TICKET_LIST_COLUMNS = {
+    "id": "ID",
+    "titre": "Titre",
+    "statut": "Statut",
+    "priorite": "Priorité",
+    "date_creation": "Créé le",
+    "date_mise_a_jour": "Mis à jour le"
+}
+
+# Scores ajoutés par la recherche plein texte et la détection des doublons
+SCORE_COLUMNS = {
+    "pertinence": "Pertinence",
+    "similarite": "Similarité",
+}
+
+USER_LIST_COLUMNS = {
+    "id": "ID",
+    "nom": "Nom",
+    "email": "Email",
+    "role": "Rôle",
+    "date_inscription": "Date d'inscription"
+}
+
+def get_page_cursor(pagination_key: str, filters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Retourne le curseur de la page courante d'une liste paginée.
+    
+    La pile des curseurs visités est conservée dans la session et remise à zéro
+    lorsque les filtres de la liste changent.
+    
+    Args:
+        pagination_key: Identifiant de la liste paginée
+        filters: Filtres actifs de la liste
+        
+    Returns:
+        Curseur à envoyer à l'API (None pour la première page)
+    """
+    signature = repr(sorted((filters or {}).items()))
+    state = st.session_state.setdefault(f"{pagination_key}_pagination", {"filters": signature, "cursors": [None]})
+    
+    if state["filters"] != signature:
+        state["filters"] = signature
+        state["cursors"] = [None]
+    
+    return state["cursors"][-1]
+
+def display_pagination_controls(pagination_key: str, next_cursor: Optional[str]) -> None:
+    """
+    Affiche les boutons de navigation entre les pages d'une liste paginée.
+    
+    Args:
+        pagination_key: Identifiant de la liste paginée
+        next_cursor: Curseur de la page suivante (None s'il n'y en a pas)
+    """
+    state = st.session_state.setdefault(f"{pagination_key}_pagination", {"filters": None, "cursors": [None]})
+    cursors = state["cursors"]
+    
+    def previous_page():
+        if len(cursors) > 1:
+            cursors.pop()
+    
+    def next_page():
+        cursors.append(next_cursor)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    col1.button("← Précédent", key=f"{pagination_key}_prev", disabled=len(cursors) <= 1, on_click=previous_page)
+    col2.caption(f"Page {len(cursors)}")
+    col3.button("Suivant →", key=f"{pagination_key}_next", disabled=not next_cursor, on_click=next_page)
+
+def display_selectable_grid(
+    df_display: "pd.DataFrame",
+    ids: "pd.Series",
+    key: str,
+    on_click: Optional[Callable[[int], None]] = None,
+    window_size: int = 500,
+    multi_select: bool = False,
+) -> List[int]:
+    """
+    Affiche un DataFrame dans une grille unique, triable et sélectionnable.
+    
+    Le tri est appliqué sur le DataFrame complet (opération vectorisée), puis
+    seule une fenêtre de `window_size` lignes est envoyée au navigateur, qui
+    virtualise lui-même l'affichage des lignes visibles. La sélection d'une
+    ligne déclenche `on_click` avec l'identifiant correspondant ; en sélection
+    multiple, les identifiants des lignes cochées sont renvoyés.
+    
+    Args:
+        df_display: Données à afficher (colonnes déjà renommées)
+        ids: Identifiants alignés sur les lignes de `df_display`
+        key: Clé unique de la grille
+        on_click: Fonction appelée avec l'identifiant de la ligne sélectionnée
+        window_size: Nombre maximal de lignes envoyées au navigateur
+        multi_select: Autoriser la sélection de plusieurs lignes (sans navigation)
+        
+    Returns:
+        Identifiants des lignes sélectionnées en sélection multiple, liste vide sinon
+    """
+    df_display = df_display.assign(_id=ids.to_numpy())
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_column = col1.selectbox("Trier par", list(df_display.columns[:-1]), key=f"{key}_sort")
+    descending = col2.toggle("Décroissant", value=True, key=f"{key}_desc")
+    
+    df_sorted = df_display.sort_values(sort_column, ascending=not descending, kind="stable")
+    
+    start = 0
+    if len(df_sorted) > window_size:
+        last_start = (len(df_sorted) - 1) // window_size * window_size
+        start = col3.number_input(
+            "Première ligne",
+            min_value=0,
+            max_value=last_start,
+            value=0,
+            step=window_size,
+            key=f"{key}_window",
+        )
+        st.caption(f"Lignes {start + 1} à {min(start + window_size, len(df_sorted))} sur {len(df_sorted)}")
+    
+    df_window = df_sorted.iloc[start:start + window_size]
+    
+    def select_row():
+        rows = st.session_state[key].selection.rows
+        if on_click and rows:
+            on_click(int(df_window["_id"].iloc[rows[0]]))
+    
+    if multi_select:
+        event = st.dataframe(
+            df_window,
+            key=f"{key}_multi",
+            hide_index=True,
+            column_order=list(df_window.columns[:-1]),
+            on_select="rerun",
+            selection_mode="multi-row",
+        )
+        return [int(ticket_id) for ticket_id in df_window["_id"].iloc[event.selection.rows]]
+    
+    st.dataframe(
+        df_window,
+        key=key,
+        hide_index=True,
+        column_order=list(df_window.columns[:-1]),
+        on_select=select_row if on_click else "ignore",
+        selection_mode="single-row",
+    )
+    return []
+
+def display_ticket_list(
+    tickets: List[Dict[str, Any]],
+    on_click: Optional[Callable[[int], None]] = None,
+    pagination_key: Optional[str] = None,
+    next_cursor: Optional[str] = None,
+    mode: str = "grid",
+    multi_select: bool = False,
+    key: Optional[str] = None,
+) -> List[int]:
+    if pagination_key:
+        display_pagination_controls(pagination_key, next_cursor)
+    
     if not tickets:
         st.info("Aucun ticket disponible.")
-        return
+        return []
     
+    import pandas as pd
     df = pd.DataFrame(tickets)
     
     if not df.empty:
-        columns_to_display = {
-            "id": "ID",
-            "titre": "Titre",
-            "statut": "Statut",
-            "priorité": "Priorité",
-            "date_creation": "Créé le",
-            "date_mise_a_jour": "Mis à jour le"
-        }
+        columns_to_display = TICKET_LIST_COLUMNS
+        
+        # Résultats de recherche ou doublons probables : le score est la première colonne (tri par défaut)
+        for score, label in SCORE_COLUMNS.items():
+            if score in df.columns:
+                df[score] = df[score].astype(float).round(2)
+                columns_to_display = {score: label, **TICKET_LIST_COLUMNS}
         
         available_columns = [col for col in columns_to_display if col in df.columns]
         display_columns = {col: columns_to_display[col] for col in available_columns}
         
         df_display = df[available_columns].rename(columns=display_columns)
         
-        # Affichage du tableau des tickets avec les informations
-        # st.dataframe(df_display)
+        # Affichage du tableau des tickets dans une grille unique (mode par défaut)
+        if mode == "grid":
+            return display_selectable_grid(
+                df_display,
+                df["id"],
+                key=f"{key or pagination_key or 'tickets'}_grid",
+                on_click=on_click,
+                multi_select=multi_select,
+            )
         
-        # Ajouter le bouton "Voir détails" avec le numéro du ticket sur la même ligne
+        # Mode historique : une ligne de colonnes et un bouton "Voir détails" par ticket
         if on_click:
             for i, ticket in df.iterrows():
                 cols = st.columns(len(columns_to_display))  # Créer autant de colonnes que de champs
@@ -44,11 +214,41 @@ def display_ticket_list(tickets: List[Dict[str, Any]], on_click: Optional[Callab
                 st.empty()  # Crée un espace entre les lignes de tickets
     else:
         st.info("Aucun ticket disponible.")
+    return []
 
 
+def display_ticket_clusters(
+    clusters: List[List[Dict[str, Any]]],
+    on_click: Optional[Callable[[int], None]] = None,
+    max_groups: int = 20,
+) -> None:
+    """
+    Affiche des groupes de tickets ouverts signalant probablement le même incident.
+    
+    Args:
+        clusters: Groupes de tickets, du plus grand au plus petit, chacun trié du plus ancien au plus récent
+        on_click: Fonction appelée avec l'identifiant du ticket sélectionné
+        max_groups: Nombre maximal de groupes affichés
+    """
+    if not clusters:
+        st.info("Aucun groupe de tickets similaires.")
+        return
+    
+    st.caption(
+        f"{len(clusters)} groupe(s), {sum(len(cluster) for cluster in clusters)} ticket(s)"
+        + (f" — les {max_groups} plus grands groupes sont affichés" if len(clusters) > max_groups else "")
+    )
+    for position, cluster in enumerate(clusters[:max_groups]):
+        first = cluster[0]
+        st.markdown(f"**{len(cluster)} tickets** — premier signalement #{first['id']} : {first.get('titre', 'Sans titre')}")
+        display_ticket_list(cluster, on_click=on_click, key=f"ticket_cluster_{position}")
 
 
-def display_ticket_details(ticket: Dict[str, Any]) -> None:
+def display_ticket_details(
+    ticket: Dict[str, Any],
+    employee: Optional[Dict[str, Any]] = None,
+    technician: Optional[Dict[str, Any]] = None,
+) -> None:
     if not ticket:
         st.error("Ticket introuvable.")
         return
@@ -59,41 +259,126 @@ def display_ticket_details(ticket: Dict[str, Any]) -> None:
         st.subheader(ticket.get("titre", "Sans titre"))
         st.write(f"**ID:** {ticket.get('id', 'N/A')}")
         st.write(f"**Statut:** {ticket.get('statut', 'N/A')}")
-        st.write(f"**Priorité:** {ticket.get('priorité', 'N/A')}")
+        st.write(f"**Priorité:** {ticket.get('priorite', 'N/A')}")
     
     with col2:
         st.write(f"**Créé le:** {ticket.get('date_creation', 'N/A')}")
         st.write(f"**Dernière mise à jour:** {ticket.get('date_mise_a_jour', 'N/A')}")
-        st.write(f"**Créé par:** {ticket.get('id_employe', 'N/A')}")
-        st.write(f"**Assigné à:** {ticket.get('id_technicien', 'N/A') or 'Non assigné'}")
+        st.write(f"**Créé par:** {(employee or {}).get('nom') or ticket.get('id_employe', 'N/A')}")
+        st.write(f"**Assigné à:** {(technician or {}).get('nom') or ticket.get('id_technicien', 'N/A') or 'Non assigné'}")
     
     st.subheader("Description")
     st.write(ticket.get("description", "Aucune description"))
 
-def display_user_list(users: List[Dict[str, Any]], on_click: Optional[Callable[[int], None]] = None) -> None:
+
+def describe_ticket_event(event: Dict[str, Any], user_names: Optional[Dict[int, str]] = None) -> str:
+    """
+    Décrit un événement de l'historique d'un ticket en une ligne.
+    
+    Args:
+        event: Événement renvoyé par l'API (type, ancienne_valeur, nouvelle_valeur)
+        user_names: Noms des utilisateurs par id, pour les assignations
+    
+    Returns:
+        La description de l'événement
+    """
+    user_names = user_names or {}
+    
+    def name(user_id: Optional[str]) -> str:
+        return user_names.get(int(user_id), f"#{user_id}") if user_id else ""
+    
+    old, new = event.get("ancienne_valeur"), event.get("nouvelle_valeur")
+    if event.get("type") == "creation":
+        return f"Ticket créé (statut : {new})"
+    if event.get("type") == "statut":
+        return f"Statut : {old} → {new}"
+    if event.get("type") == "assignation":
+        if not new:
+            return f"Désassigné de {name(old)}"
+        return f"Réassigné de {name(old)} à {name(new)}" if old else f"Assigné à {name(new)}"
+    if event.get("type") == "suppression":
+        return f"Ticket supprimé (statut : {old})"
+    return "Commentaire"
+
+
+def display_ticket_timeline(
+    events: List[Dict[str, Any]],
+    durations: Dict[str, Any],
+    user_names: Optional[Dict[int, str]] = None,
+) -> None:
+    """
+    Affiche l'historique d'un ticket et le temps passé dans chaque statut.
+    
+    Args:
+        events: Historique du ticket, du plus ancien au plus récent
+        durations: Durées calculées par `utils.timeline.state_durations`
+        user_names: Noms des utilisateurs par id, pour les assignations
+    """
+    from utils.timeline import format_duration, parse_timestamp
+    
+    st.subheader("Temps passé par statut")
+    statuses = durations.get("statuts", {})
+    if statuses:
+        cols = st.columns(len(statuses))
+        for col, (status, entry) in zip(cols, statuses.items()):
+            suffix = " (actuel)" if status == durations.get("statut_actuel") else ""
+            col.metric(f"{status.capitalize()}{suffix}", format_duration(entry["heures"]),
+                       help=f"{entry['passages']} passage(s) dans ce statut")
+    if durations.get("heures_resolution") is not None:
+        st.write(f"**Temps de résolution :** {format_duration(durations['heures_resolution'])}")
+    
+    st.subheader("Historique")
+    if not events:
+        st.info("Aucun événement enregistré pour ce ticket.")
+        return
+    
+    for event in reversed(events):
+        moment = parse_timestamp(event.get("date_evenement"))
+        date = moment.strftime("%d/%m/%Y %H:%M") if moment else event.get("date_evenement", "")
+        author = event.get("auteur") or "Système"
+        st.markdown(f"**{date}** — {author} : {describe_ticket_event(event, user_names)}")
+        if event.get("type") == "commentaire":
+            st.caption(event.get("commentaire", ""))
+
+def display_user_list(
+    users: List[Dict[str, Any]],
+    on_click: Optional[Callable[[int], None]] = None,
+    mode: str = "grid",
+) -> None:
     if not users:
         st.info("Aucun utilisateur disponible.")
         return
     
     # Créer un DataFrame à partir de la liste d'utilisateurs
+    import pandas as pd
     df = pd.DataFrame(users)
     
     if not df.empty:
-        columns_to_display = {
-            "id": "ID",
-            "nom": "Nom",
-            "email": "Email",
-            "role": "Rôle",
-            "date_inscription": "Date d'inscription"
-        }
+        columns_to_display = USER_LIST_COLUMNS
         
         # Filtrer les colonnes disponibles dans le DataFrame
         available_columns = [col for col in columns_to_display if col in df.columns]
         display_columns = {col: columns_to_display[col] for col in available_columns}
         
-        df_display = df[available_columns].rename(columns=display_columns)
+        # Mode par défaut : recherche vectorisée sur le nom et l'email puis grille unique
+        if mode == "grid":
+            search = st.text_input("Rechercher (nom ou email)", key="user_list_search").strip()
+            if search:
+                mask = pd.Series(False, index=df.index)
+                for column in ("nom", "email"):
+                    if column in df.columns:
+                        mask |= df[column].astype(str).str.contains(search, case=False, regex=False)
+                df = df[mask]
+            
+            if df.empty:
+                st.info("Aucun utilisateur ne correspond à la recherche.")
+                return
+            
+            df_display = df[available_columns].rename(columns=display_columns)
+            display_selectable_grid(df_display, df["id"], key="user_list_grid", on_click=on_click)
+            return
         
-        # Afficher les utilisateurs dans une disposition de colonnes
+        # Mode historique : une ligne de colonnes et un bouton "Voir détails" par utilisateur
         for index, user in df.iterrows():
             cols = st.columns(len(columns_to_display))  # Crée autant de colonnes que de champs + 1 pour le bouton
             
@@ -115,6 +400,7 @@ def display_statistics(stats: Dict[str, Any]) -> None:
         st.error("Impossible de récupérer les statistiques.")
         return
     
+    import pandas as pd
     col1, col2, col3, col4 = st.columns(4)
 
     
@@ -151,6 +437,166 @@ def display_statistics(stats: Dict[str, Any]) -> None:
         priority_data = stats["tickets_par_priorite"]
         if priority_data:
             df_priority = pd.DataFrame(priority_data)
-            st.pie_chart(df_priority.set_index("priorité")["nombre"])
+            st.bar_chart(df_priority.set_index("priorité")["nombre"])
         else:
             st.info("Aucune donnée disponible sur la répartition des priorités.")
+
+
+def display_analytics(analytics) -> None:
+    if analytics is None:
+        st.error("Impossible de calculer les analyses des tickets.")
+        return
+    
+    st.subheader("Analyses des tickets")
+    
+    view = st.radio(
+        "Indicateur",
+        ["Activité quotidienne", "Backlog", "Temps de résolution", "SLA"],
+        horizontal=True,
+        key="analytics_view",
+    )
+    
+    # Seul l'indicateur affiché est calculé ; il reste mémorisé pour cette version des données
+    if view == "Activité quotidienne":
+        st.line_chart(analytics.daily_counts)
+    elif view == "Backlog":
+        st.area_chart(analytics.backlog)
+    elif view == "Temps de résolution":
+        col1, col2 = st.columns(2)
+        with col1:
+            st.caption("Par technicien (heures)")
+            st.dataframe(analytics.resolution_by_technician)
+        with col2:
+            st.caption("Par priorité (heures)")
+            st.dataframe(analytics.resolution_by_priority)
+    else:
+        sla = analytics.sla_breach_rates
+        if sla.empty:
+            st.info("Aucun SLA configuré pour les priorités existantes.")
+        else:
+            st.bar_chart(sla["taux"])
+            st.dataframe(sla)
+
+
+def display_http_cache_stats(
+    cache_stats: Dict[str, Any],
+    conditional_stats: Dict[str, Any],
+    server_stats: Dict[str, Any],
+) -> None:
+    """
+    Affiche l'efficacité du cache de lecture et des requêtes conditionnelles (ETag).
+    
+    Args:
+        cache_stats: Compteurs du cache de lecture du client
+        conditional_stats: Compteurs des revalidations du client
+        server_stats: Compteurs des réponses 304 côté serveur
+    """
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Succès du cache", f"{cache_stats.get('hit_rate', 0):.0%}")
+    with col2:
+        st.metric("Réponses 304", conditional_stats.get("not_modified", 0))
+    with col3:
+        st.metric("Octets évités", f"{conditional_stats.get('bytes_avoided', 0) / 1024:.1f} Ko")
+    with col4:
+        st.metric("Requêtes SQL évitées (serveur)", server_stats.get("queries_avoided", 0))
+
+
+def display_assignment_stats(assignment: Dict[str, Any], technician_names: Optional[Dict[int, str]] = None) -> None:
+    """
+    Affiche l'état de l'assignation automatique : charge de chaque technicien et file d'attente.
+    
+    Args:
+        assignment: État renvoyé par l'API (/statistics/assignment)
+        technician_names: Noms des techniciens par id
+    """
+    if not assignment:
+        return
+    if not assignment.get("active"):
+        st.info("L'assignation automatique des tickets est désactivée.")
+        return
+    
+    technician_names = technician_names or {}
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Politique", assignment.get("politique", "N/A"))
+    col2.metric("Tickets en attente", assignment.get("tickets_en_attente", 0))
+    col3.metric("Tickets ouverts max. par technicien", assignment.get("max_tickets_ouverts", "N/A"))
+    
+    rows = [
+        {
+            "Technicien": technician_names.get(technician["id_technicien"], f"#{technician['id_technicien']}"),
+            "Tickets ouverts": technician["tickets_ouverts"],
+            "Charge (pondérée par priorité)": technician["charge"],
+            "Temps moyen de résolution (h)": technician["temps_moyen_heures"],
+            "Disponible": "Oui" if technician["disponible"] else "Non",
+        }
+        for technician in assignment.get("techniciens", [])
+    ]
+    if rows:
+        st.dataframe(rows, hide_index=True)
+    else:
+        st.info("Aucun technicien disponible pour l'assignation automatique.")
+
+
+def display_diagnostics(
+    endpoints: List[Dict[str, Any]],
+    pages: List[Dict[str, Any]],
+    pool_stats: Dict[str, int],
+    startup_phases: List[Dict[str, Any]],
+    prometheus_text: str,
+) -> None:
+    """
+    Affiche les mesures du frontend : requêtes vers l'API, durées des pages et du démarrage.
+    
+    Args:
+        endpoints: Résumé par endpoint (`MetricsRegistry.endpoint_summary`)
+        pages: Résumé par page (`MetricsRegistry.page_summary`)
+        pool_stats: Compteurs du pool de connexions du client
+        startup_phases: Étapes du démarrage du processus (`startup.report`)
+        prometheus_text: Export des métriques au format Prometheus
+    """
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Requêtes vers l'API", sum(row["requests"] for row in endpoints))
+    with col2:
+        st.metric("Erreurs", sum(row["errors"] for row in endpoints))
+    with col3:
+        st.metric("Connexions réutilisées", pool_stats.get("hits", 0))
+    
+    import pandas as pd
+    st.subheader("Requêtes par endpoint")
+    if endpoints:
+        st.dataframe(
+            pd.DataFrame(endpoints).rename(columns={
+                "method": "Méthode", "endpoint": "Endpoint", "requests": "Requêtes",
+                "cache_hits": "Servies par le cache", "errors": "Erreurs", "retries": "Nouvelles tentatives",
+                "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)", "p99_ms": "p99 (ms)", "avg_kb": "Taille moy. (Ko)",
+            }),
+            hide_index=True,
+        )
+    else:
+        st.info("Aucune requête enregistrée.")
+    
+    st.subheader("Durée des pages")
+    if pages:
+        st.dataframe(
+            pd.DataFrame(pages).rename(columns={
+                "page": "Page", "renders": "Exécutions", "avg_ms": "Moyenne (ms)",
+                "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)", "p99_ms": "p99 (ms)",
+            }),
+            hide_index=True,
+        )
+    else:
+        st.info("Aucune page enregistrée.")
+    
+    st.subheader("Démarrage du processus")
+    if startup_phases:
+        st.dataframe(
+            pd.DataFrame(startup_phases).rename(columns={
+                "etape": "Étape", "depuis_lancement_s": "Depuis le lancement (s)", "duree_s": "Durée de l'étape (s)",
+            }),
+            hide_index=True,
+        )
+    
+    with st.expander("Export Prometheus"):
+        st.code(prometheus_text, language="text")